@@ -0,0 +1,201 @@
+"""
+Representação compacta da AST em arrays paralelos (arena)
+
+Em vez de milhões de objetos Python, cada nó ocupa uma posição em arrays
+tipados:
+
+    kinds[i]      tipo do nó (índice em NODE_CLASSES)
+    first[i]      início dos campos do nó em `fields`
+    positions[i]  offset na fonte JS (-1 quando desconhecido)
+
+Cada campo é um inteiro `(payload << 3) | tag`; listas e tuplas são gravadas
+em `seqs` como [tamanho, itens...]. Strings (nomes, operadores, literais)
+ficam numa tabela internada e os demais valores escalares num pool de
+literais. Os nós são gravados em pré-ordem, então percorrer a árvore inteira
+é uma varredura linear dos arrays.
+
+A arena é um formato de armazenamento: os motores e o transpilador recebem
+a árvore de objetos, reconstruída com `to_ast()`, e a economia de memória
+vale só enquanto a árvore fica guardada na arena.
+"""
+from array import array
+
+from ast_nodes import nodes
+
+NODE_CLASSES = tuple(
+    cls for cls in vars(nodes).values()
+    if isinstance(cls, type) and issubclass(cls, nodes.Node) and cls is not nodes.Node
+)
+KIND_IDS = {cls: kind for kind, cls in enumerate(NODE_CLASSES)}
+
+# Campos públicos de cada classe, na ordem de declaração dos __slots__
+# (sem as anotações do interpretador, que não fazem parte da estrutura)
+FIELDS = tuple(
+    tuple(name for name in cls.__slots__ if name not in nodes.ANNOTATION_SLOTS)
+    for cls in NODE_CLASSES
+)
+ANNOTATIONS = tuple(
+    tuple(name for name in cls.__slots__ if name in nodes.ANNOTATION_SLOTS)
+    for cls in NODE_CLASSES
+)
+
+TAG_NONE, TAG_NODE, TAG_STRING, TAG_LITERAL, TAG_LIST, TAG_TUPLE = range(6)
+TAG_BITS = 3
+TAG_MASK = (1 << TAG_BITS) - 1
+
+
+class AstArena:
+    """AST armazenada em arrays paralelos; o nó 0 é a raiz"""
+
+    def __init__(self):
+        self.kinds = array('B')
+        self.first = array('i')
+        self.positions = array('i')
+        self.fields = array('i')
+        self.seqs = array('i')
+        self.strings = []
+        self.string_ids = {}
+        self.literals = []
+        self.literal_ids = {}
+
+    def __len__(self):
+        return len(self.kinds)
+
+    # --- Construção ---
+
+    @classmethod
+    def from_ast(cls, root):
+        arena = cls()
+        arena.add(root)
+        arena.compact()
+        return arena
+
+    @classmethod
+    def from_statements(cls, statements):
+        """Monta um Program gravando cada statement assim que ele é produzido
+
+        Os objetos de um statement podem ser descartados logo após a gravação,
+        então o pico de memória fica limitado ao maior statement de nível
+        superior, e não à árvore inteira.
+        """
+        arena = cls()
+        root = arena._reserve(nodes.Program(None))
+        refs = [(arena.add(statement) << TAG_BITS) | TAG_NODE for statement in statements]
+        offset = len(arena.seqs)
+        arena.seqs.append(len(refs))
+        arena.seqs.extend(refs)
+        arena.first[root] = len(arena.fields)
+        arena.fields.append((offset << TAG_BITS) | TAG_LIST)
+        arena.compact()
+        return arena
+
+    def compact(self):
+        """Ajusta os arrays ao tamanho exato e libera as tabelas de construção"""
+        for name in ('kinds', 'first', 'positions', 'fields', 'seqs'):
+            current = getattr(self, name)
+            setattr(self, name, array(current.typecode, current))
+        self.string_ids = None
+        self.literal_ids = None
+
+    def add(self, node):
+        """Grava `node` e sua subárvore; retorna o índice do nó"""
+        index = self._reserve(node)
+        self._write_fields(index, node, FIELDS[self.kinds[index]])
+        return index
+
+    def _reserve(self, node):
+        index = len(self.kinds)
+        self.kinds.append(KIND_IDS[type(node)])
+        self.first.append(0)
+        self.positions.append(getattr(node, 'position', -1))
+        return index
+
+    def _write_fields(self, index, node, names):
+        encoded = [self._encode(getattr(node, name, None)) for name in names]
+        self.first[index] = len(self.fields)
+        self.fields.extend(encoded)
+
+    def _encode(self, value):
+        if value is None:
+            return TAG_NONE
+        if isinstance(value, nodes.Node):
+            return (self.add(value) << TAG_BITS) | TAG_NODE
+        if isinstance(value, str):
+            return (self._intern(value) << TAG_BITS) | TAG_STRING
+        if isinstance(value, (list, tuple)):
+            items = [self._encode(item) for item in value]
+            offset = len(self.seqs)
+            self.seqs.append(len(items))
+            self.seqs.extend(items)
+            tag = TAG_LIST if isinstance(value, list) else TAG_TUPLE
+            return (offset << TAG_BITS) | tag
+        # 1, 1.0 e True são iguais como chaves de dict: o tipo distingue
+        key = (type(value), value)
+        if self.literal_ids is None:
+            self.literal_ids = {(type(v), v): i for i, v in enumerate(self.literals)}
+        literal_id = self.literal_ids.get(key)
+        if literal_id is None:
+            literal_id = self.literal_ids[key] = len(self.literals)
+            self.literals.append(value)
+        return (literal_id << TAG_BITS) | TAG_LITERAL
+
+    def _intern(self, text):
+        if self.string_ids is None:
+            self.string_ids = {s: i for i, s in enumerate(self.strings)}
+        string_id = self.string_ids.get(text)
+        if string_id is None:
+            string_id = self.string_ids[text] = len(self.strings)
+            self.strings.append(text)
+        return string_id
+
+    # --- Consulta ---
+
+    def kind(self, index):
+        return NODE_CLASSES[self.kinds[index]]
+
+    def field(self, index, name):
+        """Valor decodificado de um campo; subnós são devolvidos como índices"""
+        names = FIELDS[self.kinds[index]]
+        return self._decode(self.fields[self.first[index] + names.index(name)], materialize=False)
+
+    def count_by_kind(self):
+        """Quantidade de nós por tipo, numa única varredura linear"""
+        counts = [0] * len(NODE_CLASSES)
+        for kind in self.kinds:
+            counts[kind] += 1
+        return {NODE_CLASSES[kind].__name__: n for kind, n in enumerate(counts) if n}
+
+    def to_ast(self, index=0):
+        """Reconstrói a subárvore de objetos Node a partir do nó `index`"""
+        cls = NODE_CLASSES[self.kinds[index]]
+        node = object.__new__(cls)
+        start = self.first[index]
+        for offset, name in enumerate(FIELDS[self.kinds[index]]):
+            setattr(node, name, self._decode(self.fields[start + offset], materialize=True))
+        for name in ANNOTATIONS[self.kinds[index]]:
+            setattr(node, name, None)
+        if self.positions[index] >= 0:
+            node.position = self.positions[index]
+        return node
+
+    def _decode(self, encoded, materialize):
+        tag = encoded & TAG_MASK
+        payload = encoded >> TAG_BITS
+        if tag == TAG_NODE:
+            return self.to_ast(payload) if materialize else payload
+        if tag == TAG_STRING:
+            return self.strings[payload]
+        if tag == TAG_LITERAL:
+            return self.literals[payload]
+        if tag == TAG_NONE:
+            return None
+        length = self.seqs[payload]
+        items = [self._decode(item, materialize) for item in self.seqs[payload + 1:payload + 1 + length]]
+        return items if tag == TAG_LIST else tuple(items)
+
+    def nbytes(self):
+        """Memória aproximada ocupada pelos arrays e tabelas da arena"""
+        arrays = (self.kinds, self.first, self.positions, self.fields, self.seqs)
+        total = sum(a.itemsize * len(a) for a in arrays)
+        total += sum(len(s) for s in self.strings)
+        return total
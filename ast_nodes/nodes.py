@@ -1,152 +1,237 @@
-class Program:
+class Node:
+    """Base dos nós da AST
+
+    Todos os nós declaram __slots__: sem __dict__ por instância, a AST ocupa
+    menos memória e o acesso aos atributos nos métodos visit_* fica mais rápido.
+    `position` é o offset na fonte JS, registrado pelo parser apenas nos
+    statements (nos demais nós o slot fica vazio; use getattr com padrão).
+    """
+    __slots__ = ('position',)
+
+# Slots de anotação preenchidos pelo interpretador: `slot` é o índice da
+# variável no quadro corrente e `frame` o layout do quadro de uma função
+# (interpreter/resolver.py); `apply` é a função do operador, resolvida na
+# primeira avaliação (interpreter/operators.py). Não fazem parte da
+# estrutura da árvore, por isso a arena não os grava.
+ANNOTATION_SLOTS = frozenset({'slot', 'frame', 'apply'})
+
+class Program(Node):
+    __slots__ = ('statements',)
+
     def __init__(self, statements):
         self.statements = statements
 
-class VariableDeclaration:
+class VariableDeclaration(Node):
+    __slots__ = ('name', 'value', 'kind', 'slot')
+
     def __init__(self, name, value, kind='var'):  
         self.name = name
         self.value = value
         self.kind = kind
+        self.slot = None
+
+class Assignment(Node):
+    __slots__ = ('target', 'value')
 
-class Assignment:
     def __init__(self, target, value):
         self.target = target
         self.value = value
 
-class Literal:
+class Literal(Node):
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value
 
-class Identifier:
+class Identifier(Node):
+    __slots__ = ('name', 'slot')
+
     def __init__(self, name):
         self.name = name
+        self.slot = None
+
+class BinaryOp(Node):
+    __slots__ = ('left', 'op', 'right', 'apply')
 
-class BinaryOp:
     def __init__(self, left, op, right):
         self.left = left
         self.op = op
         self.right = right
+        self.apply = None
+
+class UnaryOp(Node):
+    __slots__ = ('op', 'operand', 'apply')
 
-class UnaryOp:
     def __init__(self, op, operand):
         self.op = op
         self.operand = operand
+        self.apply = None
+
+class ConsoleLog(Node):
+    __slots__ = ('argument',)
 
-class ConsoleLog:
     def __init__(self, argument):
         self.argument = argument
 
-class IfStatement:
+class IfStatement(Node):
+    __slots__ = ('condition', 'then_block', 'else_block')
+
     def __init__(self, condition, then_block, else_block=None):
         self.condition = condition
         self.then_block = then_block
         self.else_block = else_block
 
-class WhileStatement:
+class WhileStatement(Node):
+    __slots__ = ('condition', 'body')
+
     def __init__(self, condition, body):
         self.condition = condition
         self.body = body
 
-class Block:
+class Block(Node):
+    __slots__ = ('statements',)
+
     def __init__(self, statements):
         self.statements = statements
 
-class FunctionDeclaration:
+class FunctionDeclaration(Node):
+    __slots__ = ('name', 'params', 'body', 'frame')
+
     def __init__(self, name, params, body):
         self.name = name
         self.params = params
         self.body = body
+        self.frame = None
+
+class ReturnStatement(Node):
+    __slots__ = ('expression',)
 
-class ReturnStatement:
     def __init__(self, expression):
         self.expression = expression
 
-class FunctionCall:
+class FunctionCall(Node):
+    __slots__ = ('name', 'arguments')
+
     def __init__(self, name, arguments):
         self.name = name
         self.arguments = arguments
 
-class ArrayLiteral:
+class ArrayLiteral(Node):
+    __slots__ = ('elements',)
+
     def __init__(self, elements):
         self.elements = elements
 
-class ObjectLiteral:
+class ObjectLiteral(Node):
+    __slots__ = ('pairs',)
+
     def __init__(self, pairs):
         self.pairs = pairs
 
-class MemberAccess:
+class MemberAccess(Node):
+    __slots__ = ('object', 'key', 'is_dot')
+
     def __init__(self, object_, key, is_dot=False):
         self.object = object_
         self.key = key
         self.is_dot = is_dot
 
-class LambdaFunction:
+class LambdaFunction(Node):
+    __slots__ = ('params', 'expression', 'frame')
+
     def __init__(self, params, expression):
         self.params = params
         self.expression = expression
+        self.frame = None
+
+class ForEachStatement(Node):
+    __slots__ = ('var', 'iterable', 'body', 'kind')
 
-class ForEachStatement:
     def __init__(self, var, iterable, body, kind='of'):
         self.var = var
         self.iterable = iterable
         self.body = body
         self.kind = kind
 
-class ForStatement:
+class ForStatement(Node):
+    __slots__ = ('init', 'condition', 'update', 'body')
+
     def __init__(self, init, condition, update, body):
         self.init = init
         self.condition = condition
         self.update = update
         self.body = body
 
-class Comment:
+class Comment(Node):
+    __slots__ = ('text', 'is_multiline')
+
     def __init__(self, text, is_multiline=False):
         self.text = text
         self.is_multiline = is_multiline
 
-class InlineComment:
+class InlineComment(Node):
+    __slots__ = ('statement', 'comment_text')
+
     def __init__(self, statement, comment_text):
         self.statement = statement
         self.comment_text = comment_text
 
-class ClassDeclaration:
+class ClassDeclaration(Node):
+    __slots__ = ('name', 'constructor', 'methods')
+
     def __init__(self, name, constructor=None, methods=None):
         self.name = name
         self.constructor = constructor
         self.methods = methods or []
         
-class ConstructorDeclaration:
+class ConstructorDeclaration(Node):
+    __slots__ = ('params', 'body', 'frame')
+
     def __init__(self, params, body):
         self.params = params
         self.body = body
+        self.frame = None
+
+class MethodDeclaration(Node):
+    __slots__ = ('name', 'params', 'body', 'frame')
 
-class MethodDeclaration:
     def __init__(self, name, params, body):
         self.name = name
         self.params = params
         self.body = body
+        self.frame = None
+
+class NewExpression(Node):
+    __slots__ = ('class_name', 'arguments')
 
-class NewExpression:
     def __init__(self, class_name, arguments):
         self.class_name = class_name
         self.arguments = arguments
 
-class ThisExpression:
+class ThisExpression(Node):
+    __slots__ = ()
+
     def __init__(self):
         pass
 
-class PropertyAccess:
+class PropertyAccess(Node):
+    __slots__ = ('object', 'property_name')
+
     def __init__(self, object_, property_name):
         self.object = object_
         self.property_name = property_name
 
-class MethodCall:
+class MethodCall(Node):
+    __slots__ = ('object', 'method_name', 'arguments')
+
     def __init__(self, object_, method_name, arguments):
         self.object = object_
         self.method_name = method_name
         self.arguments = arguments
 
-class UpdateExpression:
+class UpdateExpression(Node):
+    __slots__ = ('operator', 'operand', 'prefix')
+
     def __init__(self, operator, operand, prefix=False):
         self.operator = operator
         self.operand = operand
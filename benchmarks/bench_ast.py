@@ -0,0 +1,130 @@
+"""
+Benchmark de memória da AST: nós com __slots__ contra classes com __dict__
+
+Para cada tamanho alvo (em número de nós) gera um programa, analisa-o e
+constrói duas cópias da árvore: uma com as classes atuais de
+ast_nodes.nodes e outra com classes equivalentes sem __slots__ (o formato
+anterior). Valores folha (strings, números) são compartilhados pelas duas
+cópias, então a diferença medida é só a dos objetos-nó. Também mede a
+arena compacta (ast_nodes.arena) e o tempo de uma travessia completa
+(contagem de nós por tipo) em objetos e na arena.
+
+Uso:
+    python benchmarks/bench_ast.py [nós ...]      (ex.: 10000 100000 1000000)
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ast_nodes import nodes
+from ast_nodes.arena import AstArena
+from parser.parser import Parser
+from benchmarks.generate import generate_program
+
+NODE_CLASSES = [
+    cls for cls in vars(nodes).values()
+    if isinstance(cls, type) and issubclass(cls, nodes.Node) and cls is not nodes.Node
+]
+
+# Mesmas classes, mas com atributos guardados em __dict__ como antes
+LEGACY_CLASSES = {cls: type(cls.__name__, (), {}) for cls in NODE_CLASSES}
+
+_MISSING = object()
+
+
+def node_fields(cls):
+    return [name for klass in reversed(cls.__mro__) for name in klass.__dict__.get('__slots__', ())]
+
+
+FIELDS = {cls: node_fields(cls) for cls in NODE_CLASSES}
+
+
+def clone(value, legacy, counter):
+    """Copia a árvore, opcionalmente convertendo para as classes sem __slots__"""
+    if isinstance(value, nodes.Node):
+        counter[0] += 1
+        cls = type(value)
+        copy = object.__new__(LEGACY_CLASSES[cls] if legacy else cls)
+        for name in FIELDS[cls]:
+            field = getattr(value, name, _MISSING)
+            if field is not _MISSING:
+                setattr(copy, name, clone(field, legacy, counter))
+        return copy
+    if isinstance(value, list):
+        return [clone(item, legacy, counter) for item in value]
+    if isinstance(value, tuple):
+        return tuple(clone(item, legacy, counter) for item in value)
+    return value
+
+
+def count_by_kind(node, counts):
+    """Travessia completa da árvore de objetos"""
+    if isinstance(node, nodes.Node):
+        name = type(node).__name__
+        counts[name] = counts.get(name, 0) + 1
+        for field in FIELDS[type(node)]:
+            count_by_kind(getattr(node, field, None), counts)
+    elif isinstance(node, (list, tuple)):
+        for item in node:
+            count_by_kind(item, counts)
+    return counts
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def retained_memory(build):
+    tracemalloc.start()
+    result = build()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained
+
+
+def main(targets):
+    counter = [0]
+    clone(Parser(generate_program(1)).parse_program(), False, counter)
+    nodes_per_block = counter[0]
+
+    print(f"{'nós':>9} {'parse (s)':>10} {'__dict__ (MB)':>14} {'__slots__ (MB)':>15} {'B/nó antes':>11} {'B/nó agora':>11} {'redução':>8}")
+    rows = []
+    for target in targets:
+        code = generate_program(max(1, target // nodes_per_block))
+        start = time.perf_counter()
+        ast = Parser(code).parse_program()
+        parse_time = time.perf_counter() - start
+        del code
+
+        counter = [0]
+        legacy_tree, legacy_bytes = retained_memory(lambda: clone(ast, True, counter))
+        count = counter[0]
+        del legacy_tree
+        slotted_tree, slotted_bytes = retained_memory(lambda: clone(ast, False, [0]))
+        del slotted_tree
+        arena, arena_bytes = retained_memory(lambda: AstArena.from_ast(ast))
+
+        object_counts, object_time = timed(lambda: count_by_kind(ast, {}))
+        arena_counts, arena_time = timed(arena.count_by_kind)
+        assert object_counts == arena_counts
+
+        rows.append((count, parse_time, legacy_bytes, slotted_bytes, arena_bytes, object_time, arena_time))
+        print(f"{count:>9} {parse_time:>10.2f} {legacy_bytes / 2**20:>14.1f} {slotted_bytes / 2**20:>15.1f} "
+              f"{legacy_bytes / count:>11.0f} {slotted_bytes / count:>11.0f} "
+              f"{1 - slotted_bytes / legacy_bytes:>7.0%}")
+
+    print()
+    print(f"{'nós':>9} {'arena (MB)':>11} {'B/nó':>6} {'vs __slots__':>13} {'travessia obj (s)':>18} {'arena (s)':>10}")
+    for count, _, _, slotted_bytes, arena_bytes, object_time, arena_time in rows:
+        print(f"{count:>9} {arena_bytes / 2**20:>11.1f} {arena_bytes / count:>6.0f} "
+              f"{slotted_bytes / arena_bytes:>12.1f}x {object_time:>18.3f} {arena_time:>10.3f}")
+
+
+if __name__ == "__main__":
+    targets = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    main(targets)
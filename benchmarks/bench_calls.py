@@ -0,0 +1,73 @@
+"""
+Benchmark de chamadas de função no interpretador
+
+Mede chamadas por segundo em dois cenários, variando a quantidade de
+variáveis globais do programa: chamadas simples dentro de um laço e
+recursão (fibonacci). Com a cópia do ambiente a cada chamada, o custo
+crescia com o número de globais; com a cadeia de escopos deve ficar estável.
+
+Uso:
+    python benchmarks/bench_calls.py [globais ...]
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser.parser import Parser
+from interpreter.interpreter import Interpreter
+
+LOOP_CALLS = 3000
+FIB_N = 16
+
+LOOP_PROGRAM = '''
+function inc(x) {{
+    return x + 1;
+}}
+var s = 0;
+for (let i = 0; i < {calls}; i++) {{
+    s = inc(s);
+}}
+'''
+
+FIB_PROGRAM = '''
+function fib(n) {{
+    if (n <= 1) {{
+        return n;
+    }}
+    return fib(n - 1) + fib(n - 2);
+}}
+var r = fib({n});
+'''
+
+
+def fib_calls(n):
+    a, b = 1, 1
+    for _ in range(n):
+        a, b = b, a + b + 1
+    return a
+
+
+def with_globals(program, count):
+    return ''.join(f"var g{i} = {i};\n" for i in range(count)) + program
+
+
+def calls_per_second(code, calls):
+    ast = Parser(code).parse_program()
+    start = time.perf_counter()
+    Interpreter(ast).execute()
+    return calls / (time.perf_counter() - start)
+
+
+def main(global_counts):
+    print(f"{'globais':>8} {'laço (chamadas/s)':>18} {'fib (chamadas/s)':>17}")
+    for count in global_counts:
+        loop = calls_per_second(with_globals(LOOP_PROGRAM.format(calls=LOOP_CALLS), count), LOOP_CALLS)
+        fib = calls_per_second(with_globals(FIB_PROGRAM.format(n=FIB_N), count), fib_calls(FIB_N))
+        print(f"{count:>8} {loop:>18,.0f} {fib:>17,.0f}")
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [10, 100, 1000, 5000]
+    main(counts)
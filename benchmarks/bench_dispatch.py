@@ -0,0 +1,67 @@
+"""
+Microbenchmark do despacho de visitantes (Interpreter e Transpiler)
+
+Compara a tabela de despacho por tipo de nó com a resolução antiga, que
+montava 'visit_' + nome da classe e fazia getattr a cada visita. Usa os
+exemplos fibonacci.js e sorting.js; a saída dos programas é descartada.
+
+Uso:
+    python benchmarks/bench_dispatch.py [repetições]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from parser.parser import Parser
+from translator.transpiler import Transpiler
+from interpreter.interpreter import Interpreter
+
+EXAMPLES = ['fibonacci.js', 'sorting.js']
+
+
+def legacy_visit(self, node):
+    method_name = 'visit_' + node.__class__.__name__
+    visitor = getattr(self, method_name, self.generic_visit)
+    return visitor(node)
+
+
+class LegacyInterpreter(Interpreter):
+    visit = legacy_visit
+
+
+class LegacyTranspiler(Transpiler):
+    visit = legacy_visit
+
+
+def best_time(func, repeat):
+    best = float('inf')
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(repeat):
+    print(f"{'exemplo':<14} {'motor':<12} {'getattr (ms)':>13} {'tabela (ms)':>12} {'ganho':>7}")
+    for name in EXAMPLES:
+        with open(os.path.join(ROOT, 'examples', name), encoding='utf-8') as f:
+            ast = Parser(f.read()).parse_program()
+        pairs = [
+            ('interpreter', LegacyInterpreter, Interpreter, lambda cls: cls(ast).execute()),
+            ('transpiler', LegacyTranspiler, Transpiler, lambda cls: cls(ast).transpile()),
+        ]
+        for engine, legacy_cls, current_cls, run in pairs:
+            old = best_time(lambda: run(legacy_cls), repeat)
+            new = best_time(lambda: run(current_cls), repeat)
+            print(f"{name:<14} {engine:<12} {old * 1000:>13.3f} {new * 1000:>12.3f} {old / new:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,74 @@
+"""
+Benchmark dos motores de interpretação
+
+Executa cada programa com todos os motores de pipeline.ENGINES e compara
+com o visitante da AST ('ast'). Usa todos os exemplos de examples/ (exceto
+os test_*.js, que contêm erros de propósito) e um laço numérico apertado; a
+saída dos programas é descartada. O tempo inclui a criação do motor
+(resolução e compilação).
+
+Uso:
+    python benchmarks/bench_engines.py [repetições]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from parser.parser import Parser
+from pipeline.pipeline import ENGINES
+
+EXAMPLES = sorted(
+    name for name in os.listdir(os.path.join(ROOT, 'examples'))
+    if name.endswith('.js') and not name.startswith('test_')
+)
+
+TIGHT_LOOP = '''
+function somaQuadrados(n) {
+    var total = 0;
+    for (let i = 0; i < n; i++) {
+        var q = i * i;
+        total = total + q % 7;
+    }
+    return total;
+}
+console.log(somaQuadrados(20000));
+'''
+
+
+def best_time(func, repeat):
+    best = float('inf')
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(repeat):
+    programs = []
+    for name in EXAMPLES:
+        with open(os.path.join(ROOT, 'examples', name), encoding='utf-8') as f:
+            programs.append((name, f.read()))
+    programs.append(('laço numérico', TIGHT_LOOP))
+
+    others = [engine for engine in ENGINES if engine != 'ast']
+    header = f"{'programa':<26}" + "".join(f"{engine + ' (ms)':>15}" for engine in ENGINES)
+    print(header + "".join(f"{'ganho ' + engine:>17}" for engine in others))
+    for name, code in programs:
+        times = {}
+        for engine, cls in ENGINES.items():
+            ast = Parser(code).parse_program()
+            times[engine] = best_time(lambda: cls(ast).execute(), repeat)
+        row = f"{name:<26}" + "".join(f"{times[engine] * 1000:>15.3f}" for engine in ENGINES)
+        row += "".join(f"{times['ast'] / times[engine]:>16.2f}x" for engine in others)
+        print(row)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,106 @@
+"""
+Benchmark do tokenizer: tokens/segundo em arquivos grandes gerados
+
+Compara o motor atual (regex mestre compilada uma vez) com o laço antigo,
+que recompilava e testava cada padrão de TOKEN_SPEC em sequência. Também
+mede a memória por token do Token com __slots__ contra a classe antiga,
+que mantinha um __dict__ por instância e não guardava posições.
+
+Uso:
+    python benchmarks/bench_lexer.py [blocos ...]
+"""
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer.tokenizer import KEYWORDS, TOKEN_SPEC, Token, tokenize
+from benchmarks.generate import generate_program
+
+
+# Especificação antiga: uma regex por palavra reservada, testadas antes de IDENTIFIER
+_IDENTIFIER_INDEX = [name for name, _ in TOKEN_SPEC].index('IDENTIFIER')
+LEGACY_SPEC = (
+    TOKEN_SPEC[:_IDENTIFIER_INDEX]
+    + [(token_type, rf'\b{word}\b') for word, token_type in KEYWORDS.items()]
+    + TOKEN_SPEC[_IDENTIFIER_INDEX:]
+)
+
+
+def legacy_tokenize(code):
+    """Reprodução do laço original: um re.compile/match por padrão e posição"""
+    tokens = []
+    pos = 0
+    while pos < len(code):
+        for token_name, token_regex in LEGACY_SPEC:
+            match = re.compile(token_regex).match(code, pos)
+            if match:
+                if token_name != 'WHITESPACE':
+                    tokens.append((token_name, match.group(0)))
+                pos = match.end(0)
+                break
+        else:
+            raise ValueError(f"Caractere inesperado na posição {pos}")
+    return tokens
+
+
+class LegacyToken:
+    """Token antigo: classe comum, atributos guardados por instância sem __slots__"""
+    def __init__(self, type_, value, start=None, line=None, column=None):
+        self.type = type_
+        self.value = value
+        self.start = start
+        self.line = line
+        self.column = column
+
+
+def token_memory(code):
+    """Bytes por token dos objetos Token, excluindo valores compartilhados"""
+    tokens = tokenize(code)
+    builders = {
+        'antigo (sem __slots__)': lambda t: LegacyToken(t.type, t.value, t.start, t.line, t.column),
+        'atual (__slots__)': lambda t: Token(t.type, t.value, t.start, t.line, t.column),
+    }
+    results = {}
+    for label, build in builders.items():
+        tracemalloc.start()
+        copies = [build(t) for t in tokens]
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[label] = retained / len(copies)
+        del copies
+    return results
+
+
+def measure(func, code, repeat=3):
+    best = float('inf')
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = len(func(code))
+        best = min(best, time.perf_counter() - start)
+    return count, best
+
+
+def main(sizes):
+    print(f"{'blocos':>8} {'tokens':>9} {'antigo tok/s':>14} {'atual tok/s':>14} {'ganho':>7}")
+    for blocks in sizes:
+        code = generate_program(blocks)
+        count, old_time = measure(legacy_tokenize, code, repeat=1)
+        new_count, new_time = measure(tokenize, code)
+        assert count == new_count, "fluxos de tokens divergentes"
+        print(f"{blocks:>8} {count:>9} {count / old_time:>14,.0f} "
+              f"{count / new_time:>14,.0f} {old_time / new_time:>6.1f}x")
+
+    print()
+    print("memória por token:")
+    for label, size in token_memory(generate_program(sizes[-1])).items():
+        print(f"  {label:<30} {size:>6.0f} B")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 1000, 5000]
+    main(sizes)
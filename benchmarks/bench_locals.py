@@ -0,0 +1,75 @@
+"""
+Microbenchmark das variáveis locais em posições de quadro
+
+Compara o interpretador com a AST resolvida (locais lidas e escritas por
+índice na lista do quadro) com a busca por nome na cadeia de escopos, que
+é o que acontece quando a árvore não passa pelo resolvedor. Usa
+examples/sorting.js e um laço numérico apertado dentro de uma função; a
+saída dos programas é descartada. O tempo "por posição" inclui a resolução,
+feita uma vez por árvore na criação do Interpreter (mostrada à parte).
+
+Uso:
+    python benchmarks/bench_locals.py [repetições]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from ast_nodes.nodes import Program
+from parser.parser import Parser
+from interpreter.interpreter import Interpreter
+from interpreter.resolver import resolve
+
+TIGHT_LOOP = '''
+function somaQuadrados(n) {
+    var total = 0;
+    for (let i = 0; i < n; i++) {
+        var q = i * i;
+        total = total + q % 7;
+    }
+    return total;
+}
+console.log(somaQuadrados(5000));
+'''
+
+
+class NameLookupInterpreter(Interpreter):
+    """Executa uma AST não resolvida: todo acesso a variável é por nome"""
+
+    def __init__(self, ast):
+        super().__init__(Program([]))
+        self.ast = ast
+
+
+def best_time(func, repeat):
+    best = float('inf')
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(repeat):
+    with open(os.path.join(ROOT, 'examples', 'sorting.js'), encoding='utf-8') as f:
+        programs = [('sorting.js', f.read()), ('laço numérico', TIGHT_LOOP)]
+
+    print(f"{'programa':<16} {'por nome (ms)':>14} {'por posição (ms)':>17} {'resolução (ms)':>15} {'ganho':>7}")
+    for name, code in programs:
+        # Árvores separadas: o resolvedor anota os nós da que recebe
+        unresolved = Parser(code).parse_program()
+        resolved = Parser(code).parse_program()
+        old = best_time(lambda: NameLookupInterpreter(unresolved).execute(), repeat)
+        new = best_time(lambda: Interpreter(resolved).execute(), repeat)
+        resolution = best_time(lambda: resolve(resolved), repeat)
+        print(f"{name:<16} {old * 1000:>14.3f} {new * 1000:>17.3f} {resolution * 1000:>15.3f} {old / new:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
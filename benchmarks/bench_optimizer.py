@@ -0,0 +1,70 @@
+"""
+Benchmark dos passes de otimização (-O) em programas gerados
+
+Para cada tamanho, gera o programa de benchmarks/generate.py acrescido de
+código morto típico de scripts gerados (ramos `if (false)`, statements
+depois de return, laços vazios e expressões constantes) e compara, sem e
+com otimização: número de nós da árvore interpretada, tamanho do Python
+transpilado e tempos de transpilação e interpretação.
+
+Uso:
+    python benchmarks/bench_optimizer.py [blocos ...]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ast_nodes.arena import AstArena
+from optimizer.dead_code import strip_comments
+from pipeline.pipeline import Pipeline
+from benchmarks.generate import generate_program
+
+DEAD_SNIPPET = '''
+function passo{i}(n) {{
+    // DEBUG desligado na geração
+    if (false) {{
+        console.log("depuração " + n);
+    }}
+    for (let k = 0; k < 100; k++) {{}}
+    return n * (60 * 60) - 1 - 1;
+    console.log("inalcançável");
+}}
+var passos{i} = passo{i}({i});
+'''
+
+
+def generate(blocks):
+    return generate_program(blocks) + ''.join(DEAD_SNIPPET.format(i=i) for i in range(blocks))
+
+
+def measure(code, optimize):
+    pipeline = Pipeline(code, optimize=optimize)
+    ast = pipeline.parse()
+    nodes = len(AstArena.from_ast(strip_comments(ast) if optimize else ast))
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        python_code = pipeline.transpile()
+        transpile_time = time.perf_counter() - start
+        start = time.perf_counter()
+        pipeline.interpret()
+        interpret_time = time.perf_counter() - start
+    return nodes, len(python_code), transpile_time, interpret_time
+
+
+def main(sizes):
+    print(f"{'blocos':>7} {'-O':>3} {'nós':>8} {'python (bytes)':>15} {'transpile (ms)':>15} {'interpret (ms)':>15}")
+    for blocks in sizes:
+        code = generate(blocks)
+        for optimize in (False, True):
+            nodes, size, transpile_time, interpret_time = measure(code, optimize)
+            print(f"{blocks:>7} {'sim' if optimize else 'não':>3} {nodes:>8} {size:>15} "
+                  f"{transpile_time * 1000:>15.2f} {interpret_time * 1000:>15.2f}")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [200, 1000]
+    main(sizes)
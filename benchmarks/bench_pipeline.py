@@ -0,0 +1,58 @@
+"""
+Benchmark do modo -a (transpila + interpreta)
+
+Compara o fluxo antigo, em que cada etapa criava o próprio Parser e
+reanalisava o arquivo, com o Pipeline, que analisa uma vez e compartilha a
+AST. A saída do programa interpretado é descartada.
+
+Uso:
+    python benchmarks/bench_pipeline.py [blocos ...]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser.parser import Parser
+from translator.transpiler import Transpiler
+from interpreter.interpreter import Interpreter
+from pipeline.pipeline import Pipeline
+from benchmarks.generate import generate_program
+
+
+def run_separately(code):
+    """Fluxo anterior: uma análise completa por etapa"""
+    Transpiler(Parser(code).parse_program()).transpile()
+    Interpreter(Parser(code).parse_program()).execute()
+
+
+def run_pipeline(code):
+    pipeline = Pipeline(code)
+    pipeline.transpile()
+    pipeline.interpret()
+    return pipeline
+
+
+def timed(func, code):
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = func(code)
+        return result, time.perf_counter() - start
+
+
+def main(sizes):
+    print(f"{'blocos':>8} {'separado (s)':>13} {'pipeline (s)':>13} {'parse (s)':>10} {'ganho':>7}")
+    for blocks in sizes:
+        code = generate_program(blocks)
+        _, separate_time = timed(run_separately, code)
+        pipeline, pipeline_time = timed(run_pipeline, code)
+        print(f"{blocks:>8} {separate_time:>13.2f} {pipeline_time:>13.2f} "
+              f"{pipeline.timings['parse']:>10.2f} {separate_time / pipeline_time:>6.2f}x")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [200, 1000]
+    main(sizes)
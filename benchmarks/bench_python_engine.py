@@ -0,0 +1,57 @@
+"""
+Benchmark do motor --engine=python e do seu cache de code objects
+
+Mede o tempo de ponta a ponta de Pipeline.interpret() (análise, transpilação,
+compilação e execução) para cada programa: visitante da AST com o cache de
+AST já preenchido, motor python sem cache (tudo a cada execução) e motor
+python com o code object já no cache (pula lexer, parser e transpilação).
+Usa os exemplos de examples/ (exceto os test_*.js) e um laço numérico; a
+saída dos programas é descartada.
+
+Uso:
+    python benchmarks/bench_python_engine.py [repetições]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from benchmarks.bench_engines import EXAMPLES, TIGHT_LOOP
+from parser.ast_cache import AstCache
+from pipeline.pipeline import Pipeline
+
+
+def best_time(func, repeat):
+    best = float('inf')
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(repeat):
+    programs = []
+    for name in EXAMPLES:
+        with open(os.path.join(ROOT, 'examples', name), encoding='utf-8') as f:
+            programs.append((name, f.read()))
+    programs.append(('laço numérico', TIGHT_LOOP))
+
+    print(f"{'programa':<26}{'ast+cache (ms)':>16}{'python frio (ms)':>18}{'python+cache (ms)':>19}{'ganho':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        cache = AstCache(directory)
+        for name, code in programs:
+            ast_time = best_time(lambda: Pipeline(code, cache).interpret(), repeat)
+            cold = best_time(lambda: Pipeline(code, engine='python').interpret(), repeat)
+            warm = best_time(lambda: Pipeline(code, cache, engine='python').interpret(), repeat)
+            print(f"{name:<26}{ast_time * 1000:>16.3f}{cold * 1000:>18.3f}{warm * 1000:>19.3f}{ast_time / warm:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,86 @@
+"""
+Microbenchmark de leituras de globais em recursão profunda
+
+O pai de cada quadro é o quadro de quem chamou, então em `soma(n)` (que lê
+a global `base` a cada nível) a cadeia de escopos tem n quadros. Compara a
+busca que percorre a cadeia inteira até a raiz com a que vai direto ao
+escopo global quando nenhum quadro da cadeia declara o nome, em várias
+profundidades e nos motores que usam Scope.
+
+Uso:
+    python benchmarks/bench_recursion.py [repetições]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interpreter.scope import Scope, UNSET
+from parser.parser import Parser
+from pipeline.pipeline import ENGINES
+
+DEPTHS = (100, 300, 900)
+
+PROGRAM = '''
+var base = 1;
+function soma(n) {{
+    if (n <= 0) {{
+        return 0;
+    }}
+    return base + soma(n - 1);
+}}
+console.log(soma({depth}));
+'''
+
+
+def chain_lookup(self, name, default=KeyError):
+    """Busca sem atalho: percorre todos os quadros até a raiz"""
+    scope = self
+    while scope is not None:
+        index = scope.layout.get(name)
+        if index is None:
+            if name in scope.vars:
+                return scope.vars[name]
+        else:
+            value = scope.slots[index]
+            if value is not UNSET:
+                return value
+        scope = scope.parent
+    if default is KeyError:
+        raise KeyError(name)
+    return default
+
+
+def best_time(func, repeat):
+    best = float('inf')
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(repeat):
+    sys.setrecursionlimit(20000)
+    engines = [engine for engine in ENGINES if engine != 'python']
+    print(f"{'motor':<10} {'profundidade':>12} {'cadeia (ms)':>12} {'raiz (ms)':>10} {'ganho':>7}")
+    shortcut = Scope.lookup
+    for engine in engines:
+        cls = ENGINES[engine]
+        for depth in DEPTHS:
+            ast = Parser(PROGRAM.format(depth=depth)).parse_program()
+            Scope.lookup = chain_lookup
+            try:
+                old = best_time(lambda: cls(ast).execute(), repeat)
+            finally:
+                Scope.lookup = shortcut
+            new = best_time(lambda: cls(ast).execute(), repeat)
+            print(f"{engine:<10} {depth:>12} {old * 1000:>12.2f} {new * 1000:>10.2f} {old / new:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
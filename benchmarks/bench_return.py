@@ -0,0 +1,87 @@
+"""
+Benchmark do retorno de funções no interpretador
+
+Compara o return sinalizado por valor (RETURN devolvido pelos blocos até a
+chamada) com o mecanismo anterior, que lançava uma exceção em cada return e
+a capturava na chamada, desempilhando todos os quadros Python do corpo.
+Mede recursão profunda (soma recursiva de 1..n) e os exemplos recursivos
+recursao.js (fatorial, potencia) e fibonacci.js; a saída é descartada.
+Em profundidades grandes o tempo passa a ser dominado pela busca do nome
+da função na cadeia de escopos (que cresce com a profundidade), e o ganho
+do retorno sem exceção fica diluído.
+
+Uso:
+    python benchmarks/bench_return.py [profundidade ...]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from parser.parser import Parser
+from interpreter.interpreter import Interpreter
+
+REPEAT = 10
+
+DEEP_RECURSION = '''
+function soma(n) {{
+    if (n == 0) {{
+        return 0;
+    }}
+    return n + soma(n - 1);
+}}
+for (let i = 0; i < 20; i++) {{
+    soma({depth});
+}}
+'''
+
+
+class _Return(Exception):
+    def __init__(self, value):
+        self.value = value
+
+
+class ExceptionReturnInterpreter(Interpreter):
+    """Return por exceção, como antes"""
+
+    def visit_ReturnStatement(self, node):
+        raise _Return(self.visit(node.expression) if node.expression else None)
+
+    def visit_FunctionCall(self, node):
+        try:
+            return super().visit_FunctionCall(node)
+        except _Return as e:
+            return e.value
+
+
+def best_time(cls, ast):
+    best = float('inf')
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            cls(ast).execute()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(depths):
+    sys.setrecursionlimit(max(depths) * 20 + 1000)
+    programs = [(f"soma({depth}) x20", DEEP_RECURSION.format(depth=depth)) for depth in depths]
+    for name in ['recursao.js', 'fibonacci.js']:
+        with open(os.path.join(ROOT, 'examples', name), encoding='utf-8') as f:
+            programs.append((name, f.read()))
+
+    print(f"{'programa':<16} {'exceção (ms)':>13} {'sinal (ms)':>11} {'ganho':>7}")
+    for name, code in programs:
+        ast = Parser(code).parse_program()
+        old = best_time(ExceptionReturnInterpreter, ast)
+        new = best_time(Interpreter, ast)
+        print(f"{name:<16} {old * 1000:>13.3f} {new * 1000:>11.3f} {old / new:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [25, 100, 400])
@@ -0,0 +1,84 @@
+"""
+Benchmark de laços com guardas '&&' / '||'
+
+Compara o curto-circuito com a avaliação anterior, que visitava os dois
+lados de todo BinaryOp antes de aplicar o operador (e portanto chamava a
+função do lado direito mesmo quando o esquerdo já decidia o resultado).
+Também mostra os motores closure e bytecode no mesmo programa. A saída é
+descartada.
+
+Uso:
+    python benchmarks/bench_short_circuit.py [iterações]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser.parser import Parser
+from interpreter.interpreter import Interpreter
+from interpreter.closure_compiler import ClosureInterpreter
+from interpreter.vm import BytecodeInterpreter
+from interpreter.operators import BINARY_OPERATORS, LOGICAL_OPERATORS
+
+REPEAT = 5
+
+GUARDS = '''
+function caro(x) {{
+    var total = 0;
+    for (let k = 0; k < 10; k++) {{
+        total = total + k * x;
+    }}
+    return total > 0;
+}}
+var itens = [0, 3, 0, 7, 0, 1, 0, 0];
+var aceitos = 0;
+for (let i = 0; i < {iterations}; i++) {{
+    var v = itens[i % 8];
+    if (v > 0 && caro(v)) {{
+        aceitos++;
+    }}
+    if (v == 0 || caro(v)) {{
+        aceitos++;
+    }}
+}}
+console.log(aceitos);
+'''
+
+
+class EagerInterpreter(Interpreter):
+    """Avalia os dois lados antes do operador, como antes"""
+
+    def visit_BinaryOp(self, node):
+        left_val = self.visit(node.left)
+        right_val = self.visit(node.right)
+        if node.op in LOGICAL_OPERATORS:
+            return left_val and right_val if node.op == '&&' else left_val or right_val
+        return BINARY_OPERATORS[node.op](left_val, right_val)
+
+
+def best_time(cls, ast):
+    best = float('inf')
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            cls(ast).execute()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(iterations):
+    ast = Parser(GUARDS.format(iterations=iterations)).parse_program()
+    eager = best_time(EagerInterpreter, ast)
+    print(f"{'motor':<22} {'tempo (ms)':>11} {'ganho':>7}")
+    print(f"{'ast (sem curto-circ.)':<22} {eager * 1000:>11.3f} {1:>6.2f}x")
+    for name, cls in [('ast', Interpreter), ('closure', ClosureInterpreter), ('bytecode', BytecodeInterpreter)]:
+        elapsed = best_time(cls, ast)
+        print(f"{name:<22} {elapsed * 1000:>11.3f} {eager / elapsed:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,69 @@
+"""
+Benchmark da transpilação em streaming (Transpiler.transpile_to)
+
+Compara gerar a saída inteira com transpile() e depois gravá-la com
+transpile_to(), que escreve cada statement de topo no arquivo assim que é
+gerado. Mede o pico de memória alocada durante a transpilação (a AST já
+existe antes da medição) e o tempo até a primeira escrita. As duas saídas
+são conferidas byte a byte.
+
+Uso:
+    python benchmarks/bench_streaming.py [blocos ...]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generate import generate_program
+from parser.parser import Parser
+from translator.transpiler import Transpiler
+
+
+class TimedFile:
+    """Arquivo que registra o instante da primeira escrita"""
+
+    def __init__(self, f):
+        self.f = f
+        self.first_write = None
+
+    def write(self, text):
+        if self.first_write is None:
+            self.first_write = time.perf_counter()
+        self.f.write(text)
+
+
+def run(ast, path, streaming):
+    with open(path, 'w', encoding='utf-8') as f:
+        sink = TimedFile(f)
+        tracemalloc.start()
+        start = time.perf_counter()
+        if streaming:
+            Transpiler(ast).transpile_to(sink)
+        else:
+            sink.write(Transpiler(ast).transpile())
+        total = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return peak, sink.first_write - start, total
+
+
+def main(sizes):
+    print(f"{'blocos':>8} {'modo':>10} {'pico (KiB)':>11} {'1ª escrita (ms)':>16} {'total (ms)':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        whole_path = os.path.join(tmp, 'inteiro.py')
+        stream_path = os.path.join(tmp, 'streaming.py')
+        for blocks in sizes:
+            ast = Parser(generate_program(blocks)).parse_program()
+            for label, path, streaming in (('inteiro', whole_path, False), ('streaming', stream_path, True)):
+                peak, first, total = run(ast, path, streaming)
+                print(f"{blocks:>8} {label:>10} {peak / 1024:>11.1f} {first * 1000:>16.2f} {total * 1000:>11.2f}")
+            with open(whole_path, encoding='utf-8') as a, open(stream_path, encoding='utf-8') as b:
+                assert a.read() == b.read(), "saídas diferentes"
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100, 1000, 5000])
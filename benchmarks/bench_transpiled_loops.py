@@ -0,0 +1,85 @@
+"""
+Benchmark dos laços for no Python transpilado
+
+Executa o código gerado para laços contados (bubble sort de sorting.js em
+um array maior e uma soma em laços aninhados) nas duas formas: `while` com
+update manual, como o transpilador gerava, e `for ... in range(...)`.
+
+Uso:
+    python benchmarks/bench_transpiled_loops.py [tamanho]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser.parser import Parser
+from translator.transpiler import Transpiler
+
+REPEAT = 5
+
+PROGRAMS = {
+    'bubble sort': '''
+function bubbleSort(arr) {{
+    let n = arr.length;
+    for (let i = 0; i < n - 1; i++) {{
+        for (let j = 0; j < n - i - 1; j++) {{
+            if (arr[j] > arr[j + 1]) {{
+                let temp = arr[j];
+                arr[j] = arr[j + 1];
+                arr[j + 1] = temp;
+            }}
+        }}
+    }}
+    return arr;
+}}
+let dados = [];
+for (let k = {size}; k > 0; k--) {{
+    dados.push(k);
+}}
+console.log(bubbleSort(dados)[0]);
+''',
+    'laços aninhados': '''
+let total = 0;
+for (let i = 0; i < {size}; i++) {{
+    for (let j = 0; j < {size}; j++) {{
+        total = total + i * j;
+    }}
+}}
+console.log(total);
+''',
+}
+
+
+class WhileTranspiler(Transpiler):
+    """Sempre gera `while`, como antes"""
+
+    def transpile(self):
+        return self.visit(self.ast)
+
+
+def best_time(python_code):
+    code = compile(python_code, '<transpilado>', 'exec')
+    best = float('inf')
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            exec(code, {})
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(size):
+    print(f"{'programa':<16} {'while (ms)':>11} {'range (ms)':>11} {'ganho':>7}")
+    for name, template in PROGRAMS.items():
+        ast = Parser(template.format(size=size)).parse_program()
+        old = best_time(WhileTranspiler(ast).transpile())
+        new = best_time(Transpiler(ast).transpile())
+        print(f"{name:<16} {old * 1000:>11.2f} {new * 1000:>11.2f} {old / new:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 400)
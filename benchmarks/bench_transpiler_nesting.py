@@ -0,0 +1,96 @@
+"""
+Benchmark do transpilador em programas profundamente aninhados
+
+Compara o buffer de linhas (translator/emitter.py), que indenta cada linha
+uma única vez, com a geração anterior, em que cada bloco virava uma string
+reindentada por todos os níveis que o envolviam (custo proporcional a
+tamanho x profundidade). As duas saídas são conferidas byte a byte.
+
+Uso:
+    python benchmarks/bench_transpiler_nesting.py [profundidade ...]
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser.parser import Parser
+from translator.loop_analysis import find_counted_loops
+from translator.transpiler import Transpiler
+
+REPEAT = 5
+
+
+def generate_nested(depth):
+    """Função com `depth` níveis de if/while/for aninhados, com statements em cada nível"""
+    lines = ["function profundo(x) {"]
+    for level in range(depth):
+        pad = "    " * (level + 1)
+        lines.append(f"{pad}var v{level} = x + {level}; // nível {level}")
+        lines.append(f"{pad}console.log(\"nível \" + v{level});")
+        header = ("if (x > {0}) {{", "while (v{0} < 0) {{", "for (var i{0} = 0; i{0} < x; i{0}++) {{")[level % 3]
+        lines.append(pad + header.format(level))
+    for level in reversed(range(depth)):
+        lines.append("    " * (level + 1) + "}")
+    lines.append("}")
+    return "\n".join(lines) + "\nprofundo(1);\n"
+
+
+class ReindentingTranspiler(Transpiler):
+    """Geração anterior: cada statement composto devolve uma string reindentada"""
+
+    def transpile(self):
+        self._counted_loops = find_counted_loops(self.ast)
+        return self.visit(self.ast)
+
+    def _indent(self, code):
+        return "\n".join("    " + line for line in code.splitlines())
+
+    def visit_Program(self, node):
+        return "\n".join(self.visit(statement) for statement in node.statements)
+
+    def visit_Block(self, node):
+        if not node.statements:
+            return "pass"
+        return "\n".join(self.visit(statement) for statement in node.statements)
+
+    def visit_IfStatement(self, node):
+        code = f"if {self.visit(node.condition)}:\n" + self._indent(self.visit(node.then_block))
+        if node.else_block:
+            code += "\nelse:\n" + self._indent(self.visit(node.else_block))
+        return code
+
+    def visit_WhileStatement(self, node):
+        return f"while {self.visit(node.condition)}:\n" + self._indent(self.visit(node.body))
+
+    def visit_ForStatement(self, node):
+        body = self.visit(node.body) + f"\n{self.visit(node.update)}"
+        return f"{self.visit(node.init)}\nwhile {self.visit(node.condition)}:\n{self._indent(body)}"
+
+    def visit_FunctionDeclaration(self, node):
+        return f"def {node.name}({', '.join(node.params)}):\n" + self._indent(self.visit(node.body))
+
+
+def best_time(cls, ast):
+    best = float('inf')
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        output = cls(ast).transpile()
+        best = min(best, time.perf_counter() - start)
+    return best, output
+
+
+def main(depths):
+    sys.setrecursionlimit(max(10000, max(depths) * 50))
+    print(f"{'profundidade':>12} {'linhas':>8} {'reindentação (ms)':>18} {'buffer (ms)':>12} {'ganho':>7}")
+    for depth in depths:
+        ast = Parser(generate_nested(depth)).parse_program()
+        old, old_output = best_time(ReindentingTranspiler, ast)
+        new, new_output = best_time(Transpiler, ast)
+        assert old_output == new_output, "saídas diferentes"
+        print(f"{depth:>12} {new_output.count(chr(10)) + 1:>8} {old * 1000:>18.2f} {new * 1000:>12.2f} {old / new:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10, 50, 200, 400])
@@ -0,0 +1,90 @@
+"""
+Benchmark do '+' com tipos inferidos
+
+Executa o código gerado para programas com somas e concatenações nas duas
+formas: sem tipos (todo '+' passa pelo helper js_add, como para operandos
+desconhecidos) e com os tipos de translator/type_inference.py (soma e
+concatenação com o operador do Python, inclusive somas de resultados de
+funções). Mede o Python transpilado (-t) e o gerado para o motor
+--engine=python.
+
+Uso:
+    python benchmarks/bench_type_inference.py [tamanho]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interpreter.runtime import namespace
+from parser.parser import Parser
+from translator.runtime_transpiler import RuntimeTranspiler
+from translator.transpiler import Transpiler
+
+REPEAT = 5
+
+PROGRAMS = {
+    'soma numérica': '''
+let total = 0;
+for (let i = 0; i < {size}; i++) {{
+    let q = i * i;
+    total = total + q + i + 1;
+}}
+console.log(total);
+''',
+    'soma de chamadas': '''
+function quadrado(x) {{
+    return x * x;
+}}
+let total = 0;
+for (let i = 0; i < {size}; i++) {{
+    total = total + quadrado(i) + quadrado(i + 1);
+}}
+console.log(total);
+''',
+    'concatenação': '''
+let tamanho = 0;
+for (let i = 0; i < {size}; i++) {{
+    let linha = "item " + i + ": " + i * 2;
+    tamanho = tamanho + linha.length;
+}}
+console.log(tamanho);
+''',
+}
+
+
+def untyped(cls):
+    """Gerador que não usa os tipos inferidos"""
+    class Untyped(cls):
+        def _analyze(self):
+            super()._analyze()
+            self._types = {}
+    return Untyped
+
+
+def best_time(python_code, names):
+    code = compile(python_code, '<transpilado>', 'exec')
+    best = float('inf')
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            exec(code, names())
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(size):
+    print(f"{'programa':<16} {'gerador':<12} {'sem tipos (ms)':>15} {'com tipos (ms)':>15} {'ganho':>7}")
+    for name, template in PROGRAMS.items():
+        ast = Parser(template.format(size=size * 10)).parse_program()
+        for label, cls, names in (('-t', Transpiler, dict), ('python', RuntimeTranspiler, namespace)):
+            old = best_time(untyped(cls)(ast).transpile(), names)
+            new = best_time(cls(ast).transpile(), names)
+            print(f"{name:<16} {label:<12} {old * 1000:>15.2f} {new * 1000:>15.2f} {old / new:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,27 @@
+"""
+Geradores de programas JavaScript sintéticos para os benchmarks
+Produzem código válido para o tokenizer/parser, com tamanho controlado
+"""
+
+SNIPPET = '''// Bloco {i}
+var total{i} = 0;
+let nome{i} = "item {i}";
+/* comentário
+   multilinha {i} */
+function soma{i}(a, b) {{
+    if (a > b && b >= 0) {{
+        return a + b * 2;
+    }} else {{
+        return a - b / 3;
+    }}
+}}
+for (let i = 0; i < 10; i++) {{
+    total{i} += soma{i}(i, {i});
+}}
+console.log(nome{i} + ": " + total{i});
+'''
+
+
+def generate_program(blocks):
+    """Gera um programa com `blocks` repetições de um trecho variado"""
+    return ''.join(SNIPPET.format(i=i) for i in range(blocks))
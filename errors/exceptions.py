@@ -45,7 +45,7 @@ class LexerError(CompilerError):
 
 class ParserError(CompilerError):
     """Erro durante a análise sintática"""
-    def __init__(self, expected, found, position=None, context=None):
+    def __init__(self, expected, found, position=None, context=None, source_line=None):
         message = f"Erro de sintaxe"
         
         if context:
@@ -53,6 +53,9 @@ class ParserError(CompilerError):
         else:
             error_context = f"Esperado '{expected}', mas encontrado '{found}'"
         
+        if source_line:
+            error_context += f"\n{source_line}"
+        
         # Sugestões baseadas no tipo de erro
         suggestion = self._get_suggestion(expected, found)
         
@@ -78,12 +81,15 @@ class ParserError(CompilerError):
 
 class InterpreterError(CompilerError):
     """Erro durante a interpretação/execução"""
-    def __init__(self, message, context=None, variable_state=None):
+    def __init__(self, message, context=None, variable_state=None, source_line=None):
         suggestion = "Verifique os valores das variáveis e a lógica do programa"
         
         if variable_state:
             context = f"{context or message}. Estado das variáveis: {variable_state}"
         
+        if source_line:
+            context = f"{context or message}\n{source_line}"
+        
         super().__init__(
             "Erro durante a execução",
             context=context,
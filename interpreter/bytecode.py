@@ -0,0 +1,133 @@
+"""
+Formato de bytecode do interpretador e disassembler
+
+Um CodeObject guarda a sequência de instruções de um programa ou de um corpo
+de função. Cada instrução é uma tupla (opcode, argumento); o argumento é o
+próprio valor usado pela VM (constante, índice do quadro, nome, destino de
+salto, função do operador...), sem tabelas intermediárias. A máquina é de
+pilha: as expressões empilham seus resultados e as instruções consomem os
+operandos do topo.
+
+Opcodes:
+
+    LOAD_CONST valor          empilha uma constante
+    LOAD_LOCAL i              empilha a variável na posição i do quadro
+    STORE_LOCAL i             desempilha para a posição i do quadro
+    LOAD_NAME nome            empilha a variável buscada por nome na cadeia
+    STORE_NAME nome           desempilha para o nome no escopo corrente
+    UPDATE_LOCAL (i, d, pre)  ++/-- na posição i (d = +1/-1), empilha o resultado
+    UPDATE_NAME (nome, d, pre)
+    POP_TOP / DUP_TOP
+    BINARY_ADD                '+' com concatenação de strings
+    BINARY_OP fn              aritmética (-, *, /, %)
+    COMPARE_OP fn             comparações (==, ===, !=, !==, <, >, <=, >=)
+    UNARY_NOT / UNARY_NEGATIVE / UNARY_POSITIVE
+    JUMP alvo / POP_JUMP_IF_FALSE alvo
+    JUMP_IF_FALSE_OR_POP alvo / JUMP_IF_TRUE_OR_POP alvo
+                              '&&' e '||': se o topo decide o resultado,
+                              salta mantendo-o; senão o descarta e segue
+                              para o lado direito
+    LOAD_FUNCTION nome        empilha a função chamada (antes dos argumentos)
+    CALL n                    chama a função abaixo dos n argumentos
+    RETURN_VALUE              devolve o topo da pilha a quem chamou
+    DECLARE_FUNCTION nó       cria a função no escopo corrente
+    GET_ITEM / SET_ITEM       obj[chave] (leitura / atribuição)
+    GET_ATTR nome / SET_ATTR nome
+    BUILD_LIST n / BUILD_MAP n
+    PRINT                     console.log do topo da pilha
+    FOR_SAVE nome / FOR_RESTORE nome
+                              salva e restaura a variável de um for
+    EVAL_NODE nó / EXEC_NODE nó
+                              avalia (empilhando) ou executa um nó sem
+                              compilador próprio pelo visitante da AST
+"""
+
+OPNAMES = (
+    'LOAD_CONST', 'LOAD_LOCAL', 'STORE_LOCAL', 'LOAD_NAME', 'STORE_NAME',
+    'UPDATE_LOCAL', 'UPDATE_NAME', 'POP_TOP', 'DUP_TOP',
+    'BINARY_ADD', 'BINARY_OP', 'COMPARE_OP',
+    'UNARY_NOT', 'UNARY_NEGATIVE', 'UNARY_POSITIVE',
+    'JUMP', 'POP_JUMP_IF_FALSE', 'JUMP_IF_FALSE_OR_POP', 'JUMP_IF_TRUE_OR_POP',
+    'LOAD_FUNCTION', 'CALL', 'RETURN_VALUE', 'DECLARE_FUNCTION',
+    'GET_ITEM', 'SET_ITEM', 'GET_ATTR', 'SET_ATTR',
+    'BUILD_LIST', 'BUILD_MAP', 'PRINT', 'FOR_SAVE', 'FOR_RESTORE',
+    'EVAL_NODE', 'EXEC_NODE',
+)
+
+(
+    LOAD_CONST, LOAD_LOCAL, STORE_LOCAL, LOAD_NAME, STORE_NAME,
+    UPDATE_LOCAL, UPDATE_NAME, POP_TOP, DUP_TOP,
+    BINARY_ADD, BINARY_OP, COMPARE_OP,
+    UNARY_NOT, UNARY_NEGATIVE, UNARY_POSITIVE,
+    JUMP, POP_JUMP_IF_FALSE, JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP,
+    LOAD_FUNCTION, CALL, RETURN_VALUE, DECLARE_FUNCTION,
+    GET_ITEM, SET_ITEM, GET_ATTR, SET_ATTR,
+    BUILD_LIST, BUILD_MAP, PRINT, FOR_SAVE, FOR_RESTORE,
+    EVAL_NODE, EXEC_NODE,
+) = range(len(OPNAMES))
+
+JUMPS = frozenset({JUMP, POP_JUMP_IF_FALSE, JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP})
+
+
+class CodeObject:
+    """Instruções de um programa ou corpo de função"""
+    __slots__ = ('name', 'instructions', 'varnames', 'functions')
+
+    def __init__(self, name, varnames=()):
+        self.name = name
+        self.instructions = []
+        # Nome de cada posição do quadro (para a busca por nome e o disassembler)
+        self.varnames = tuple(varnames)
+        # Corpos de funções declaradas neste código, já compilados
+        self.functions = []
+
+    def emit(self, op, arg=None):
+        self.instructions.append((op, arg))
+        return len(self.instructions) - 1
+
+    def patch(self, index, target):
+        """Ajusta o destino de um salto emitido antes de conhecer o alvo"""
+        op, _ = self.instructions[index]
+        self.instructions[index] = (op, target)
+
+    def __len__(self):
+        return len(self.instructions)
+
+
+def _describe(code, op, arg, operator_names):
+    if op == LOAD_CONST:
+        return repr(arg)
+    if arg is None:
+        return ''
+    if op in (LOAD_LOCAL, STORE_LOCAL):
+        return f"{arg} ({code.varnames[arg]})"
+    if op == UPDATE_LOCAL:
+        slot, step, prefix = arg
+        return f"{slot} ({code.varnames[slot]}) {'++' if step > 0 else '--'}{' pré' if prefix else ''}"
+    if op == UPDATE_NAME:
+        name, step, prefix = arg
+        return f"{name} {'++' if step > 0 else '--'}{' pré' if prefix else ''}"
+    if op in (BINARY_OP, COMPARE_OP):
+        return operator_names.get(arg, repr(arg))
+    if op in JUMPS:
+        return f"-> {arg}"
+    if op == DECLARE_FUNCTION:
+        return f"<função {arg.name}>"
+    if op in (EVAL_NODE, EXEC_NODE):
+        return f"<{type(arg).__name__}>"
+    return str(arg)
+
+
+def disassemble(code, operator_names=None):
+    """Listagem legível das instruções de `code` e das funções aninhadas"""
+    if operator_names is None:
+        from interpreter.operators import OPERATOR_NAMES as operator_names
+    targets = {arg for op, arg in code.instructions if op in JUMPS}
+    lines = [f"Código de {code.name}:"]
+    for index, (op, arg) in enumerate(code.instructions):
+        marker = '>>' if index in targets else '  '
+        lines.append(f"{marker} {index:>4} {OPNAMES[op]:<18} {_describe(code, op, arg, operator_names)}".rstrip())
+    for function in code.functions:
+        lines.append('')
+        lines.append(disassemble(function, operator_names))
+    return "\n".join(lines)
@@ -0,0 +1,301 @@
+"""
+Compilador da AST para o bytecode de interpreter/bytecode.py
+
+Espera uma AST já resolvida (interpreter/resolver.py): variáveis com
+posição no quadro viram LOAD_LOCAL/STORE_LOCAL e as demais LOAD_NAME/
+STORE_NAME. Nós sem tradução própria (classes, métodos, this, lambdas,
+for...of, chamadas de método) viram EVAL_NODE/EXEC_NODE e são executados
+pelo visitante da AST, com a mesma semântica do interpretador.
+"""
+from ast_nodes.nodes import Identifier, MemberAccess, PropertyAccess
+from interpreter.bytecode import (
+    CodeObject,
+    LOAD_CONST, LOAD_LOCAL, STORE_LOCAL, LOAD_NAME, STORE_NAME,
+    UPDATE_LOCAL, UPDATE_NAME, POP_TOP, DUP_TOP,
+    BINARY_ADD, BINARY_OP, COMPARE_OP,
+    UNARY_NOT, UNARY_NEGATIVE, UNARY_POSITIVE,
+    JUMP, POP_JUMP_IF_FALSE, JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP,
+    LOAD_FUNCTION, CALL, RETURN_VALUE, DECLARE_FUNCTION,
+    GET_ITEM, SET_ITEM, GET_ATTR, SET_ATTR,
+    BUILD_LIST, BUILD_MAP, PRINT, FOR_SAVE, FOR_RESTORE,
+    EVAL_NODE, EXEC_NODE,
+)
+from interpreter.operators import BINARY_OPERATORS, COMPARISONS
+
+_LITERALS = {'null': None, 'undefined': None, 'true': True, 'false': False}
+
+_LOGICAL_JUMPS = {'&&': JUMP_IF_FALSE_OR_POP, '||': JUMP_IF_TRUE_OR_POP}
+
+# Statements que não deixam valor na pilha; os demais nós usados como
+# statement são expressões, compiladas seguidas de POP_TOP
+_STATEMENTS = frozenset({
+    'Program', 'Block', 'Comment', 'InlineComment', 'VariableDeclaration',
+    'ConsoleLog', 'IfStatement', 'WhileStatement', 'ForStatement',
+    'ForEachStatement', 'FunctionDeclaration', 'ReturnStatement',
+    'ClassDeclaration', 'ConstructorDeclaration', 'MethodDeclaration',
+})
+
+
+def _varnames(layout):
+    names = [None] * len(layout)
+    for name, index in layout.items():
+        names[index] = name
+    return names
+
+
+class BytecodeCompiler:
+    def __init__(self):
+        # Corpo de função (nó Block) -> CodeObject compilado
+        self.codes = {}
+        self.code = None
+        self.in_function = False
+
+    def compile_program(self, node, layout):
+        code = CodeObject('<programa>', _varnames(layout))
+        self._compile_into(code, node, in_function=False)
+        code.emit(LOAD_CONST, None)
+        code.emit(RETURN_VALUE)
+        return code
+
+    def compile_function(self, name, body, layout):
+        """Compila (uma única vez) o corpo de uma função"""
+        code = self.codes.get(body)
+        if code is None:
+            code = CodeObject(name, _varnames(layout or {}))
+            self.codes[body] = code
+            self._compile_into(code, body, in_function=True)
+            code.emit(LOAD_CONST, None)
+            code.emit(RETURN_VALUE)
+        return code
+
+    def _compile_into(self, code, node, in_function):
+        outer = self.code, self.in_function
+        self.code, self.in_function = code, in_function
+        try:
+            self.statement(node)
+        finally:
+            self.code, self.in_function = outer
+
+    def emit(self, op, arg=None):
+        return self.code.emit(op, arg)
+
+    # --- Statements ---
+
+    def statement(self, node):
+        name = type(node).__name__
+        compiler = getattr(self, 'statement_' + name, None)
+        if compiler is not None:
+            compiler(node)
+        elif name in _STATEMENTS:
+            self.emit(EXEC_NODE, node)
+        else:
+            self.expression(node)
+            self.emit(POP_TOP)
+
+    def statement_Program(self, node):
+        for statement in node.statements:
+            self.statement(statement)
+
+    statement_Block = statement_Program
+
+    def statement_Comment(self, node):
+        pass
+
+    def statement_InlineComment(self, node):
+        self.statement(node.statement)
+
+    def statement_VariableDeclaration(self, node):
+        if node.name.startswith(('self.', 'this.')):
+            self.emit(EXEC_NODE, node)
+            return
+        self.expression(node.value)
+        self.store(node.name, node.slot)
+
+    def statement_Assignment(self, node):
+        if isinstance(node.target, Identifier):
+            self.expression(node.value)
+            self.store(node.target.name, node.target.slot)
+        else:
+            self.expression(node)
+            self.emit(POP_TOP)
+
+    def statement_ConsoleLog(self, node):
+        self.expression(node.argument)
+        self.emit(PRINT)
+
+    def statement_IfStatement(self, node):
+        self.expression(node.condition)
+        jump_else = self.emit(POP_JUMP_IF_FALSE)
+        self.statement(node.then_block)
+        if node.else_block:
+            jump_end = self.emit(JUMP)
+            self.code.patch(jump_else, len(self.code))
+            self.statement(node.else_block)
+            self.code.patch(jump_end, len(self.code))
+        else:
+            self.code.patch(jump_else, len(self.code))
+
+    def statement_WhileStatement(self, node):
+        start = len(self.code)
+        self.expression(node.condition)
+        jump_end = self.emit(POP_JUMP_IF_FALSE)
+        self.statement(node.body)
+        self.emit(JUMP, start)
+        self.code.patch(jump_end, len(self.code))
+
+    def statement_ForStatement(self, node):
+        loop_var_name = None
+        if node.init and hasattr(node.init, 'name'):
+            loop_var_name = node.init.name
+            self.emit(FOR_SAVE, loop_var_name)
+        if node.init:
+            self.statement(node.init)
+        start = len(self.code)
+        jump_end = None
+        if node.condition:
+            self.expression(node.condition)
+            jump_end = self.emit(POP_JUMP_IF_FALSE)
+        self.statement(node.body)
+        if node.update:
+            self.statement(node.update)
+        self.emit(JUMP, start)
+        if jump_end is not None:
+            self.code.patch(jump_end, len(self.code))
+        if loop_var_name:
+            self.emit(FOR_RESTORE, loop_var_name)
+
+    def statement_FunctionDeclaration(self, node):
+        self.code.functions.append(self.compile_function(node.name, node.body, node.frame))
+        self.emit(DECLARE_FUNCTION, node)
+
+    def statement_ReturnStatement(self, node):
+        if not self.in_function:
+            # Fora de função, o return segue o comportamento do visitante
+            self.emit(EXEC_NODE, node)
+            return
+        if node.expression:
+            self.expression(node.expression)
+        else:
+            self.emit(LOAD_CONST, None)
+        self.emit(RETURN_VALUE)
+
+    # --- Expressões ---
+
+    def expression(self, node):
+        compiler = getattr(self, 'expression_' + type(node).__name__, None)
+        if compiler is None:
+            self.emit(EVAL_NODE, node)
+        else:
+            compiler(node)
+
+    def load(self, name, slot):
+        if slot is None:
+            self.emit(LOAD_NAME, name)
+        else:
+            self.emit(LOAD_LOCAL, slot)
+
+    def store(self, name, slot):
+        if slot is None:
+            self.emit(STORE_NAME, name)
+        else:
+            self.emit(STORE_LOCAL, slot)
+
+    def expression_Literal(self, node):
+        value = node.value
+        if isinstance(value, str) and value in _LITERALS:
+            value = _LITERALS[value]
+        self.emit(LOAD_CONST, value)
+
+    def expression_Identifier(self, node):
+        self.load(node.name, node.slot)
+
+    def expression_Assignment(self, node):
+        target = node.target
+        if isinstance(target, Identifier):
+            self.expression(node.value)
+            self.emit(DUP_TOP)
+            self.store(target.name, target.slot)
+        elif isinstance(target, MemberAccess):
+            self.expression(node.value)
+            self.expression(target.object)
+            self.expression(target.key)
+            self.emit(SET_ITEM)
+        elif isinstance(target, PropertyAccess):
+            self.expression(node.value)
+            self.expression(target.object)
+            self.emit(SET_ATTR, target.property_name)
+        else:
+            self.emit(EVAL_NODE, node)
+
+    expression_AssignmentExpression = expression_Assignment
+
+    def expression_BinaryOp(self, node):
+        if node.op in _LOGICAL_JUMPS:
+            # Curto-circuito: o lado direito só roda se o esquerdo não decidir
+            self.expression(node.left)
+            jump_end = self.emit(_LOGICAL_JUMPS[node.op])
+            self.expression(node.right)
+            self.code.patch(jump_end, len(self.code))
+            return
+        if node.op not in BINARY_OPERATORS:
+            self.emit(EVAL_NODE, node)
+            return
+        self.expression(node.left)
+        self.expression(node.right)
+        if node.op == '+':
+            self.emit(BINARY_ADD)
+        elif node.op in COMPARISONS:
+            self.emit(COMPARE_OP, BINARY_OPERATORS[node.op])
+        else:
+            self.emit(BINARY_OP, BINARY_OPERATORS[node.op])
+
+    def expression_UnaryOp(self, node):
+        ops = {'!': UNARY_NOT, '-': UNARY_NEGATIVE, '+': UNARY_POSITIVE}
+        if node.op not in ops:
+            self.emit(EVAL_NODE, node)
+            return
+        self.expression(node.operand)
+        self.emit(ops[node.op])
+
+    def expression_UpdateExpression(self, node):
+        operand = node.operand
+        if not isinstance(operand, Identifier) or node.operator not in ('++', '--'):
+            self.emit(EVAL_NODE, node)
+            return
+        step = 1 if node.operator == '++' else -1
+        if operand.slot is None:
+            self.emit(UPDATE_NAME, (operand.name, step, node.prefix))
+        else:
+            self.emit(UPDATE_LOCAL, (operand.slot, step, node.prefix))
+
+    def expression_FunctionCall(self, node):
+        self.emit(LOAD_FUNCTION, node.name)
+        for argument in node.arguments:
+            self.expression(argument)
+        self.emit(CALL, len(node.arguments))
+
+    def expression_ArrayLiteral(self, node):
+        for element in node.elements:
+            self.expression(element)
+        self.emit(BUILD_LIST, len(node.elements))
+
+    def expression_ObjectLiteral(self, node):
+        for key, value in node.pairs:
+            if isinstance(key, str):
+                self.emit(LOAD_CONST, key)
+            else:
+                self.expression(key)
+            self.expression(value)
+        self.emit(BUILD_MAP, len(node.pairs))
+
+    def expression_MemberAccess(self, node):
+        self.expression(node.object)
+        if node.is_dot:
+            self.emit(LOAD_CONST, node.key)
+        else:
+            self.expression(node.key)
+        self.emit(GET_ITEM)
+
+    def expression_PropertyAccess(self, node):
+        self.expression(node.object)
+        self.emit(GET_ATTR, node.property_name)
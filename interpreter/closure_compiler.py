@@ -0,0 +1,414 @@
+"""
+Motor de execução por compilação em closures
+
+Cada nó da AST é compilado uma única vez em uma função Python aninhada que
+recebe o escopo corrente: um BinaryOp '+' vira algo como
+`lambda env: l(env) + r(env)`. A execução passa a ser só chamadas de
+closures, sem despacho de visitante por nó nem cadeias if/elif sobre
+`node.op` (o operador é escolhido na compilação). Como no visitante, um
+return é sinalizado devolvendo RETURN pelos statements até a chamada.
+
+Os nós sem compilador próprio (classes, métodos, this, lambdas...) viram uma
+closure que delega ao visitante herdado de Interpreter, então a semântica é
+exatamente a do interpretador. `self.environment` continua sendo o escopo
+corrente durante toda a execução, para que os dois caminhos convivam.
+"""
+from ast_nodes.nodes import Identifier, MemberAccess
+from interpreter.interpreter import Interpreter, RETURN
+from interpreter.operators import BINARY_OPERATORS, UNARY_OPERATORS
+from interpreter.scope import Scope, UNSET
+
+
+_LITERALS = {'null': None, 'undefined': None, 'true': True, 'false': False}
+
+
+class ClosureInterpreter(Interpreter):
+    def __init__(self, ast, line_index=None):
+        super().__init__(ast, line_index)
+        # Tabela de compilação: tipo do nó -> método compile_* (ou fallback)
+        self._compilers = {}
+        # Corpos de função já compilados, por nó
+        self._codes = {}
+
+    def execute(self):
+        return self.code_for(self.ast)(self.environment)
+
+    def code_for(self, node):
+        """Closure do nó, compilada na primeira vez e reaproveitada depois"""
+        code = self._codes.get(node)
+        if code is None:
+            code = self.compile(node)
+            self._codes[node] = code
+        return code
+
+    def compile(self, node):
+        try:
+            compiler = self._compilers[node.__class__]
+        except KeyError:
+            compiler = getattr(self, 'compile_' + node.__class__.__name__, self.compile_fallback)
+            self._compilers[node.__class__] = compiler
+        return compiler(node)
+
+    def compile_fallback(self, node):
+        visit = self.visit
+
+        def run(env):
+            return visit(node)
+        return run
+
+    def compile_sequence(self, statements):
+        codes = tuple(self.compile(statement) for statement in statements)
+
+        def run(env):
+            for code in codes:
+                if code(env) is RETURN:
+                    return RETURN
+        return run
+
+    # --- Statements ---
+
+    def compile_Program(self, node):
+        sequence = self.compile_sequence(node.statements)
+
+        def run(env):
+            # return fora de função encerra o programa
+            sequence(env)
+        return run
+
+    def compile_Block(self, node):
+        return self.compile_sequence(node.statements)
+
+    def compile_Comment(self, node):
+        return lambda env: None
+
+    def compile_InlineComment(self, node):
+        return self.compile(node.statement)
+
+    def compile_VariableDeclaration(self, node):
+        if node.name.startswith(('self.', 'this.')):
+            return self.compile_fallback(node)
+        value = self.compile(node.value)
+        name = node.name
+        slot = node.slot
+
+        if slot is None:
+            def declare(env):
+                result = value(env)
+                env[name] = result
+                return result
+        else:
+            def declare(env):
+                result = value(env)
+                env.slots[slot] = result
+                return result
+        return declare
+
+    def compile_Assignment(self, node):
+        target = node.target
+        value = self.compile(node.value)
+
+        if isinstance(target, Identifier):
+            name = target.name
+            slot = target.slot
+            if slot is None:
+                def assign(env):
+                    result = value(env)
+                    env[name] = result
+                    return result
+            else:
+                def assign(env):
+                    result = value(env)
+                    env.slots[slot] = result
+                    return result
+            return assign
+
+        if isinstance(target, MemberAccess):
+            obj_code = self.compile(target.object)
+            key_code = self.compile(target.key)
+
+            def assign_member(env):
+                result = value(env)
+                obj = obj_code(env)
+                key = key_code(env)
+                if isinstance(obj, list):
+                    if isinstance(key, (int, float)):
+                        index = int(key)
+                        if 0 <= index < len(obj):
+                            obj[index] = result
+                        else:
+                            raise IndexError(f"Índice {index} fora dos limites do array")
+                    else:
+                        raise TypeError("Índice de array deve ser numérico")
+                elif isinstance(obj, dict):
+                    obj[key] = result
+                else:
+                    raise TypeError("Só é possível atribuir a arrays ou objetos")
+                return result
+            return assign_member
+
+        return self.compile_fallback(node)
+
+    def compile_AssignmentExpression(self, node):
+        return self.compile_Assignment(node)
+
+    def compile_ConsoleLog(self, node):
+        argument = self.compile(node.argument)
+
+        def log(env):
+            value_to_print = argument(env)
+            if isinstance(value_to_print, dict) and value_to_print.get('type') == 'instance':
+                print(f"[object {value_to_print['class']}]")
+            else:
+                print(value_to_print)
+        return log
+
+    def compile_IfStatement(self, node):
+        condition = self.compile(node.condition)
+        then_block = self.compile(node.then_block)
+        else_block = self.compile(node.else_block) if node.else_block else None
+
+        def run_if(env):
+            if condition(env):
+                return then_block(env)
+            elif else_block is not None:
+                return else_block(env)
+        return run_if
+
+    def compile_WhileStatement(self, node):
+        condition = self.compile(node.condition)
+        body = self.compile(node.body)
+
+        def run_while(env):
+            while condition(env):
+                if body(env) is RETURN:
+                    return RETURN
+        return run_while
+
+    def compile_ForStatement(self, node):
+        init = self.compile(node.init) if node.init else None
+        condition = self.compile(node.condition) if node.condition else None
+        update = self.compile(node.update) if node.update else None
+        body = self.compile(node.body)
+        loop_var_name = node.init.name if node.init and hasattr(node.init, 'name') else None
+
+        def run_for(env):
+            loop_var_old_value = None
+            if loop_var_name and loop_var_name in env:
+                loop_var_old_value = env[loop_var_name]
+            try:
+                if init is not None:
+                    init(env)
+                while True:
+                    if condition is not None and not condition(env):
+                        break
+                    if body(env) is RETURN:
+                        return RETURN
+                    if update is not None:
+                        update(env)
+            finally:
+                if loop_var_name:
+                    if loop_var_old_value is not None:
+                        env[loop_var_name] = loop_var_old_value
+                    elif loop_var_name in env:
+                        del env[loop_var_name]
+        return run_for
+
+    def compile_FunctionDeclaration(self, node):
+        name = node.name
+
+        def declare(env):
+            env[name] = {
+                'type': 'function',
+                'params': node.params,
+                'body': node.body,
+                'frame': node.frame,
+                'environment': env
+            }
+        return declare
+
+    def compile_ReturnStatement(self, node):
+        expression = self.compile(node.expression) if node.expression else None
+
+        def run_return(env):
+            self.return_value = expression(env) if expression is not None else None
+            return RETURN
+        return run_return
+
+    # --- Expressões ---
+
+    def compile_Literal(self, node):
+        value = node.value
+        if isinstance(value, str) and value in _LITERALS:
+            value = _LITERALS[value]
+        return lambda env: value
+
+    def compile_Identifier(self, node):
+        name = node.name
+        slot = node.slot
+
+        def lookup(env):
+            value = env.lookup(name, UNSET)
+            if value is UNSET:
+                raise NameError(f"A variável '{name}' não foi definida.")
+            return value
+
+        if slot is None:
+            return lookup
+
+        def load(env):
+            value = env.slots[slot]
+            if value is not UNSET:
+                return value
+            return lookup(env)
+        return load
+
+    def compile_BinaryOp(self, node):
+        left = self.compile(node.left)
+        right = self.compile(node.right)
+        op = node.op
+
+        if op == '+':
+            def add(env):
+                left_val = left(env)
+                right_val = right(env)
+                if isinstance(left_val, str) or isinstance(right_val, str):
+                    return str(left_val) + str(right_val)
+                return left_val + right_val
+            return add
+
+        # Curto-circuito: o lado direito só roda quando o esquerdo não decide
+        if op == '&&':
+            def logical_and(env):
+                left_val = left(env)
+                return right(env) if left_val else left_val
+            return logical_and
+
+        if op == '||':
+            def logical_or(env):
+                left_val = left(env)
+                return left_val if left_val else right(env)
+            return logical_or
+
+        operator = BINARY_OPERATORS.get(op)
+        if operator is None:
+            def unknown(env):
+                left(env)
+                raise Exception(f"Operador desconhecido: {op}")
+            return unknown
+
+        def binary(env):
+            return operator(left(env), right(env))
+        return binary
+
+    def compile_UnaryOp(self, node):
+        operand = self.compile(node.operand)
+        op = node.op
+        apply = UNARY_OPERATORS.get(op)
+
+        if apply is None:
+            def unsupported(env):
+                operand(env)
+                raise ValueError(f"Operador unário não suportado: {op}")
+            return unsupported
+
+        def unary(env):
+            return apply(operand(env))
+        return unary
+
+    def compile_UpdateExpression(self, node):
+        if not isinstance(node.operand, Identifier) or node.operator not in ('++', '--'):
+            return self.compile_fallback(node)
+        name = node.operand.name
+        slot = node.operand.slot
+        step = 1 if node.operator == '++' else -1
+        prefix = node.prefix
+
+        def update(env):
+            current_value = UNSET if slot is None else env.slots[slot]
+            if current_value is UNSET:
+                current_value = env.get(name, 0)
+            new_value = current_value + step
+            if slot is None:
+                env[name] = new_value
+            else:
+                env.slots[slot] = new_value
+            return new_value if prefix else current_value
+        return update
+
+    def compile_FunctionCall(self, node):
+        name = node.name
+        arguments = tuple(self.compile(arg) for arg in node.arguments)
+        code_for = self.code_for
+
+        def call(env):
+            func = env.lookup(name, UNSET)
+            if func is UNSET:
+                raise NameError(f"Função '{name}' não foi definida.")
+            if func.get('type') != 'function':
+                raise TypeError(f"'{name}' não é uma função.")
+
+            args = [argument(env) for argument in arguments]
+            frame = Scope(env, func['frame'])
+            frame.bind(func['params'], args)
+            body = code_for(func['body'])
+
+            self.environment = frame
+            try:
+                result = self.return_value if body(frame) is RETURN else None
+            finally:
+                self.environment = env
+            return result
+        return call
+
+    def compile_ArrayLiteral(self, node):
+        elements = tuple(self.compile(element) for element in node.elements)
+        return lambda env: [element(env) for element in elements]
+
+    def compile_ObjectLiteral(self, node):
+        pairs = tuple(
+            ((lambda env, key=key: key) if isinstance(key, str) else self.compile(key), self.compile(value))
+            for key, value in node.pairs
+        )
+
+        def build(env):
+            obj = {}
+            for key, value in pairs:
+                obj_key = key(env)
+                obj[obj_key] = value(env)
+            return obj
+        return build
+
+    def compile_MemberAccess(self, node):
+        obj_code = self.compile(node.object)
+        if node.is_dot:
+            key_value = node.key
+            key_code = lambda env: key_value
+        else:
+            key_code = self.compile(node.key)
+
+        def access(env):
+            obj = obj_code(env)
+            key = key_code(env)
+            if isinstance(obj, dict):
+                if obj.get('type') == 'instance':
+                    return obj['properties'].get(key, None)
+                return obj.get(key, None)
+            elif isinstance(obj, list) and isinstance(key, int):
+                return obj[key] if 0 <= key < len(obj) else None
+            raise TypeError(f"Não é possível acessar propriedade de {type(obj)}")
+        return access
+
+    def compile_PropertyAccess(self, node):
+        obj_code = self.compile(node.object)
+        property_name = node.property_name
+
+        def access(env):
+            obj = obj_code(env)
+            if isinstance(obj, (list, str)) and property_name == 'length':
+                return len(obj)
+            if isinstance(obj, dict):
+                if obj.get('type') == 'instance':
+                    return obj['properties'].get(property_name, None)
+                return obj.get(property_name, None)
+            raise TypeError(f"Propriedade '{property_name}' não encontrada para tipo {type(obj)}")
+        return access
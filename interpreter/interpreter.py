@@ -1,11 +1,26 @@
 from ast_nodes.nodes import Literal, Identifier, MemberAccess, PropertyAccess
 import math
 from errors.exceptions import InterpreterError
+from interpreter.operators import BINARY_OPERATORS, UNARY_OPERATORS
+from interpreter.resolver import resolve
+from interpreter.scope import Scope, UNSET
+
+# Sinal devolvido pelos statements quando um return é executado: blocos,
+# condicionais e laços param e o repassam até a chamada, que lê o valor em
+# `return_value`. Evita o custo de lançar e desempilhar uma exceção a cada
+# retorno de função.
+RETURN = object()
 
 class Interpreter:
-    def __init__(self, ast):
+    def __init__(self, ast, line_index=None):
         self.ast = ast
-        self.environment = {}
+        self.line_index = line_index
+        # Variáveis locais resolvidas para posições fixas em cada quadro
+        self.environment = Scope(layout=resolve(ast))
+        # Tabela de despacho: tipo do nó -> método visit_* já resolvido
+        self._dispatch = {}
+        # Valor do último return executado (acompanha o sinal RETURN)
+        self.return_value = None
         self._setup_builtins()
     
     def _setup_builtins(self):
@@ -31,10 +46,17 @@ class Interpreter:
         return self.visit(self.ast)
 
     def visit(self, node):
-        method_name = 'visit_' + node.__class__.__name__
-        visitor = getattr(self, method_name, self.generic_visit)
+        try:
+            visitor = self._dispatch[node.__class__]
+        except KeyError:
+            visitor = self._resolve_visitor(node.__class__)
         return visitor(node)
 
+    def _resolve_visitor(self, node_class):
+        visitor = getattr(self, 'visit_' + node_class.__name__, self.generic_visit)
+        self._dispatch[node_class] = visitor
+        return visitor
+
     def generic_visit(self, node):
         node_type = node.__class__.__name__
         context = f"O interpretador não sabe como executar um nó do tipo '{node_type}'"
@@ -43,14 +65,24 @@ class Interpreter:
         raise InterpreterError(
             f"Nó '{node_type}' não implementado",
             context=context,
-            variable_state=self.environment
+            variable_state=self.environment,
+            source_line=self.source_context(node)
         )
 
+    def source_context(self, node):
+        """Contexto visual do nó na fonte JS, quando a posição é conhecida"""
+        position = getattr(node, 'position', None)
+        if self.line_index is None or position is None:
+            return None
+        return self.line_index.context(position)
+
     # --- Métodos de Visita para Execução ---
 
     def visit_Program(self, node):
         for statement in node.statements:
-            self.visit(statement)
+            # return fora de função encerra o programa
+            if self.visit(statement) is RETURN:
+                return
 
     def visit_VariableDeclaration(self, node):
         value = self.visit(node.value)
@@ -75,14 +107,22 @@ class Interpreter:
             else:
                 raise NameError("'this' não está definido no contexto atual")
         else:
-            self.environment[node.name] = value
+            slot = node.slot
+            if slot is None:
+                self.environment[node.name] = value
+            else:
+                self.environment.slots[slot] = value
             return value
 
     def visit_Assignment(self, node):
         value = self.visit(node.value)
         
         if isinstance(node.target, Identifier):
-            self.environment[node.target.name] = value
+            slot = node.target.slot
+            if slot is None:
+                self.environment[node.target.name] = value
+            else:
+                self.environment.slots[slot] = value
         elif isinstance(node.target, MemberAccess):
             obj = self.visit(node.target.object)
             key = self.visit(node.target.key)
@@ -117,68 +157,35 @@ class Interpreter:
         return value
 
     def visit_BinaryOp(self, node):
+        apply = node.apply
+        if apply is None:
+            return self._visit_unresolved_BinaryOp(node)
+        return apply(self.visit(node.left), self.visit(node.right))
+
+    def _visit_unresolved_BinaryOp(self, node):
+        """'&&' e '||' (que nunca guardam função no nó) ou a primeira avaliação de um operador"""
+        op = node.op
         left_val = self.visit(node.left)
-        right_val = self.visit(node.right)
-
-        if node.op == '+':
-            if isinstance(left_val, str) or isinstance(right_val, str):
-                return str(left_val) + str(right_val)
-            else:
-                return left_val + right_val
-        elif node.op == '-':
-            return left_val - right_val
-        elif node.op == '*':
-            return left_val * right_val
-        elif node.op == '/':
-            if right_val == 0:
-                return float('inf') if left_val > 0 else float('-inf') if left_val < 0 else float('nan')
-            return left_val / right_val
-        elif node.op == '%':
-            if right_val == 0:
-                return float('nan')
-            return left_val % right_val
-        elif node.op in ('==', '==='):
-            return left_val == right_val
-        elif node.op in ('!=', '!=='):
-            return left_val != right_val
-        elif node.op == '>':
-            if left_val is None or right_val is None:
-                return False
-            return left_val > right_val
-        elif node.op == '<':
-            if left_val is None or right_val is None:
-                return False
-            return left_val < right_val
-        elif node.op == '>=':
-            if left_val is None or right_val is None:
-                return False
-            return left_val >= right_val
-        elif node.op == '<=':
-            if left_val is None or right_val is None:
-                return False
-            return left_val <= right_val
-        elif node.op == '&&':
-            return left_val and right_val
-        elif node.op == '||':
-            return left_val or right_val
-        
-        raise Exception(f"Operador desconhecido: {node.op}")
+        # Curto-circuito: o lado direito só é visitado se for preciso
+        if op == '&&':
+            return self.visit(node.right) if left_val else left_val
+        if op == '||':
+            return left_val if left_val else self.visit(node.right)
+        apply = BINARY_OPERATORS.get(op)
+        if apply is None:
+            raise Exception(f"Operador desconhecido: {op}")
+        node.apply = apply
+        return apply(left_val, self.visit(node.right))
 
     def visit_UnaryOp(self, node):
         operand = self.visit(node.operand)
-        
-        if node.op == '-':
-            return -operand
-        elif node.op == '+':
-            return +operand
-        elif node.op == '!':
-            return not operand
-        elif node.op == '++':
-            return operand + 1
-        elif node.op == '--':
-            return operand - 1
-        
-        raise Exception(f"Operador unário desconhecido: {node.op}")
+
+        apply = node.apply
+        if apply is None:
+            apply = node.apply = UNARY_OPERATORS.get(node.op)
+            if apply is None:
+                raise ValueError(f"Operador unário não suportado: {node.op}")
+        return apply(operand)
 
     def visit_AssignmentExpression(self, node):
         return self.visit_Assignment(node)
@@ -195,10 +202,15 @@ class Interpreter:
         return node.value
 
     def visit_Identifier(self, node):
-        if node.name in self.environment:
-            return self.environment[node.name]
-        else:
+        slot = node.slot
+        if slot is not None:
+            value = self.environment.slots[slot]
+            if value is not UNSET:
+                return value
+        value = self.environment.lookup(node.name, UNSET)
+        if value is UNSET:
             raise NameError(f"A variável '{node.name}' não foi definida.")
+        return value
 
     def visit_ConsoleLog(self, node):
         value_to_print = self.visit(node.argument)
@@ -210,13 +222,14 @@ class Interpreter:
     def visit_IfStatement(self, node):
         condition_val = self.visit(node.condition)
         if condition_val:
-            self.visit(node.then_block)
+            return self.visit(node.then_block)
         elif node.else_block:
-            self.visit(node.else_block)
+            return self.visit(node.else_block)
 
     def visit_Block(self, node):
         for statement in node.statements:
-            self.visit(statement)
+            if self.visit(statement) is RETURN:
+                return RETURN
 
     def visit_Comment(self, node):
         # Comentários são ignorados durante a interpretação
@@ -228,44 +241,38 @@ class Interpreter:
 
     def visit_WhileStatement(self, node):
         while self.visit(node.condition):
-            self.visit(node.body)
+            if self.visit(node.body) is RETURN:
+                return RETURN
 
     def visit_FunctionDeclaration(self, node):
         self.environment[node.name] = {
             'type': 'function',
             'params': node.params,
             'body': node.body,
-            'environment': self.environment.copy()
+            'frame': node.frame,
+            'environment': self.environment
         }
 
     def visit_ReturnStatement(self, node):
-        value = self.visit(node.expression) if node.expression else None
-        raise ReturnException(value)
+        self.return_value = self.visit(node.expression) if node.expression else None
+        return RETURN
 
     def visit_FunctionCall(self, node):
-        if node.name not in self.environment:
+        func = self.environment.get(node.name, UNSET)
+        if func is UNSET:
             raise NameError(f"Função '{node.name}' não foi definida.")
         
-        func = self.environment[node.name]
         if func.get('type') != 'function':
             raise TypeError(f"'{node.name}' não é uma função.")
         
         args = [self.visit(arg) for arg in node.arguments]
         
         old_env = self.environment
-        self.environment = self.environment.copy()
-        
-        for i, param in enumerate(func['params']):
-            if i < len(args):
-                self.environment[param] = args[i]
-            else:
-                self.environment[param] = None
+        self.environment = Scope(old_env, func['frame'])
+        self.environment.bind(func['params'], args)
         
         try:
-            self.visit(func['body'])
-            result = None
-        except ReturnException as e:
-            result = e.value
+            result = self.return_value if self.visit(func['body']) is RETURN else None
         finally:
             self.environment = old_env
         
@@ -303,7 +310,8 @@ class Interpreter:
             'type': 'lambda',
             'params': node.params,
             'expression': node.expression,
-            'environment': self.environment.copy()
+            'frame': node.frame,
+            'environment': self.environment
         }
 
     def visit_ForEachStatement(self, node):
@@ -317,11 +325,13 @@ class Interpreter:
             if node.kind == 'of' and isinstance(iterable, list):
                 for item in iterable:
                     self.environment[node.var] = item
-                    self.visit(node.body)
+                    if self.visit(node.body) is RETURN:
+                        return RETURN
             elif node.kind == 'in' and isinstance(iterable, dict):
                 for key in iterable:
                     self.environment[node.var] = key
-                    self.visit(node.body)
+                    if self.visit(node.body) is RETURN:
+                        return RETURN
         finally:
             for key in old_env:
                 if key in self.environment:
@@ -347,7 +357,8 @@ class Interpreter:
                     if not condition_result:
                         break
 
-                self.visit(node.body)
+                if self.visit(node.body) is RETURN:
+                    return RETURN
 
                 if node.update:
                     self.visit(node.update)
@@ -390,19 +401,12 @@ class Interpreter:
                 args = [self.visit(arg) for arg in node.arguments]
                 
                 old_env = self.environment
-                self.environment = self.environment.copy()
+                self.environment = Scope(self.environment, constructor['constructor'].frame)
                 self.environment['this'] = instance
-                
-                for i, param in enumerate(constructor['constructor'].params):
-                    if i < len(args):
-                        self.environment[param] = args[i]
-                    else:
-                        self.environment[param] = None
+                self.environment.bind(constructor['constructor'].params, args)
                 
                 try:
                     self.visit(constructor['constructor'].body)
-                except ReturnException:
-                    pass
                 finally:
                     self.environment = old_env
             
@@ -413,19 +417,12 @@ class Interpreter:
             args = [self.visit(arg) for arg in node.arguments]
             
             old_env = self.environment
-            self.environment = self.environment.copy()
+            self.environment = Scope(self.environment, constructor['frame'])
             self.environment['this'] = instance
-            
-            for i, param in enumerate(constructor['params']):
-                if i < len(args):
-                    self.environment[param] = args[i]
-                else:
-                    self.environment[param] = None
+            self.environment.bind(constructor['params'], args)
             
             try:
                 self.visit(constructor['body'])
-            except ReturnException:
-                pass
             finally:
                 self.environment = old_env
             
@@ -484,20 +481,12 @@ class Interpreter:
             function_args = args[1:]
             
             old_env = self.environment
-            self.environment = self.environment.copy()
+            self.environment = Scope(self.environment, obj['frame'])
             self.environment['this'] = new_this
-            
-            for i, param in enumerate(obj['params']):
-                if i < len(function_args):
-                    self.environment[param] = function_args[i]
-                else:
-                    self.environment[param] = None
+            self.environment.bind(obj['params'], function_args)
             
             try:
-                self.visit(obj['body'])
-                result = None
-            except ReturnException as e:
-                result = e.value
+                result = self.return_value if self.visit(obj['body']) is RETURN else None
             finally:
                 self.environment = old_env
             
@@ -530,20 +519,12 @@ class Interpreter:
         args = [self.visit(arg) for arg in node.arguments]
         
         old_env = self.environment
-        self.environment = self.environment.copy()
+        self.environment = Scope(self.environment, method.frame)
         self.environment['this'] = obj
-
-        for i, param in enumerate(method.params):
-            if i < len(args):
-                self.environment[param] = args[i]
-            else:
-                self.environment[param] = None
+        self.environment.bind(method.params, args)
 
         try:
-            self.visit(method.body)
-            result = None
-        except ReturnException as e:
-            result = e.value
+            result = self.return_value if self.visit(method.body) is RETURN else None
         finally:
             self.environment = old_env
 
@@ -627,24 +608,12 @@ class Interpreter:
         else:
             raise AttributeError(f"Método '{method_name}' não encontrado para número")
 
-    def visit_UnaryOp(self, node):
-        operand = self.visit(node.operand)
-        
-        if node.op == '!':
-            if operand is None or operand is False or operand == 0 or operand == "" or operand != operand:
-                return True
-            else:
-                return False
-        elif node.op == '-':
-            return -operand
-        elif node.op == '+':
-            return +operand
-        else:
-            raise ValueError(f"Operador unário não suportado: {node.op}")
-
     def visit_UpdateExpression(self, node):
         if isinstance(node.operand, Identifier):
-            current_value = self.environment.get(node.operand.name, 0)
+            slot = node.operand.slot
+            current_value = UNSET if slot is None else self.environment.slots[slot]
+            if current_value is UNSET:
+                current_value = self.environment.get(node.operand.name, 0)
             
             if node.operator == '++':
                 new_value = current_value + 1
@@ -653,7 +622,10 @@ class Interpreter:
             else:
                 raise ValueError(f"Operador de update não suportado: {node.operator}")
             
-            self.environment[node.operand.name] = new_value
+            if slot is None:
+                self.environment[node.operand.name] = new_value
+            else:
+                self.environment.slots[slot] = new_value
 
             return new_value if node.prefix else current_value
             
@@ -699,8 +671,3 @@ class Interpreter:
                 return new_value if node.prefix else current_value
             else:
                 raise TypeError(f"Update expression não suportado para {type(node.operand)}")
-
-class ReturnException(Exception):
-    """Exceção usada para implementar return statements"""
-    def __init__(self, value):
-        self.value = value
\ No newline at end of file
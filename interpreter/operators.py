@@ -0,0 +1,115 @@
+"""
+Tabelas de operadores do interpretador, com a semântica de JavaScript
+
+Cada operador da AST corresponde a uma função Python já especializada. O
+interpretador resolve o operador de cada nó uma única vez (guardando a
+função no próprio nó) e os motores de closures e de bytecode escolhem a
+função na compilação, em vez de percorrer uma cadeia de comparações de
+strings a cada avaliação.
+
+São funções nomeadas (e não lambdas) para que uma AST anotada continue
+serializável com pickle.
+
+'&&' e '||' ficam em LOGICAL_OPERATORS: o lado direito só é avaliado quando
+o valor da esquerda não decide o resultado, como em JavaScript. Os motores
+fazem o curto-circuito em um ramo próprio (o visitante não guarda função no
+nó para eles), e a tabela serve para nomear os operadores.
+"""
+import operator
+
+
+def js_add(left_val, right_val):
+    """'+' com concatenação quando um dos lados é string"""
+    if isinstance(left_val, str) or isinstance(right_val, str):
+        return str(left_val) + str(right_val)
+    return left_val + right_val
+
+
+def js_divide(left_val, right_val):
+    """Divisão por zero devolve Infinity, -Infinity ou NaN"""
+    if right_val == 0:
+        return float('inf') if left_val > 0 else float('-inf') if left_val < 0 else float('nan')
+    return left_val / right_val
+
+
+def js_modulo(left_val, right_val):
+    if right_val == 0:
+        return float('nan')
+    return left_val % right_val
+
+
+# Comparações relacionais: com null/undefined em um dos lados são sempre falsas
+
+def js_greater(left_val, right_val):
+    if left_val is None or right_val is None:
+        return False
+    return left_val > right_val
+
+
+def js_less(left_val, right_val):
+    if left_val is None or right_val is None:
+        return False
+    return left_val < right_val
+
+
+def js_greater_equal(left_val, right_val):
+    if left_val is None or right_val is None:
+        return False
+    return left_val >= right_val
+
+
+def js_less_equal(left_val, right_val):
+    if left_val is None or right_val is None:
+        return False
+    return left_val <= right_val
+
+
+# Operadores lógicos com curto-circuito: recebem o valor da esquerda e uma
+# função sem argumentos que avalia o lado direito só quando necessário
+
+def js_and(left_val, right):
+    return right() if left_val else left_val
+
+
+def js_or(left_val, right):
+    return left_val if left_val else right()
+
+
+def js_not(operand):
+    """Negação lógica com os valores falsy de JS (null, false, 0, "", NaN)"""
+    return operand is None or operand is False or operand == 0 or operand == "" or operand != operand
+
+
+BINARY_OPERATORS = {
+    '+': js_add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': js_divide,
+    '%': js_modulo,
+    '==': operator.eq,
+    '===': operator.eq,
+    '!=': operator.ne,
+    '!==': operator.ne,
+    '>': js_greater,
+    '<': js_less,
+    '>=': js_greater_equal,
+    '<=': js_less_equal,
+}
+
+LOGICAL_OPERATORS = {
+    '&&': js_and,
+    '||': js_or,
+}
+
+COMPARISONS = frozenset({'==', '===', '!=', '!==', '<', '>', '<=', '>='})
+
+UNARY_OPERATORS = {
+    '!': js_not,
+    '-': operator.neg,
+    '+': operator.pos,
+}
+
+# Nome de cada função de operador (para o disassembler); '===' e '!=='
+# compartilham a função de '==' e '!='
+OPERATOR_NAMES = {fn: op for op, fn in BINARY_OPERATORS.items() if op not in ('===', '!==')}
+OPERATOR_NAMES.update({fn: op for op, fn in LOGICAL_OPERATORS.items()})
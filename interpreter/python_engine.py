@@ -0,0 +1,69 @@
+"""
+Motor `--engine=python`: transpila, compila com compile() e executa com exec
+
+O programa é traduzido por RuntimeTranspiler para Python que usa os helpers
+de interpreter/runtime.py, compilado uma única vez em um code object e
+executado no namespace do runtime. Cada função JS vira uma função Python, de
+modo que a execução não passa mais por nenhum visitante.
+
+CodeCache guarda os code objects em disco (com marshal, como os .pyc), sob
+uma chave que combina o hash do código-fonte JS com as versões do parser, do
+gerador e do bytecode do Python: execuções repetidas de um .js inalterado
+pulam lexer, parser, transpilação e compile().
+"""
+import importlib.util
+import marshal
+
+from interpreter.runtime import ProgramExit, namespace
+from parser.ast_cache import AstCache, DEFAULT_MAX_BYTES
+from translator.runtime_transpiler import RuntimeTranspiler
+
+# Versão do código gerado: mudar sempre que o gerador ou os nomes do runtime mudarem
+CODEGEN_VERSION = 6
+CODE_SUFFIX = '.code'
+FILENAME = '<js>'
+
+
+def compile_program(ast):
+    """Code object do programa inteiro"""
+    return compile(RuntimeTranspiler(ast).transpile(), FILENAME, 'exec')
+
+
+def run(code, names=None):
+    """Executa o code object; `names` recebe as variáveis globais do programa"""
+    try:
+        exec(code, namespace() if names is None else names)
+    except ProgramExit:
+        # return fora de função encerra o programa
+        pass
+
+
+class CodeCache(AstCache):
+    """Cache de code objects, no mesmo diretório (e com a mesma política) do cache de AST"""
+    suffix = CODE_SUFFIX
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES, optimize=False):
+        super().__init__(directory, max_bytes)
+        # A AST otimizada gera outro código: as duas versões ficam em chaves distintas
+        self.optimize = optimize
+
+    def version(self):
+        magic = importlib.util.MAGIC_NUMBER.hex()
+        return f"{super().version()}{CODEGEN_VERSION}:{magic}:{int(self.optimize)}:"
+
+    def load(self, f):
+        return marshal.load(f)
+
+    def dump(self, value, f):
+        marshal.dump(value, f)
+
+
+class PythonInterpreter:
+    def __init__(self, ast, line_index=None):
+        self.ast = ast
+        self.line_index = line_index
+        self.code = compile_program(ast)
+        self.globals = namespace()
+
+    def execute(self):
+        run(self.code, self.globals)
@@ -0,0 +1,107 @@
+"""
+Resolução de variáveis locais em posições de quadro
+
+Antes da execução, percorre a AST e, para cada quadro (o programa e cada
+função, lambda, construtor ou método), decide quais nomes são locais: os
+parâmetros e todo nome atribuído no corpo (declaração, atribuição, ++/--,
+variável de for...of/in, declaração de função ou classe). Cada nome local
+recebe um índice fixo no layout do quadro; os Identifier e as
+VariableDeclaration que o usam são anotados com esse índice (`slot`), e o
+nó da função guarda o layout (`frame`).
+
+O interpretador usa escopo dinâmico (o pai de um quadro é o quadro de quem
+chamou), então só variáveis do próprio quadro têm posição conhecida antes
+da execução. Nomes de fora do quadro ficam com slot None e continuam sendo
+buscados por nome na cadeia de escopos.
+"""
+from ast_nodes.nodes import (
+    Node, Identifier, VariableDeclaration, Assignment, UpdateExpression,
+    ForEachStatement, FunctionDeclaration, ClassDeclaration, LambdaFunction,
+    ConstructorDeclaration, MethodDeclaration, ANNOTATION_SLOTS,
+)
+
+# Nós que abrem um quadro próprio e o campo que contém seu corpo
+_FRAME_BODIES = {
+    FunctionDeclaration: 'body',
+    LambdaFunction: 'expression',
+    ConstructorDeclaration: 'body',
+    MethodDeclaration: 'body',
+}
+
+_FIELDS = {}
+
+
+def _fields(cls):
+    fields = _FIELDS.get(cls)
+    if fields is None:
+        fields = tuple(name for name in cls.__slots__ if name not in ANNOTATION_SLOTS)
+        _FIELDS[cls] = fields
+    return fields
+
+
+def resolve(root):
+    """Anota a árvore e devolve o layout (nome -> índice) do quadro de `root`"""
+    pending = []
+    layout = _resolve_frame(root, (), pending)
+    while pending:
+        function = pending.pop()
+        params = function.params
+        body = getattr(function, _FRAME_BODIES[type(function)])
+        function.frame = _resolve_frame(body, params, pending)
+    return layout
+
+
+def _resolve_frame(body, params, pending):
+    layout = {}
+    for param in params:
+        layout.setdefault(param, len(layout))
+    references = []
+    _collect(body, layout, references, pending)
+    for node in references:
+        node.slot = layout.get(node.name)
+    return layout
+
+
+def _declare(name, layout):
+    if not name.startswith(('this.', 'self.')):
+        layout.setdefault(name, len(layout))
+
+
+def _collect(node, layout, references, pending):
+    """Registra nomes locais e referências, sem entrar em funções aninhadas"""
+    cls = type(node)
+    if cls is list or cls is tuple:
+        for item in node:
+            if isinstance(item, (Node, list, tuple)):
+                _collect(item, layout, references, pending)
+        return
+
+    if cls in _FRAME_BODIES:
+        pending.append(node)
+        if cls is FunctionDeclaration:
+            _declare(node.name, layout)
+        return
+
+    if cls is Identifier:
+        references.append(node)
+        return
+    if cls is VariableDeclaration:
+        _declare(node.name, layout)
+        references.append(node)
+    elif cls is Assignment or cls is UpdateExpression:
+        target = node.target if cls is Assignment else node.operand
+        if type(target) is Identifier:
+            _declare(target.name, layout)
+    elif cls is ForEachStatement:
+        _declare(node.var, layout)
+    elif cls is ClassDeclaration:
+        _declare(node.name, layout)
+        if node.constructor is not None:
+            pending.append(node.constructor)
+        pending.extend(node.methods)
+        return
+
+    for name in _fields(cls):
+        child = getattr(node, name, None)
+        if isinstance(child, (Node, list, tuple)):
+            _collect(child, layout, references, pending)
@@ -0,0 +1,293 @@
+"""
+Runtime do motor `--engine=python`
+
+O código gerado por translator/runtime_transpiler.py é executado com exec
+em um namespace montado por `namespace()`: estas funções dão a ele a mesma
+semântica do interpretador para o que o Python faria diferente (concatenação
+no '+', divisão por zero, comparações com null, acesso a propriedades que
+não existem, console.log de instâncias, métodos de string/array/número e o
+objeto Math).
+
+Os nomes expostos ao código gerado começam com `_js_` (RUNTIME_PREFIX), para
+não colidir com identificadores do programa JS.
+"""
+import builtins
+import math
+
+from interpreter.operators import (
+    js_add, js_divide, js_modulo, js_greater, js_less, js_greater_equal, js_less_equal, js_not,
+)
+
+RUNTIME_PREFIX = '_js_'
+
+
+class JsObject:
+    """Base das classes JS compiladas; as propriedades ficam no __dict__
+
+    Como no interpretador, console.log de uma instância mostra
+    `[object Classe]`; print já usa este __repr__.
+    """
+
+    def __init__(self, *args):
+        # Classe sem constructor: os argumentos do new são ignorados
+        pass
+
+    def __repr__(self):
+        return f"[object {type(self).__name__}]"
+
+
+class ProgramExit(Exception):
+    """return fora de função: encerra o programa"""
+
+
+# --- Propriedades e índices ---
+
+def get_property(obj, name):
+    """obj.nome; propriedade inexistente vale null"""
+    if name == 'length' and isinstance(obj, (list, str)):
+        return len(obj)
+    if isinstance(obj, dict):
+        return obj.get(name)
+    if isinstance(obj, JsObject):
+        return obj.__dict__.get(name)
+    raise TypeError(f"Propriedade '{name}' não encontrada para tipo {type(obj)}")
+
+
+def set_property(obj, name, value):
+    if isinstance(obj, dict):
+        obj[name] = value
+    elif isinstance(obj, JsObject):
+        obj.__dict__[name] = value
+    else:
+        raise TypeError("Só é possível atribuir propriedades a objetos")
+    return value
+
+
+def get_item(obj, key):
+    """obj[chave]; índice fora do array vale null"""
+    if isinstance(obj, dict):
+        return obj.get(key)
+    if isinstance(obj, list) and isinstance(key, int):
+        return obj[key] if 0 <= key < len(obj) else None
+    if isinstance(obj, JsObject):
+        return obj.__dict__.get(key)
+    raise TypeError(f"Não é possível acessar propriedade de {type(obj)}")
+
+
+def set_item(obj, key, value):
+    if isinstance(obj, list):
+        if not isinstance(key, (int, float)):
+            raise TypeError("Índice de array deve ser numérico")
+        index = int(key)
+        if not 0 <= index < len(obj):
+            raise IndexError(f"Índice {index} fora dos limites do array")
+        obj[index] = value
+    elif isinstance(obj, dict):
+        obj[key] = value
+    elif isinstance(obj, JsObject):
+        obj.__dict__[key] = value
+    else:
+        raise TypeError("Só é possível atribuir a arrays ou objetos")
+    return value
+
+
+def update_property(obj, name, step, prefix):
+    """obj.nome++ / obj.nome--; em arrays, `length` encolhe ou cresce o array"""
+    if isinstance(obj, list) and name == 'length':
+        current = len(obj)
+        if step < 0:
+            if obj:
+                obj.pop()
+        else:
+            obj.append(None)
+        return current + step if prefix else current
+    if isinstance(obj, dict):
+        current = obj.get(name, 0)
+        obj[name] = current + step
+    elif isinstance(obj, JsObject):
+        current = obj.__dict__.get(name, 0)
+        obj.__dict__[name] = current + step
+    else:
+        current = getattr(obj, name, 0)
+        setattr(obj, name, current + step)
+    return current + step if prefix else current
+
+
+def iterate(iterable, kind):
+    """Valores de um for...of (arrays) ou chaves de um for...in (objetos)"""
+    if not isinstance(iterable, (list, dict)):
+        raise TypeError("For...of/in requer um iterável")
+    if kind == 'of' and isinstance(iterable, list):
+        return iterable
+    if kind == 'in' and isinstance(iterable, dict):
+        return iterable
+    return ()
+
+
+def new(constructor, *args):
+    """new C(...): classes JS viram classes Python; funções recebem `this` vazio"""
+    if isinstance(constructor, type) and issubclass(constructor, JsObject):
+        return constructor(*args)
+    if callable(constructor):
+        instance = {}
+        if '_js_this' in (getattr(constructor, '__kwdefaults__', None) or ()):
+            constructor(*args, _js_this=instance)
+        else:
+            constructor(*args)
+        return instance
+    raise TypeError(f"'{constructor}' não é um construtor válido.")
+
+
+# --- Métodos ---
+
+def _char_at(string, *args):
+    if len(args) != 1:
+        raise TypeError("charAt() requer exatamente 1 argumento")
+    index = args[0]
+    if not isinstance(index, (int, float)):
+        raise TypeError("charAt() requer um índice numérico")
+    index = int(index)
+    return string[index] if 0 <= index < len(string) else ""
+
+
+def _substr(string, *args):
+    if len(args) not in (1, 2):
+        raise TypeError("substr() requer 1 ou 2 argumentos")
+    start = int(args[0])
+    if start < 0:
+        return ""
+    return string[start:] if len(args) == 1 else string[start:start + int(args[1])]
+
+
+def _substring(string, *args):
+    if len(args) not in (1, 2):
+        raise TypeError("substring() requer 1 ou 2 argumentos")
+    start = int(args[0])
+    return string[start:] if len(args) == 1 else string[start:int(args[1])]
+
+
+def _push(array, *args):
+    array.extend(args)
+    return len(array)
+
+
+def _pop(array, *args):
+    return array.pop() if array else None
+
+
+def _to_fixed(number, *args):
+    if len(args) != 1:
+        raise TypeError("toFixed() requer exatamente 1 argumento")
+    return f"{number:.{int(args[0])}f}"
+
+
+def _call(function, *args):
+    if not args:
+        raise TypeError("call() requer pelo menos um argumento (this)")
+    if '_js_this' in (getattr(function, '__kwdefaults__', None) or ()):
+        return function(*args[1:], _js_this=args[0])
+    return function(*args[1:])
+
+
+_STRING_METHODS = {
+    'charAt': _char_at,
+    'substr': _substr,
+    'substring': _substring,
+    'length': lambda string, *args: len(string),
+    'toLowerCase': lambda string, *args: string.lower(),
+    'toUpperCase': lambda string, *args: string.upper(),
+}
+
+_ARRAY_METHODS = {
+    'push': _push,
+    'pop': _pop,
+    'length': lambda array, *args: len(array),
+}
+
+_NUMBER_METHODS = {
+    'toFixed': _to_fixed,
+    'toString': lambda number, *args: str(number),
+}
+
+# Métodos nativos por tipo exato do valor, com o nome usado nas mensagens
+_BUILTIN_METHODS = {
+    str: (_STRING_METHODS, 'string'),
+    list: (_ARRAY_METHODS, 'array'),
+    int: (_NUMBER_METHODS, 'número'),
+    float: (_NUMBER_METHODS, 'número'),
+    bool: (_NUMBER_METHODS, 'número'),
+}
+
+
+def call_method(obj, name, *args):
+    """obj.nome(...): métodos nativos, objetos como Math e instâncias de classes JS"""
+    builtin = _BUILTIN_METHODS.get(type(obj))
+    if builtin is not None:
+        methods, kind = builtin
+        method = methods.get(name)
+        if method is None:
+            raise AttributeError(f"Método '{name}' não encontrado para {kind}")
+        return method(obj, *args)
+    if isinstance(obj, JsObject):
+        method = getattr(obj, name, None) if name else None
+        if method is None:
+            raise AttributeError(f"Método '{name}' não encontrado na classe '{type(obj).__name__}'")
+        return method(*args)
+    if isinstance(obj, dict) and obj.get('type') == 'object':
+        if name not in obj['properties']:
+            raise AttributeError(f"Método '{name}' não encontrado no objeto")
+        method = obj['properties'][name]
+        return method(*args) if callable(method) else method
+    if callable(obj) and name == 'call':
+        return _call(obj, *args)
+    raise TypeError("Chamada de método só é válida em instâncias")
+
+
+def _math():
+    return {
+        'type': 'object',
+        'properties': {
+            'floor': math.floor,
+            'ceil': math.ceil,
+            'round': round,
+            'abs': abs,
+            'max': max,
+            'min': min,
+            'pow': pow,
+            'sqrt': math.sqrt,
+            'PI': math.pi,
+            'E': math.e,
+        },
+    }
+
+
+_HELPERS = {
+    'add': js_add,
+    'divide': js_divide,
+    'modulo': js_modulo,
+    'greater': js_greater,
+    'less': js_less,
+    'greater_equal': js_greater_equal,
+    'less_equal': js_less_equal,
+    'not': js_not,
+    'log': print,
+    'get_property': get_property,
+    'set_property': set_property,
+    'get_item': get_item,
+    'set_item': set_item,
+    'update_property': update_property,
+    'iterate': iterate,
+    'new': new,
+    'call_method': call_method,
+    'Object': JsObject,
+    'ProgramExit': ProgramExit,
+}
+
+
+def namespace():
+    """Globais de uma execução: os helpers `_js_*` e um objeto Math novo"""
+    names = {RUNTIME_PREFIX + name: helper for name, helper in _HELPERS.items()}
+    names['__builtins__'] = builtins
+    names['__name__'] = '__js__'
+    names['Math'] = _math()
+    return names
@@ -0,0 +1,141 @@
+_MISSING = object()
+
+# Valor de uma posição do quadro ainda não atribuída
+UNSET = object()
+
+_NO_LAYOUT = {}
+_NO_NAMES = frozenset()
+
+
+class Scope:
+    """Escopo de execução com ligação para o escopo pai
+
+    Criar um escopo é O(1): em vez de copiar o ambiente inteiro a cada
+    chamada, o novo escopo apenas aponta para o anterior. Leituras percorrem
+    a cadeia até encontrar o nome; escritas são sempre feitas no escopo atual,
+    de modo que, como na cópia do ambiente, alterações feitas dentro de uma
+    chamada não vazam para quem chamou.
+
+    As variáveis locais conhecidas pelo resolvedor (`layout`: nome -> índice)
+    ficam na lista `slots`, pré-alocada na criação do quadro; as demais (como
+    `this` e os built-ins) ficam no dicionário `vars`. Uma posição com UNSET
+    conta como ausente, e a busca continua no escopo pai.
+
+    Como o pai de um quadro é o quadro de quem chamou, a cadeia cresce com
+    a profundidade da recursão. Para que ler uma global não percorra a pilha
+    inteira, cada escopo aponta direto para a raiz (`root`, o escopo global)
+    e guarda em `names` os nomes que algum quadro entre ele e a raiz pode
+    ter: um nome fora desse conjunto é buscado direto na raiz. Em recursão
+    o conjunto do quadro pai é reaproveitado sem cópia.
+    """
+    __slots__ = ('vars', 'parent', 'layout', 'slots', 'root', 'names')
+
+    def __init__(self, parent=None, layout=None):
+        if layout is None:
+            layout = _NO_LAYOUT
+        self.vars = {}
+        self.parent = parent
+        self.layout = layout
+        self.slots = [UNSET] * len(layout)
+        if parent is None:
+            self.root = self
+            self.names = _NO_NAMES
+        else:
+            self.root = parent.root
+            names = parent.names
+            if not names.issuperset(layout):
+                names = names.union(layout)
+            self.names = names
+
+    def _declare(self, name):
+        """Registra um nome guardado em `vars` fora da raiz"""
+        if self.parent is not None and name not in self.names:
+            self.names = self.names.union((name,))
+
+    def bind(self, params, args):
+        """Associa os parâmetros aos argumentos (None para os que faltam)"""
+        layout = self.layout
+        slots = self.slots
+        for i, param in enumerate(params):
+            value = args[i] if i < len(args) else None
+            index = layout.get(param)
+            if index is None:
+                self._declare(param)
+                self.vars[param] = value
+            else:
+                slots[index] = value
+
+    def lookup(self, name, default=_MISSING):
+        # Nome que nenhum quadro da cadeia declara: só pode estar na raiz
+        scope = self if name in self.names else self.root
+        while scope is not None:
+            index = scope.layout.get(name)
+            if index is None:
+                variables = scope.vars
+                if name in variables:
+                    return variables[name]
+            else:
+                value = scope.slots[index]
+                if value is not UNSET:
+                    return value
+            scope = scope.parent
+        if default is _MISSING:
+            raise KeyError(name)
+        return default
+
+    def __getitem__(self, name):
+        return self.lookup(name)
+
+    def get(self, name, default=None):
+        return self.lookup(name, default)
+
+    def __contains__(self, name):
+        return self.lookup(name, UNSET) is not UNSET
+
+    def __setitem__(self, name, value):
+        index = self.layout.get(name)
+        if index is None:
+            self._declare(name)
+            self.vars[name] = value
+        else:
+            self.slots[index] = value
+
+    def __delitem__(self, name):
+        index = self.layout.get(name)
+        if index is None:
+            del self.vars[name]
+        elif self.slots[index] is UNSET:
+            raise KeyError(name)
+        else:
+            self.slots[index] = UNSET
+
+    def local_items(self):
+        """Variáveis atribuídas neste escopo (sem os escopos pais)"""
+        items = {name: self.slots[index] for name, index in self.layout.items()
+                 if self.slots[index] is not UNSET}
+        items.update(self.vars)
+        return items
+
+    def copy(self):
+        """Instantâneo (dict) de todas as variáveis visíveis neste escopo"""
+        chain = []
+        scope = self
+        while scope is not None:
+            chain.append(scope)
+            scope = scope.parent
+        snapshot = {}
+        for scope in reversed(chain):
+            snapshot.update(scope.local_items())
+        return snapshot
+
+    def keys(self):
+        return self.copy().keys()
+
+    def items(self):
+        return self.copy().items()
+
+    def __iter__(self):
+        return iter(self.copy())
+
+    def __repr__(self):
+        return repr(self.copy())
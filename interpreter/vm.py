@@ -0,0 +1,247 @@
+"""
+Máquina virtual de pilha para o bytecode de interpreter/bytecode.py
+
+BytecodeInterpreter herda de Interpreter o ambiente, os built-ins (Math,
+métodos de string/array/número) e o visitante usado por EVAL_NODE/EXEC_NODE.
+`run` é o laço de despacho: busca a instrução, executa e avança o contador.
+Cada chamada de função JS é uma chamada de `run` com o CodeObject do corpo
+e um novo quadro; RETURN_VALUE simplesmente sai do laço. `self.environment`
+acompanha o quadro corrente para que o visitante veja o mesmo escopo.
+"""
+from interpreter.bytecode import (
+    LOAD_CONST, LOAD_LOCAL, STORE_LOCAL, LOAD_NAME, STORE_NAME,
+    UPDATE_LOCAL, UPDATE_NAME, POP_TOP, DUP_TOP,
+    BINARY_ADD, BINARY_OP, COMPARE_OP,
+    UNARY_NOT, UNARY_NEGATIVE, UNARY_POSITIVE,
+    JUMP, POP_JUMP_IF_FALSE, JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP,
+    LOAD_FUNCTION, CALL, RETURN_VALUE, DECLARE_FUNCTION,
+    GET_ITEM, SET_ITEM, GET_ATTR, SET_ATTR,
+    BUILD_LIST, BUILD_MAP, PRINT, FOR_SAVE, FOR_RESTORE,
+    EVAL_NODE, EXEC_NODE, disassemble,
+)
+from interpreter.bytecode_compiler import BytecodeCompiler
+from interpreter.interpreter import Interpreter, RETURN
+from interpreter.scope import Scope, UNSET
+
+
+class BytecodeInterpreter(Interpreter):
+    def __init__(self, ast, line_index=None):
+        super().__init__(ast, line_index)
+        self.compiler = BytecodeCompiler()
+        self.code = self.compiler.compile_program(self.ast, self.environment.layout)
+
+    def execute(self):
+        return self.run(self.code, self.environment)
+
+    def disassemble(self):
+        return disassemble(self.code)
+
+    def run(self, code, env):
+        instructions = code.instructions
+        varnames = code.varnames
+        slots = env.slots
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        pc = 0
+
+        while True:
+            op, arg = instructions[pc]
+            pc += 1
+
+            if op == LOAD_LOCAL:
+                value = slots[arg]
+                if value is UNSET:
+                    value = self._load_name(env, varnames[arg])
+                push(value)
+            elif op == LOAD_CONST:
+                push(arg)
+            elif op == STORE_LOCAL:
+                slots[arg] = pop()
+            elif op == COMPARE_OP or op == BINARY_OP:
+                right_val = pop()
+                stack[-1] = arg(stack[-1], right_val)
+            elif op == POP_JUMP_IF_FALSE:
+                if not pop():
+                    pc = arg
+            elif op == JUMP:
+                pc = arg
+            elif op == JUMP_IF_FALSE_OR_POP:
+                if stack[-1]:
+                    pop()
+                else:
+                    pc = arg
+            elif op == JUMP_IF_TRUE_OR_POP:
+                if stack[-1]:
+                    pc = arg
+                else:
+                    pop()
+            elif op == BINARY_ADD:
+                right_val = pop()
+                left_val = stack[-1]
+                if isinstance(left_val, str) or isinstance(right_val, str):
+                    stack[-1] = str(left_val) + str(right_val)
+                else:
+                    stack[-1] = left_val + right_val
+            elif op == UPDATE_LOCAL:
+                slot, step, prefix = arg
+                current_value = slots[slot]
+                if current_value is UNSET:
+                    current_value = env.get(varnames[slot], 0)
+                slots[slot] = current_value + step
+                push(current_value + step if prefix else current_value)
+            elif op == LOAD_NAME:
+                push(self._load_name(env, arg))
+            elif op == STORE_NAME:
+                env[arg] = pop()
+            elif op == GET_ITEM:
+                key = pop()
+                stack[-1] = self._get_item(stack[-1], key)
+            elif op == GET_ATTR:
+                stack[-1] = self._get_attr(stack[-1], arg)
+            elif op == SET_ITEM:
+                key = pop()
+                obj = pop()
+                self._set_item(obj, key, stack[-1])
+            elif op == POP_TOP:
+                pop()
+            elif op == DUP_TOP:
+                push(stack[-1])
+            elif op == LOAD_FUNCTION:
+                func = env.lookup(arg, UNSET)
+                if func is UNSET:
+                    raise NameError(f"Função '{arg}' não foi definida.")
+                if func.get('type') != 'function':
+                    raise TypeError(f"'{arg}' não é uma função.")
+                push(func)
+            elif op == CALL:
+                if arg:
+                    args = stack[-arg:]
+                    del stack[-arg:]
+                else:
+                    args = []
+                stack[-1] = self.call_function(stack[-1], args, env)
+            elif op == RETURN_VALUE:
+                return pop()
+            elif op == UPDATE_NAME:
+                name, step, prefix = arg
+                current_value = env.get(name, 0)
+                env[name] = current_value + step
+                push(current_value + step if prefix else current_value)
+            elif op == UNARY_NOT:
+                value = stack[-1]
+                stack[-1] = value is None or value is False or value == 0 or value == "" or value != value
+            elif op == UNARY_NEGATIVE:
+                stack[-1] = -stack[-1]
+            elif op == UNARY_POSITIVE:
+                stack[-1] = +stack[-1]
+            elif op == SET_ATTR:
+                obj = pop()
+                self._set_attr(obj, arg, stack[-1])
+            elif op == BUILD_LIST:
+                if arg:
+                    items = stack[-arg:]
+                    del stack[-arg:]
+                else:
+                    items = []
+                push(items)
+            elif op == BUILD_MAP:
+                items = stack[len(stack) - 2 * arg:]
+                del stack[len(stack) - 2 * arg:]
+                obj = {}
+                for i in range(0, len(items), 2):
+                    obj[items[i]] = items[i + 1]
+                push(obj)
+            elif op == PRINT:
+                self._print(pop())
+            elif op == DECLARE_FUNCTION:
+                env[arg.name] = {
+                    'type': 'function',
+                    'params': arg.params,
+                    'body': arg.body,
+                    'frame': arg.frame,
+                    'environment': env
+                }
+            elif op == FOR_SAVE:
+                push(env[arg] if arg in env else None)
+            elif op == FOR_RESTORE:
+                loop_var_old_value = pop()
+                if loop_var_old_value is not None:
+                    env[arg] = loop_var_old_value
+                elif arg in env:
+                    del env[arg]
+            elif op == EVAL_NODE:
+                push(self.visit(arg))
+            elif op == EXEC_NODE:
+                # return executado pelo visitante (dentro de um nó não compilado)
+                if self.visit(arg) is RETURN:
+                    return self.return_value
+            else:
+                raise RuntimeError(f"Opcode desconhecido: {op}")
+
+    def call_function(self, func, args, env):
+        frame = Scope(env, func['frame'])
+        frame.bind(func['params'], args)
+        code = self.compiler.compile_function('<função>', func['body'], func['frame'])
+
+        self.environment = frame
+        try:
+            return self.run(code, frame)
+        finally:
+            self.environment = env
+
+    # --- Semântica compartilhada com Interpreter ---
+
+    def _load_name(self, env, name):
+        value = env.lookup(name, UNSET)
+        if value is UNSET:
+            raise NameError(f"A variável '{name}' não foi definida.")
+        return value
+
+    def _print(self, value_to_print):
+        if isinstance(value_to_print, dict) and value_to_print.get('type') == 'instance':
+            print(f"[object {value_to_print['class']}]")
+        else:
+            print(value_to_print)
+
+    def _get_item(self, obj, key):
+        if isinstance(obj, dict):
+            if obj.get('type') == 'instance':
+                return obj['properties'].get(key, None)
+            return obj.get(key, None)
+        elif isinstance(obj, list) and isinstance(key, int):
+            return obj[key] if 0 <= key < len(obj) else None
+        raise TypeError(f"Não é possível acessar propriedade de {type(obj)}")
+
+    def _get_attr(self, obj, property_name):
+        if isinstance(obj, (list, str)) and property_name == 'length':
+            return len(obj)
+        if isinstance(obj, dict):
+            if obj.get('type') == 'instance':
+                return obj['properties'].get(property_name, None)
+            return obj.get(property_name, None)
+        raise TypeError(f"Propriedade '{property_name}' não encontrada para tipo {type(obj)}")
+
+    def _set_item(self, obj, key, value):
+        if isinstance(obj, list):
+            if isinstance(key, (int, float)):
+                index = int(key)
+                if 0 <= index < len(obj):
+                    obj[index] = value
+                else:
+                    raise IndexError(f"Índice {index} fora dos limites do array")
+            else:
+                raise TypeError("Índice de array deve ser numérico")
+        elif isinstance(obj, dict):
+            obj[key] = value
+        else:
+            raise TypeError("Só é possível atribuir a arrays ou objetos")
+
+    def _set_attr(self, obj, property_name, value):
+        if isinstance(obj, dict):
+            if obj.get('type') == 'instance':
+                obj['properties'][property_name] = value
+            else:
+                obj[property_name] = value
+        else:
+            raise TypeError("Só é possível atribuir propriedades a objetos")
@@ -0,0 +1,47 @@
+from array import array
+from bisect import bisect_right
+
+
+class LineIndex:
+    """Índice de inícios de linha de um código-fonte
+
+    Construído uma única vez por fonte (e só quando a primeira consulta é
+    feita), permite converter offsets em linha/coluna por busca binária sem
+    recontar quebras de linha nem copiar o arquivo.
+    """
+
+    def __init__(self, code):
+        self.code = code
+        self._line_starts = None
+
+    @property
+    def line_starts(self):
+        if self._line_starts is None:
+            starts = array('q', [0])
+            code = self.code
+            find = code.find
+            pos = find('\n')
+            while pos != -1:
+                starts.append(pos + 1)
+                pos = find('\n', pos + 1)
+            self._line_starts = starts
+        return self._line_starts
+
+    def line_col(self, offset):
+        """Retorna (linha, coluna), ambas a partir de 1, para um offset"""
+        starts = self.line_starts
+        line = bisect_right(starts, offset)
+        return line, offset - starts[line - 1] + 1
+
+    def line_text(self, line):
+        """Texto da linha `line` (a partir de 1), sem a quebra de linha"""
+        starts = self.line_starts
+        start = starts[line - 1]
+        end = self.code.find('\n', start)
+        return self.code[start:] if end == -1 else self.code[start:end]
+
+    def context(self, offset):
+        """Contexto visual de um offset: posição, linha de origem e marcador"""
+        line, column = self.line_col(offset)
+        pointer = ' ' * (column - 1) + '^'
+        return f"Linha {line}, coluna {column}\n{self.line_text(line)}\n{pointer}"
@@ -1,31 +1,15 @@
 import re
+import sys
+from types import MappingProxyType
 from errors.exceptions import LexerError
+from lexer.line_index import LineIndex
 
 TOKEN_SPEC = [
     ('MULTILINE_COMMENT', r'/\*[\s\S]*?\*/'),
     ('COMMENT', r'//.*'),
-    ('NUMBER', r'\d+(\.\d+)?'),
-    ('STRING', r'(["\'])(?:\\.|[^\\])*?\1'),
-    ('NEW', r'\bnew\b'),
-    ('THIS', r'\bthis\b'),
-    ('CLASS', r'\bclass\b'),
-    ('CONSTRUCTOR', r'\bconstructor\b'),
-    ('VAR', r'\bvar\b'),
-    ('LET', r'\blet\b'),
-    ('CONST', r'\bconst\b'),
-    ('FUNCTION', r'\bfunction\b'),
+    ('NUMBER', r'\d+(?:\.\d+)?'),
+    ('STRING', r'(?P<quote>["\'])(?:\\.|[^\\])*?(?P=quote)'),
     ('ARROW', r'=>'),
-    ('FOR', r'\bfor\b'),
-    ('IN', r'\bin\b'),
-    ('OF', r'\bof\b'),
-    ('RETURN', r'\breturn\b'),
-    ('IF', r'\bif\b'),
-    ('ELSE', r'\belse\b'),
-    ('WHILE', r'\bwhile\b'),
-    ('CONSOLE', r'console'),
-    ('LOG', r'log'),
-    ('TRUE', r'\btrue\b'),
-    ('FALSE', r'\bfalse\b'),
     ('IDENTIFIER', r'[a-zA-Z_\u00C0-\u017F][a-zA-Z0-9_\u00C0-\u017F]*'),
     ('OP_INCREMENT', r'\+\+'),
     ('OP_DECREMENT', r'--'),
@@ -61,46 +45,110 @@ TOKEN_SPEC = [
     ('WHITESPACE', r'\s+'),
 ]
 
+# Palavras reservadas: o identificador é reconhecido uma única vez pela regra
+# IDENTIFIER e depois classificado por esta tabela imutável.
+KEYWORDS = MappingProxyType({
+    'new': 'NEW',
+    'this': 'THIS',
+    'class': 'CLASS',
+    'constructor': 'CONSTRUCTOR',
+    'var': 'VAR',
+    'let': 'LET',
+    'const': 'CONST',
+    'function': 'FUNCTION',
+    'for': 'FOR',
+    'in': 'IN',
+    'of': 'OF',
+    'return': 'RETURN',
+    'if': 'IF',
+    'else': 'ELSE',
+    'while': 'WHILE',
+    'console': 'CONSOLE',
+    'log': 'LOG',
+    'true': 'TRUE',
+    'false': 'FALSE',
+})
+
+# Todas as regras combinadas em uma única alternância com grupos nomeados,
+# compilada uma vez na importação. A alternância do `re` tenta as opções na
+# ordem em que aparecem, preservando a prioridade definida em TOKEN_SPEC.
+MASTER_PATTERN = re.compile(
+    '|'.join(f'(?P<{name}>{regex})' for name, regex in TOKEN_SPEC)
+)
+
+# Tipos de token internados e seus identificadores numéricos
+TOKEN_TYPES = tuple(sys.intern(name) for name in dict.fromkeys(
+    [name for name, _ in TOKEN_SPEC] + list(KEYWORDS.values())
+))
+TOKEN_TYPE_IDS = MappingProxyType({name: i for i, name in enumerate(TOKEN_TYPES)})
+
+# `match.lastgroup` devolve uma string nova a cada chamada; esta tabela a troca
+# pela instância internada, compartilhada por todos os tokens do mesmo tipo
+_INTERNED_TYPES = {name: name for name in TOKEN_TYPES}
+
+# Únicas regras cujo texto pode conter quebras de linha
+MULTILINE_TOKENS = frozenset({'WHITESPACE', 'MULTILINE_COMMENT', 'STRING'})
+
 class Token:
-    def __init__(self, type_, value):
+    """Token com posição na fonte: offset inicial e linha/coluna a partir de 1"""
+    __slots__ = ('type', 'value', 'start', 'line', 'column')
+
+    def __init__(self, type_, value, start=None, line=None, column=None):
         self.type = type_
         self.value = value
+        self.start = start
+        self.line = line
+        self.column = column
+
+    @property
+    def end(self):
+        if self.start is None:
+            return None
+        return self.start + len(self.value)
+
+    @property
+    def type_id(self):
+        return TOKEN_TYPE_IDS[self.type]
+
     def __repr__(self):
         return f"Token({self.type}, {self.value})"
 
-def tokenize(code):
-    tokens = []
+def iter_tokens(code, line_index=None):
+    """Gera os tokens sob demanda, permitindo que o parser comece antes do fim da análise léxica"""
     pos = 0
-    lines = code.split('\n')
+    end = len(code)
+    line = 1
+    line_start = 0
+    match_at = MASTER_PATTERN.match
+    keyword_type = KEYWORDS.get
+    interned = _INTERNED_TYPES
+    multiline = MULTILINE_TOKENS
     
-    while pos < len(code):
-        match = None
-        for token_name, token_regex in TOKEN_SPEC:
-            pattern = re.compile(token_regex)
-            match = pattern.match(code, pos)
-            if match:
-                if token_name not in ['WHITESPACE']:
-                    tokens.append(Token(token_name, match.group(0)))
-                pos = match.end(0)
-                break
-        if not match:
-            # Encontrar a linha onde ocorreu o erro
-            line_num = code[:pos].count('\n')
-            line_start = code.rfind('\n', 0, pos) + 1
-            line_end = code.find('\n', pos)
-            if line_end == -1:
-                line_end = len(code)
-            
-            source_line = code[line_start:line_end]
-            char_in_line = pos - line_start
-            
-            # Criar contexto visual do erro
-            error_pointer = ' ' * char_in_line + '^'
-            context_info = f"Linha {line_num + 1}, coluna {char_in_line + 1}\n{source_line}\n{error_pointer}"
+    while pos < end:
+        match = match_at(code, pos)
+        if match:
+            token_name = interned[match.lastgroup]
+            token_end = match.end()
+            if token_name == 'IDENTIFIER':
+                value = match.group()
+                yield Token(keyword_type(value, 'IDENTIFIER'), value, pos, line, pos - line_start + 1)
+            elif token_name != 'WHITESPACE':
+                yield Token(token_name, match.group(), pos, line, pos - line_start + 1)
+            if token_name in multiline:
+                newlines = code.count('\n', pos, token_end)
+                if newlines:
+                    line += newlines
+                    line_start = code.rfind('\n', pos, token_end) + 1
+            pos = token_end
+        else:
+            # Localização do erro pelo índice de linhas (construído só agora, se preciso)
+            context_info = (line_index or LineIndex(code)).context(pos)
             
             raise LexerError(
                 char=code[pos] if pos < len(code) else 'EOF',
                 position=pos,
                 source_line=context_info
             )
-    return tokens
+
+def tokenize(code, line_index=None):
+    return list(iter_tokens(code, line_index))
@@ -10,8 +10,12 @@ Opções:
     -t, --transpile     Apenas transpila para Python (padrão)
     -i, --interpret     Apenas interpreta/executa o JavaScript
     -a, --all           Executa ambos: transpilação e interpretação
-    -o, --output FILE   Salva o código Python transpilado em arquivo
+    -o, --output FILE   Salva o código Python transpilado em arquivo (e o source map em FILE.map)
     -v, --verbose       Modo verboso com informações detalhadas
+    --no-cache          Não usa o cache de AST em disco
+    -O, --optimize      Otimiza a AST (constantes, código morto) antes dos back ends
+    --engine MOTOR      Motor de interpretação: ast (padrão), closure, bytecode ou python
+    --disassemble       Mostra o bytecode do programa e sai
     -h, --help          Mostra esta mensagem de ajuda
 
 Exemplos:
@@ -20,6 +24,9 @@ Exemplos:
     python main.py exemplo.js -a                 # Transpila e interpreta
     python main.py exemplo.js -t -o saida.py     # Transpila e salva em arquivo
     python main.py exemplo.js -a -v              # Modo verboso completo
+    python main.py exemplo.js -i --engine=closure  # Interpreta com closures compiladas
+    python main.py exemplo.js -i --engine=python   # Executa o Python gerado (code object em cache)
+    python main.py exemplo.js -O                 # Transpila a AST otimizada
 """
 
 import sys
@@ -27,9 +34,9 @@ import argparse
 import traceback
 from pathlib import Path
 
-from parser.parser import Parser
-from translator.transpiler import Transpiler
-from interpreter.interpreter import Interpreter
+from parser.ast_cache import AstCache
+from pipeline.pipeline import Pipeline, ENGINES
+from translator.source_map import map_path
 from errors.exceptions import CompilerError, LexerError, ParserError, TranspilerError, InterpreterError
 
 
@@ -57,7 +64,7 @@ def load_file(file_path, verbose=False):
             code = f.read()
         
         if verbose:
-            lines = len(code.split('\n'))
+            lines = code.count('\n') + 1
             chars = len(code)
             print(f"   Arquivo carregado: {lines} linhas, {chars} caracteres")
         
@@ -74,50 +81,78 @@ def load_file(file_path, verbose=False):
         return None
 
 
-def transpile_code(code, verbose=False):
-    """Transpila o código JavaScript para Python"""
+def parse_code(pipeline, verbose=False):
+    """Executa a análise (uma única vez por pipeline), usando o cache se disponível"""
+    already_parsed = 'parse' in pipeline.timings
+    pipeline.parse()
+    
+    if verbose and not already_parsed:
+        if pipeline.cache is not None:
+            print("   AST carregada do cache" if pipeline.from_cache else "   AST armazenada no cache")
+        print("   Analise sintatica concluida")
+
+
+def compile_code(pipeline, verbose=False):
+    """Motor python: obtém o code object do cache ou analisando, transpilando e compilando"""
+    pipeline.compile_python()
+    
+    if verbose:
+        if pipeline.code_from_cache:
+            print("   Codigo compilado carregado do cache")
+        else:
+            print("   Codigo compilado" + (" e armazenado no cache" if pipeline.cache is not None else ""))
+
+
+def transpile_code(pipeline, sink, verbose=False, framed=False, source_map=None):
+    """Transpila o código JavaScript para Python, escrevendo o código em `sink`
+    à medida que cada statement de topo é gerado (framed: entre separadores, modo -a;
+    source_map: recebe a linha/coluna JS de cada linha gerada)"""
     if verbose:
         print_section("TRANSPILACAO")
     
     try:
-        parser = Parser(code)
-        ast = parser.parse_program()
+        parse_code(pipeline, verbose)
         
-        if verbose:
-            print("   Analise sintatica concluida")
+        if framed:
+            if not verbose:
+                print("=" * 60)
+                print("CODIGO PYTHON TRANSPILADO")
+                print("=" * 60)
+            print()
+        
+        pipeline.transpile_to(sink, source_map)
+        print()
         
-        transpiler = Transpiler(ast)
-        python_code = transpiler.transpile()
+        if framed and not verbose:
+            print()
+            print("=" * 60)
         
         if verbose:
             print("   Transpilacao concluida")
         
-        return python_code
+        return True
     
     except (LexerError, ParserError, TranspilerError) as e:
         print(str(e))
-        return None
+        return False
 
 
-def interpret_code(code, verbose=False):
+def interpret_code(pipeline, verbose=False):
     """Interpreta/executa o código JavaScript"""
     if verbose:
         print_section("INTERPRETACAO")
     
     try:
-        parser = Parser(code)
-        ast = parser.parse_program()
-        
-        if verbose:
-            print("   Analise sintatica concluida")
-        
-        interpreter = Interpreter(ast)
+        if pipeline.engine == 'python':
+            compile_code(pipeline, verbose)
+        else:
+            parse_code(pipeline, verbose)
         
         if verbose:
             print("   Iniciando execucao...")
             print()
         
-        interpreter.execute()
+        pipeline.interpret()
         
         if verbose:
             print()
@@ -125,24 +160,50 @@ def interpret_code(code, verbose=False):
         
         return True
     
-    except (LexerError, ParserError, InterpreterError) as e:
+    except (LexerError, ParserError, TranspilerError, InterpreterError) as e:
         print(str(e))
         return False
 
 
-def save_to_file(content, output_file, verbose=False):
-    """Salva o conteúdo em um arquivo"""
-    try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        if verbose:
-            print(f"Codigo salvo em: {output_file}")
-        else:
-            print(f"Arquivo salvo: {output_file}")
+class Tee:
+    """Sink que repete cada escrita em vários destinos (terminal e arquivo de saída)"""
+    def __init__(self, *sinks):
+        self.sinks = sinks
     
-    except Exception as e:
+    def write(self, text):
+        for sink in self.sinks:
+            sink.write(text)
+
+
+def open_output(output_file):
+    """Abre o arquivo de saída antes da transpilação, para receber o código aos poucos"""
+    try:
+        return open(output_file, 'w', encoding='utf-8')
+    except OSError as e:
         print(f"Erro ao salvar arquivo: {e}")
+        return None
+
+
+def close_output(output, success, verbose=False, source_map=None):
+    """Fecha o arquivo de saída; se a transpilação falhou, remove o arquivo parcial.
+    Caso contrário, salva o source map ao lado dele (saida.py.map)"""
+    output.close()
+    if not success:
+        Path(output.name).unlink(missing_ok=True)
+        return
+    if verbose:
+        print(f"Codigo salvo em: {output.name}")
+    else:
+        print(f"Arquivo salvo: {output.name}")
+    if source_map is not None:
+        path = map_path(output.name)
+        try:
+            source_map.save(path)
+        except OSError as e:
+            print(f"Erro ao salvar source map: {e}")
+            return
+        if verbose:
+            print(f"Source map salvo em: {path}")
 
 
 def create_parser():
@@ -157,6 +218,8 @@ Exemplos de uso:
   python main.py exemplo.js -a                  # Transpila e interpreta
   python main.py exemplo.js -t -o saida.py      # Transpila e salva
   python main.py exemplo.js -a -v               # Modo verboso completo
+  python main.py exemplo.js -i --engine=closure  # Interpreta com closures compiladas
+  python main.py exemplo.js -i --engine=python   # Executa o Python gerado (code object em cache)
         """
     )
     
@@ -185,7 +248,7 @@ Exemplos de uso:
     parser.add_argument(
         '-o', '--output',
         metavar='FILE',
-        help='Salva o código Python transpilado em arquivo'
+        help='Salva o código Python transpilado em arquivo, com o source map (linhas JS) em FILE.map'
     )
     
     parser.add_argument(
@@ -194,6 +257,34 @@ Exemplos de uso:
         help='Modo verboso com informações detalhadas'
     )
     
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Não usa os caches em disco (AST e, no motor python, código compilado)'
+    )
+    
+    parser.add_argument(
+        '-O', '--optimize',
+        action='store_true',
+        help='Aplica os passes de otimização (dobra de constantes, código morto) à AST antes '
+             'da transpilação e da interpretação'
+    )
+    
+    parser.add_argument(
+        '--engine',
+        choices=list(ENGINES),
+        default='ast',
+        help='Motor de interpretação: ast (visitante, padrão), closure (AST compilada em '
+             'closures), bytecode (máquina virtual de pilha) ou python (código Python gerado, compilado '
+             'e guardado em cache)'
+    )
+    
+    parser.add_argument(
+        '--disassemble',
+        action='store_true',
+        help='Mostra o bytecode do programa (motor bytecode) e sai'
+    )
+    
     return parser
 
 
@@ -216,6 +307,8 @@ def main():
         print_banner()
         print(f"Arquivo: {args.file}")
         print(f"Modo: {mode}")
+        if mode != 'transpile':
+            print(f"Motor: {args.engine}")
         if args.output:
             print(f"Saida: {args.output}")
     
@@ -224,31 +317,38 @@ def main():
     if code is None:
         sys.exit(1)
     
+    # Cache de AST em disco, a menos que desativado; a AST é compartilhada
+    # entre transpilação e interpretação
+    cache = None if args.no_cache else AstCache()
+    pipeline = Pipeline(code, cache, args.engine, args.optimize)
+    
+    if args.disassemble:
+        try:
+            print(pipeline.disassemble())
+        except (LexerError, ParserError) as e:
+            print(str(e))
+            sys.exit(1)
+        sys.exit(0)
+    
     # Executa baseado no modo
     success = True
-    python_code = None
+    output = None
+    source_map = None
     
     if mode in ['transpile', 'both']:
-        python_code = transpile_code(code, args.verbose)
-        if python_code is None:
+        # O código é escrito no terminal (e no arquivo de -o) statement a
+        # statement, sem montar a saída inteira em memória
+        output = open_output(args.output) if args.output else None
+        sink = sys.stdout if output is None else Tee(sys.stdout, output)
+        if output is not None:
+            source_map = pipeline.source_map(args.file, Path(args.output).name)
+        transpiled = transpile_code(pipeline, sink, args.verbose, framed=(mode == 'both'),
+                                    source_map=source_map)
+        if not transpiled:
             success = False
-        else:
-            if mode == 'transpile':
-                # Exibe apenas o código transpilado quando for só transpilação
-                print(python_code)
-            elif mode == 'both':
-                # No modo "all", exibe o código transpilado
-                if not args.verbose:
-                    print("=" * 60)
-                    print("CODIGO PYTHON TRANSPILADO")
-                    print("=" * 60)
-                print()
-                print(python_code)
-                if not args.verbose:
-                    print()
-                    print("=" * 60)
-            elif args.verbose:
-                print(f"Codigo Python gerado ({len(python_code)} caracteres)")
+            if output is not None:
+                close_output(output, success=False)
+                output = None
     
     if mode in ['interpret', 'both'] and success:
         if mode == 'both':
@@ -259,16 +359,19 @@ def main():
                 print("EXECUCAO DO CODIGO")
                 print("=" * 60)
         
-        interpret_success = interpret_code(code, args.verbose)
+        interpret_success = interpret_code(pipeline, args.verbose)
         if not interpret_success:
             success = False
     
-    # Salva em arquivo se solicitado
-    if args.output and python_code:
-        save_to_file(python_code, args.output, args.verbose)
+    # Conclui o arquivo de saída, se solicitado
+    if output is not None:
+        close_output(output, success=True, verbose=args.verbose, source_map=source_map)
     
     # Mensagem final apenas se verbose
     if args.verbose:
+        if pipeline.timings:
+            print_section("TEMPOS POR ETAPA")
+            print(pipeline.format_timings())
         print("\n" + "=" * 70)
         if success:
             print("COMPILACAO CONCLUIDA COM SUCESSO!")
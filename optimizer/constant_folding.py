@@ -0,0 +1,160 @@
+"""
+Dobra de constantes e simplificação algébrica sobre a AST
+
+Subexpressões só com literais (`2 * 3`, `"a" + "b"`, `!true`) são avaliadas
+uma única vez, antes da execução, com as mesmas funções de operador do
+interpretador (interpreter/operators.py): o resultado dobrado é exatamente o
+que o interpretador calcularia. A árvore é alterada no lugar e serve tanto ao
+transpilador quanto aos motores de interpretação.
+
+Só é dobrado o que não muda o comportamento do programa:
+
+- operações que lançariam erro em tempo de execução (`"a" < 1`, `-"a"`)
+  ficam como estão, para o erro continuar acontecendo;
+- divisões por zero ficam para a execução: o resultado (Infinity/NaN) não
+  tem literal em JS nem em Python;
+- entre strings só se dobram '+' e comparações (o '*' do Python repetiria a
+  string, o que não é a semântica de JS);
+- `x - a - b` não vira `x - (a + b)`: sem saber se x é inteiro, o
+  arredondamento de ponto flutuante pode mudar o resultado
+  (-524144.6395076819 - 672 - -745 difere de -524144.6395076819 - 73);
+- `x - 0`, `x * 1` e `1 * x` viram `x` apenas quando x é sabidamente um
+  número (`x + 0` não: -0 + 0 é 0 em JS).
+"""
+import math
+
+from ast_nodes.arena import FIELDS, KIND_IDS
+from ast_nodes.nodes import Node, Literal, BinaryOp, UnaryOp
+from interpreter.operators import BINARY_OPERATORS, COMPARISONS, LOGICAL_OPERATORS, UNARY_OPERATORS
+
+# Strings que o interpretador lê como null/undefined/true/false ao avaliar
+# um Literal: um resultado assim não pode virar literal
+_RESERVED_STRINGS = frozenset({'null', 'undefined', 'true', 'false'})
+
+# Erros que uma operação entre literais pode lançar em tempo de execução
+_RUNTIME_ERRORS = (TypeError, ValueError, ZeroDivisionError, OverflowError)
+
+
+def fold_constants(root):
+    """Dobra as constantes de toda a árvore (no lugar) e devolve a nova raiz"""
+    return _fold(root)
+
+
+def _fold(node):
+    cls = type(node)
+    if cls is list:
+        node[:] = [_fold(item) for item in node]
+        return node
+    if cls is tuple:
+        return tuple(_fold(item) for item in node)
+    if not isinstance(node, Node):
+        return node
+
+    for name in FIELDS[KIND_IDS[cls]]:
+        value = getattr(node, name, None)
+        if isinstance(value, (Node, list, tuple)):
+            setattr(node, name, _fold(value))
+
+    if cls is BinaryOp:
+        return _fold_binary(node)
+    if cls is UnaryOp:
+        return _fold_unary(node)
+    return node
+
+
+def literal_constant(node):
+    """Valor do literal, se puder participar de uma dobra (senão None)"""
+    if type(node) is not Literal:
+        return None
+    value = node.value
+    if isinstance(value, (int, float)):
+        return node
+    if isinstance(value, str) and value not in _RESERVED_STRINGS:
+        return node
+    return None
+
+
+def _literal(value):
+    """Literal para o resultado de uma dobra, ou None se não for representável"""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, str) and value in _RESERVED_STRINGS:
+        return None
+    if isinstance(value, (int, float, str)):
+        return Literal(value)
+    return None
+
+
+def _is_int(node):
+    return type(node) is Literal and type(node.value) is int
+
+
+def _is_number(node):
+    """Se o valor de `node` é sempre um número (quando a avaliação não falha)"""
+    cls = type(node)
+    if cls is Literal:
+        return isinstance(node.value, (int, float)) and not isinstance(node.value, bool)
+    if cls is UnaryOp:
+        return node.op in ('-', '+')
+    if cls is BinaryOp:
+        if node.op in ('-', '/'):
+            return True
+        if node.op in ('*', '%'):
+            return _is_number(node.left) and _is_number(node.right)
+    return False
+
+
+def _fold_binary(node):
+    op = node.op
+    left = literal_constant(node.left)
+    right = literal_constant(node.right)
+
+    if op in LOGICAL_OPERATORS:
+        # Com o lado esquerdo constante, o resultado é um dos dois lados
+        if left is None:
+            return node
+        takes_right = bool(left.value) if op == '&&' else not left.value
+        return node.right if takes_right else node.left
+
+    if left is not None and right is not None:
+        apply = BINARY_OPERATORS.get(op)
+        if apply is None:
+            return node
+        if (isinstance(left.value, str) or isinstance(right.value, str)) and op != '+' and op not in COMPARISONS:
+            return node
+        if op in ('/', '%') and right.value == 0:
+            return node
+        try:
+            folded = _literal(apply(left.value, right.value))
+        except _RUNTIME_ERRORS:
+            return node
+        return node if folded is None else folded
+
+    if op == '-':
+        if _is_int(node.right) and node.right.value == 0 and _is_number(node.left):
+            return node.left
+
+    if op == '*':
+        if _is_int(node.right) and node.right.value == 1 and _is_number(node.left):
+            return node.left
+        if _is_int(node.left) and node.left.value == 1 and _is_number(node.right):
+            return node.right
+
+    return node
+
+
+def _fold_unary(node):
+    operand = literal_constant(node.operand)
+    apply = UNARY_OPERATORS.get(node.op)
+    if operand is None or apply is None:
+        return node
+    if isinstance(operand.value, str) and node.op != '!':
+        return node
+    try:
+        result = apply(operand.value)
+    except _RUNTIME_ERRORS:
+        return node
+    if isinstance(result, bool):
+        return Literal(result)
+    folded = _literal(result)
+    return node if folded is None else folded
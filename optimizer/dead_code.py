@@ -0,0 +1,185 @@
+"""
+Eliminação de código morto e de statements inalcançáveis
+
+`eliminate_dead_code` altera a árvore no lugar (serve aos dois back ends):
+
+- statements depois de um return, dentro de um bloco, são removidos;
+- `if` com condição constante (já dobrada por constant_folding) é trocado
+  pelo ramo que executa, ou removido se não houver ramo;
+- `while` com condição constante falsa é removido;
+- `for` que não tem efeito é removido: condição constante falsa, ou corpo
+  vazio em um laço contado (`for (let i = 0; i < 10; i++) {}`), que sempre
+  termina e cuja variável (`let`) não existe fora do laço. Um laço vazio
+  que pode não terminar (`while (x) {}`) fica.
+
+`strip_comments` tira os Comment (e o comentário dos InlineComment) para a
+interpretação, que os visitaria à toa. Ela não altera a árvore recebida:
+copia só os nós no caminho até um comentário e compartilha o resto, para
+que a transpilação da mesma AST continue gerando os comentários.
+"""
+import copy
+
+from ast_nodes.arena import FIELDS, KIND_IDS
+from ast_nodes.nodes import (
+    Node, Program, Block, IfStatement, WhileStatement, ForStatement,
+    ReturnStatement, Comment, InlineComment, VariableDeclaration,
+    Identifier, BinaryOp, Literal, UpdateExpression,
+)
+from optimizer.constant_folding import literal_constant
+
+# Sentido em que a variável precisa andar para cada comparação terminar
+_COUNTED_DIRECTIONS = {'<': 1, '<=': 1, '>': -1, '>=': -1}
+
+
+def eliminate_dead_code(root):
+    """Remove o código morto de toda a árvore (no lugar) e devolve a raiz"""
+    result = _eliminate(root)
+    return result if isinstance(result, Node) else Block(result)
+
+
+def _eliminate(node):
+    """Nó simplificado, ou lista de statements que o substitui"""
+    cls = type(node)
+    for name in FIELDS[KIND_IDS[cls]]:
+        value = getattr(node, name, None)
+        if isinstance(value, Node):
+            result = _eliminate(value)
+            setattr(node, name, result if isinstance(result, Node) else Block(result))
+        elif isinstance(value, list):
+            value[:] = _eliminate_items(value)
+
+    if cls is Block:
+        node.statements = _reachable(node.statements)
+    elif cls is IfStatement:
+        return _eliminate_if(node)
+    elif cls is WhileStatement:
+        if _is_false(node.condition):
+            return []
+    elif cls is ForStatement:
+        if _is_dead_for(node):
+            return []
+    return node
+
+
+def _eliminate_items(items):
+    result = []
+    for item in items:
+        if isinstance(item, Node):
+            item = _eliminate(item)
+        elif type(item) is tuple:
+            item = tuple(_eliminate(part) if isinstance(part, Node) else part for part in item)
+        if type(item) is list:
+            result.extend(item)
+        else:
+            result.append(item)
+    return result
+
+
+def _reachable(statements):
+    for index, statement in enumerate(statements):
+        if type(statement) is InlineComment:
+            statement = statement.statement
+        if type(statement) is ReturnStatement:
+            return statements[:index + 1]
+    return statements
+
+
+def _statements(block):
+    if block is None:
+        return []
+    return block.statements if type(block) is Block else [block]
+
+
+def _eliminate_if(node):
+    condition = literal_constant(node.condition)
+    if condition is None:
+        return node
+    return _statements(node.then_block if condition.value else node.else_block)
+
+
+def _is_false(condition):
+    constant = literal_constant(condition)
+    return constant is not None and not constant.value
+
+
+def _number(node):
+    return type(node) is Literal and type(node.value) in (int, float)
+
+
+def _is_dead_for(node):
+    init = node.init
+    if init is not None:
+        # Só a declaração `let v = número` pode sair junto com o laço
+        if type(init) is not VariableDeclaration or init.kind != 'let' or not _number(init.value):
+            return False
+    if node.condition is not None and _is_false(node.condition):
+        return True
+    body = node.body
+    if init is None or type(body) is not Block or body.statements:
+        return False
+    return _counted_direction(node.condition, init.name) == _step_direction(node.update, init.name) != 0
+
+
+def _counted_direction(condition, name):
+    if type(condition) is not BinaryOp or condition.op not in _COUNTED_DIRECTIONS:
+        return 0
+    if type(condition.left) is not Identifier or condition.left.name != name or not _number(condition.right):
+        return 0
+    return _COUNTED_DIRECTIONS[condition.op]
+
+
+def _step_direction(update, name):
+    """+1/-1 se o update anda a variável de forma monotônica, senão 0"""
+    if type(update) is UpdateExpression:
+        operand = update.operand
+        if type(operand) is Identifier and operand.name == name:
+            return 1 if update.operator == '++' else -1 if update.operator == '--' else 0
+        return 0
+    if type(update) is VariableDeclaration and update.name == name:
+        # i++, i--, i += n e i -= n chegam do parser como `i = i op n`
+        value = update.value
+        if type(value) is BinaryOp and value.op in ('+', '-') and type(value.left) is Identifier \
+                and value.left.name == name and _number(value.right) and value.right.value > 0:
+            return 1 if value.op == '+' else -1
+    return 0
+
+
+def strip_comments(root):
+    """Cópia de `root` sem comentários, compartilhando os nós sem comentário"""
+    return _strip(root)
+
+
+def _strip(node):
+    cls = type(node)
+    if cls is InlineComment:
+        return _strip(node.statement)
+    changes = {}
+    for name in FIELDS[KIND_IDS[cls]]:
+        value = getattr(node, name, None)
+        if isinstance(value, Node):
+            stripped = _strip(value)
+        elif isinstance(value, list):
+            stripped = _strip_items(value)
+        else:
+            continue
+        if stripped is not value:
+            changes[name] = stripped
+    if not changes:
+        return node
+    node = copy.copy(node)
+    for name, value in changes.items():
+        setattr(node, name, value)
+    return node
+
+
+def _strip_items(items):
+    result = []
+    changed = False
+    for item in items:
+        if type(item) is Comment:
+            changed = True
+            continue
+        stripped = _strip(item) if isinstance(item, Node) else item
+        changed = changed or stripped is not item
+        result.append(stripped)
+    return result if changed else items
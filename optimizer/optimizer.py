@@ -0,0 +1,22 @@
+"""
+Passes de otimização entre a análise sintática e os back ends
+
+`optimize` aplica, em ordem, cada passe de PASSES à AST produzida por
+Parser.parse_program. Cada passe recebe a raiz, altera a árvore no lugar e
+devolve a raiz (que pode ser outro nó). O resultado é uma AST comum, usada
+igualmente pelo transpilador e pelos motores de interpretação.
+"""
+from optimizer.constant_folding import fold_constants
+from optimizer.dead_code import eliminate_dead_code
+
+# A dobra vem antes: `if (1 > 2)` só é reconhecido como morto depois dela
+PASSES = (
+    fold_constants,
+    eliminate_dead_code,
+)
+
+
+def optimize(ast, passes=PASSES):
+    for optimization in passes:
+        ast = optimization(ast)
+    return ast
@@ -0,0 +1,138 @@
+"""
+Cache persistente da AST em disco
+
+Cada entrada é a AST serializada com pickle, guardada sob uma chave que
+combina o hash do código-fonte com a versão do parser e do formato. Assim,
+execuções repetidas sobre um .js inalterado pulam o lexer e o parser. O
+tamanho total do diretório é limitado: ao exceder o limite, as entradas
+usadas há mais tempo são removidas.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+
+from parser.parser import PARSER_VERSION
+
+CACHE_FORMAT_VERSION = 2
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+CACHE_SUFFIX = '.ast'
+
+
+def default_cache_dir():
+    """Diretório padrão: $JS2PY_CACHE_DIR ou ~/.cache/js2py/ast"""
+    override = os.environ.get('JS2PY_CACHE_DIR')
+    if override:
+        return override
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'js2py', 'ast')
+
+
+class AstCache:
+    # Extensão das entradas; subclasses que guardam outro conteúdo no mesmo
+    # diretório (como o cache de código do motor python) usam outra
+    suffix = CACHE_SUFFIX
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def version(self):
+        """Prefixo da chave: muda sempre que o conteúdo guardado muda de formato"""
+        return f"{PARSER_VERSION}:{CACHE_FORMAT_VERSION}:"
+
+    def key(self, code):
+        digest = hashlib.sha256()
+        digest.update(self.version().encode())
+        digest.update(code.encode('utf-8'))
+        return digest.hexdigest()
+
+    def path_for(self, code):
+        return os.path.join(self.directory, self.key(code) + self.suffix)
+
+    def load(self, f):
+        return pickle.load(f)
+
+    def dump(self, value, f):
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def get(self, code):
+        """Retorna a AST em cache para `code`, ou None se não houver entrada válida"""
+        path = self.path_for(code)
+        try:
+            with open(path, 'rb') as f:
+                ast = self.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Entrada corrompida ou de formato incompatível: descarta
+            self._remove(path)
+            return None
+        # Atualiza o horário de acesso usado pela política de remoção (LRU)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return ast
+
+    def put(self, code, ast):
+        """Grava a AST de forma atômica e aplica o limite de tamanho"""
+        temp_path = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                self.dump(ast, f)
+            os.replace(temp_path, self.path_for(code))
+        except (OSError, pickle.PicklingError, RecursionError, ValueError):
+            # O cache é apenas uma otimização: falhas de escrita são ignoradas
+            if temp_path is not None:
+                self._remove(temp_path)
+            return
+        self.evict()
+
+    def load_or_parse(self, code, parse):
+        """Retorna (ast, veio_do_cache), chamando `parse(code)` em caso de falta"""
+        ast = self.get(code)
+        if ast is not None:
+            return ast, True
+        ast = parse(code)
+        self.put(code, ast)
+        return ast, False
+
+    def entries(self):
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        result = []
+        for name in names:
+            if not name.endswith(self.suffix):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            result.append((stat.st_mtime, stat.st_size, path))
+        return result
+
+    def evict(self):
+        """Remove as entradas menos usadas até o diretório caber em max_bytes"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            self._remove(path)
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -1,5 +1,7 @@
-from lexer.tokenizer import tokenize
-from errors.exceptions import ParserError
+from lexer.tokenizer import iter_tokens
+from lexer.line_index import LineIndex
+from ast_nodes.arena import AstArena
+from errors.exceptions import LexerError, ParserError
 from ast_nodes.nodes import (
     Program, VariableDeclaration, Assignment, Literal, Identifier,
     BinaryOp, UnaryOp, ConsoleLog, IfStatement, WhileStatement,
@@ -9,15 +11,72 @@ from ast_nodes.nodes import (
     MethodDeclaration, NewExpression, ThisExpression, PropertyAccess, MethodCall, UpdateExpression
 )
 
+# Incrementar quando a forma da AST produzida mudar (invalida o cache em disco)
+PARSER_VERSION = 2
+
 class Parser:
-    def __init__(self, code):
-        self.tokens = tokenize(code)
+    def __init__(self, code, line_index=None):
+        # Os tokens são consumidos sob demanda do gerador do lexer. `self.tokens`
+        # guarda apenas a janela ainda alcançável pelo parser e `self.offset` é a
+        # posição absoluta de self.tokens[0]; `self.pos` continua absoluto.
+        self.code = code
+        self.line_index = line_index or LineIndex(code)
+        self.token_stream = iter_tokens(code, self.line_index)
+        self.tokens = []
+        self.offset = 0
         self.pos = 0
+        self.marks = []
+        self.lexer_error = None
+
+    def _fill(self, index):
+        """Lê do lexer até que o token de posição absoluta `index` esteja no buffer"""
+        missing = index - self.offset - len(self.tokens) + 1
+        while missing > 0 and self.token_stream is not None:
+            try:
+                self.tokens.append(next(self.token_stream))
+                missing -= 1
+            except StopIteration:
+                self.token_stream = None
+            except LexerError as e:
+                self.token_stream = None
+                self.lexer_error = e
+        if missing > 0 and self.lexer_error is not None:
+            raise self.lexer_error
+
+    def peek_token(self, distance=0):
+        index = self.pos + distance
+        self._fill(index)
+        index -= self.offset
+        if index < len(self.tokens):
+            return self.tokens[index]
+        return None
 
     def current_token(self):
-        if self.pos < len(self.tokens):
-            return self.tokens[self.pos]
-        return None
+        index = self.pos - self.offset
+        if index < len(self.tokens):
+            return self.tokens[index]
+        return self.peek_token()
+
+    def mark(self):
+        """Registra um ponto de retrocesso; tokens a partir dele não são descartados"""
+        self.marks.append(self.pos)
+        return self.pos
+
+    def release_mark(self):
+        self.marks.pop()
+
+    def discard_consumed(self):
+        """Libera os tokens já consumidos que nenhum retrocesso pode revisitar"""
+        keep_from = self.marks[0] if self.marks else self.pos
+        consumed = keep_from - self.offset
+        if consumed > 0:
+            del self.tokens[:consumed]
+            self.offset = keep_from
+
+    def source_context(self, token):
+        """Contexto visual da posição de um token (ou do fim do arquivo)"""
+        offset = token.start if token is not None else len(self.code)
+        return self.line_index.context(offset)
 
     def eat(self, token_type):
         token = self.current_token()
@@ -36,14 +95,29 @@ class Parser:
                 expected=token_type,
                 found=token.type if token else "EOF",
                 position=self.pos,
-                context=context
+                context=context,
+                source_line=self.source_context(token)
             )
 
     def parse_program(self):
-        statements = []
+        return Program(list(self.iter_statements()))
+
+    def parse_arena(self):
+        """Analisa o programa emitindo a AST compacta (AstArena) em vez de objetos"""
+        return AstArena.from_statements(self.iter_statements())
+
+    def iter_statements(self):
         while self.current_token() is not None:
-            statements.append(self.parse_statement())
-        return Program(statements)
+            statement = self.parse_positioned_statement()
+            self.discard_consumed()
+            yield statement
+
+    def parse_positioned_statement(self):
+        """Analisa um statement e registra o offset do seu primeiro token na fonte"""
+        start = self.current_token().start
+        statement = self.parse_statement()
+        statement.position = start
+        return statement
 
     def parse_statement(self):
         token = self.current_token()
@@ -72,7 +146,7 @@ class Parser:
             stmt = self.parse_this_assignment()
             return self.check_for_inline_comment(stmt)
         elif token.type == 'IDENTIFIER':
-            next_token = self.tokens[self.pos + 1] if self.pos + 1 < len(self.tokens) else None
+            next_token = self.peek_token(1)
             if next_token and next_token.type == 'LPAREN':
                 stmt = self.parse_function_call_statement()
                 return self.check_for_inline_comment(stmt)
@@ -97,7 +171,8 @@ class Parser:
                 expected="declaração válida",
                 found=token.type,
                 position=self.pos,
-                context=context
+                context=context,
+                source_line=self.source_context(token)
             )
 
     def parse_comment(self):
@@ -127,7 +202,7 @@ class Parser:
             self.eat('OP_ASSIGN')
 
             if self.current_token().type == 'LPAREN':
-                lookahead_pos = self.pos
+                lookahead_pos = self.mark()
                 try:
                     self.eat('LPAREN')
                     while self.current_token().type != 'RPAREN':
@@ -142,8 +217,12 @@ class Parser:
                         return VariableDeclaration(ident.value, func, kind)
                     else:
                         self.pos = lookahead_pos
+                except LexerError:
+                    raise
                 except:
                     self.pos = lookahead_pos
+                finally:
+                    self.release_mark()
 
             value = self.parse_expression()
         else:
@@ -170,6 +249,8 @@ class Parser:
             raise SyntaxError(f"Esperado '=' após acesso a array, encontrado {token}")
 
     def parse_assignment(self):
+        # Atribuições (x = v, x += v, x++) viram VariableDeclaration com kind None,
+        # para distingui-las das declarações com var/let/const
         ident = self.eat('IDENTIFIER')
         token = self.current_token()
 
@@ -177,7 +258,7 @@ class Parser:
             self.eat('OP_ASSIGN')
             value = self.parse_expression()
             self.eat('SEMICOLON')
-            return VariableDeclaration(ident.value, value)
+            return VariableDeclaration(ident.value, value, None)
 
         elif token.type in ('OP_PLUSEQ', 'OP_MINUSEQ'):
             op_token = self.eat(token.type)
@@ -185,19 +266,19 @@ class Parser:
             self.eat('SEMICOLON')
             op = op_token.value[0]
             expr = BinaryOp(Identifier(ident.value), op, value)
-            return VariableDeclaration(ident.value, expr)
+            return VariableDeclaration(ident.value, expr, None)
 
         elif token.type == 'OP_INCREMENT':
             self.eat('OP_INCREMENT')
             self.eat('SEMICOLON')
             expr = BinaryOp(Identifier(ident.value), '+', Literal(1))
-            return VariableDeclaration(ident.value, expr)
+            return VariableDeclaration(ident.value, expr, None)
 
         elif token.type == 'OP_DECREMENT':
             self.eat('OP_DECREMENT')
             self.eat('SEMICOLON')
             expr = BinaryOp(Identifier(ident.value), '-', Literal(1))
-            return VariableDeclaration(ident.value, expr)
+            return VariableDeclaration(ident.value, expr, None)
 
         else:
             raise SyntaxError(f"Operação não suportada: {token}")
@@ -239,7 +320,8 @@ class Parser:
         self.eat('LBRACE')
         statements = []
         while self.current_token() and self.current_token().type != 'RBRACE':
-            statements.append(self.parse_statement())
+            statements.append(self.parse_positioned_statement())
+            self.discard_consumed()
         self.eat('RBRACE')
         return Block(statements)
 
@@ -356,7 +438,7 @@ class Parser:
         self.eat('FOR')
         self.eat('LPAREN')
 
-        saved_pos = self.pos
+        saved_pos = self.mark()
         try:
             if self.current_token().type in ('VAR', 'LET', 'CONST'):
                 decl_type = self.current_token().type
@@ -372,9 +454,13 @@ class Parser:
             else:
                 self.pos = saved_pos
                 return self.parse_traditional_for()
+        except LexerError:
+            raise
         except:
             self.pos = saved_pos
             return self.parse_traditional_for()
+        finally:
+            self.release_mark()
 
     def parse_traditional_for(self):
         init = None
@@ -400,7 +486,7 @@ class Parser:
 
     def parse_update_expression(self):
         if self.current_token().type == 'IDENTIFIER':
-            next_token = self.tokens[self.pos + 1] if self.pos + 1 < len(self.tokens) else None
+            next_token = self.peek_token(1)
             if next_token and next_token.type in ('OP_INCREMENT', 'OP_DECREMENT', 'OP_PLUSEQ', 'OP_MINUSEQ', 'OP_ASSIGN'):
                 ident = self.eat('IDENTIFIER')
                 token = self.current_token()
@@ -408,24 +494,24 @@ class Parser:
                 if token.type == 'OP_INCREMENT':
                     self.eat('OP_INCREMENT')
                     expr = BinaryOp(Identifier(ident.value), '+', Literal(1))
-                    return VariableDeclaration(ident.value, expr)
+                    return VariableDeclaration(ident.value, expr, None)
 
                 elif token.type == 'OP_DECREMENT':
                     self.eat('OP_DECREMENT')
                     expr = BinaryOp(Identifier(ident.value), '-', Literal(1))
-                    return VariableDeclaration(ident.value, expr)
+                    return VariableDeclaration(ident.value, expr, None)
 
                 elif token.type in ('OP_PLUSEQ', 'OP_MINUSEQ'):
                     op_token = self.eat(token.type)
                     value = self.parse_expression()
                     op = op_token.value[0]
                     expr = BinaryOp(Identifier(ident.value), op, value)
-                    return VariableDeclaration(ident.value, expr)
+                    return VariableDeclaration(ident.value, expr, None)
 
                 elif token.type == 'OP_ASSIGN':
                     self.eat('OP_ASSIGN')
                     value = self.parse_expression()
-                    return VariableDeclaration(ident.value, value)
+                    return VariableDeclaration(ident.value, value, None)
 
         return self.parse_expression()
 
@@ -610,7 +696,7 @@ class Parser:
             raise SyntaxError(f"Esperado '(' ou '=' após this.{property_name}, encontrado {self.current_token()}")
 
     def parse_object_method_or_assignment(self):
-        saved_pos = self.pos
+        saved_pos = self.mark()
 
         try:
             expr = self.parse_expression()
@@ -647,9 +733,13 @@ class Parser:
                 self.pos = saved_pos
                 return self.parse_simple_object_access()
         
+        except LexerError:
+            raise
         except Exception:
             self.pos = saved_pos
             return self.parse_simple_object_access()
+        finally:
+            self.release_mark()
     
     def parse_simple_object_access(self):
         obj_name = self.eat('IDENTIFIER').value
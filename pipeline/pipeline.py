@@ -0,0 +1,137 @@
+"""
+Pipeline do compilador: encadeia as etapas sobre um único código-fonte
+
+A AST é produzida uma única vez (ou lida do cache em disco) e compartilhada
+pelas etapas de transpilação e interpretação. O tempo gasto em cada etapa
+fica registrado em `timings`. A interpretação usa o motor escolhido em
+ENGINES (visitante da AST, closures compiladas, bytecode ou Python gerado
+e compilado com compile(); neste último, o code object também vai para um
+cache em disco ao lado do da AST, e uma execução que o encontra lá não
+analisa nem transpila o código). Com
+`optimize=True`, os passes de optimizer/ são aplicados à AST logo após a
+análise (o cache em disco guarda a árvore original), e a interpretação
+recebe ainda uma versão da árvore sem comentários.
+"""
+import time
+from contextlib import contextmanager
+
+from parser.parser import Parser
+from lexer.line_index import LineIndex
+from optimizer.optimizer import optimize
+from optimizer.dead_code import strip_comments
+from translator.transpiler import Transpiler
+from translator.source_map import SourceMap
+from interpreter.interpreter import Interpreter
+from interpreter.closure_compiler import ClosureInterpreter
+from interpreter.vm import BytecodeInterpreter
+from interpreter.python_engine import PythonInterpreter, CodeCache, compile_program, run
+
+# Motores de execução disponíveis para a etapa de interpretação
+ENGINES = {
+    'ast': Interpreter,
+    'closure': ClosureInterpreter,
+    'bytecode': BytecodeInterpreter,
+    'python': PythonInterpreter,
+}
+
+
+class Pipeline:
+    def __init__(self, code, cache=None, engine='ast', optimize=False):
+        if engine not in ENGINES:
+            raise ValueError(f"Motor de execução desconhecido: '{engine}'")
+        self.code = code
+        self.cache = cache
+        self.engine = engine
+        self.optimize = optimize
+        self.line_index = LineIndex(code)
+        self.timings = {}
+        self.from_cache = False
+        self.code_from_cache = False
+        self._ast = None
+        self._code_object = None
+
+    @contextmanager
+    def stage(self, name):
+        """Mede a duração de uma etapa, acumulando em timings[name]"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+    def parse(self):
+        """Produz a AST na primeira chamada; as seguintes reaproveitam o resultado"""
+        if self._ast is None:
+            with self.stage('parse'):
+                if self.cache is None:
+                    self._ast = self._parse(self.code)
+                else:
+                    self._ast, self.from_cache = self.cache.load_or_parse(self.code, self._parse)
+            if self.optimize:
+                with self.stage('optimize'):
+                    self._ast = optimize(self._ast)
+        return self._ast
+
+    def _parse(self, code):
+        return Parser(code, self.line_index).parse_program()
+
+    @property
+    def ast(self):
+        return self.parse()
+
+    def transpile(self, source_map=None):
+        ast = self.parse()
+        with self.stage('transpile'):
+            return Transpiler(ast).transpile(source_map)
+
+    def transpile_to(self, sink, source_map=None):
+        """Transpila escrevendo o código em `sink` (arquivo, sys.stdout...) aos poucos"""
+        ast = self.parse()
+        with self.stage('transpile'):
+            Transpiler(ast).transpile_to(sink, source_map)
+
+    def source_map(self, source=None, file=None):
+        """SourceMap vazio para esta fonte, a ser preenchido por transpile/transpile_to"""
+        return SourceMap(self.line_index, source, file)
+
+    def compile_python(self):
+        """Code object do motor python, lido do cache de código quando possível"""
+        if self._code_object is None:
+            cache = None
+            if self.cache is not None:
+                cache = CodeCache(self.cache.directory, self.cache.max_bytes, self.optimize)
+                with self.stage('compile'):
+                    self._code_object = cache.get(self.code)
+                self.code_from_cache = self._code_object is not None
+            if self._code_object is None:
+                ast = self.parse()
+                with self.stage('compile'):
+                    self._code_object = compile_program(ast)
+                if cache is not None:
+                    cache.put(self.code, self._code_object)
+        return self._code_object
+
+    def interpret(self):
+        if self.engine == 'python':
+            code_object = self.compile_python()
+            with self.stage('interpret'):
+                return run(code_object)
+        ast = self.parse()
+        if self.optimize:
+            with self.stage('optimize'):
+                ast = strip_comments(ast)
+        with self.stage('interpret'):
+            return ENGINES[self.engine](ast, self.line_index).execute()
+
+    def disassemble(self):
+        """Listagem do bytecode do programa e das funções declaradas"""
+        ast = self.parse()
+        return BytecodeInterpreter(ast, self.line_index).disassemble()
+
+    def format_timings(self):
+        lines = []
+        for name, seconds in self.timings.items():
+            cached = (name == 'parse' and self.from_cache) or (name == 'compile' and self.code_from_cache)
+            label = f"{name} (cache)" if cached else name
+            lines.append(f"   {label:<16} {seconds * 1000:>10.2f} ms")
+        return "\n".join(lines)
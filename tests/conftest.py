@@ -0,0 +1,13 @@
+import pytest
+
+from pipeline.pipeline import ENGINES
+
+# Motores que executam a AST com os escopos de interpreter/scope.py; o motor
+# python tem a própria suíte (tests/test_python_engine.py)
+SCOPE_ENGINES = ('ast', 'closure', 'bytecode')
+
+
+@pytest.fixture(params=SCOPE_ENGINES)
+def engine_class(request):
+    """Classe do motor: cada teste que a recebe roda uma vez por motor"""
+    return ENGINES[request.param]
@@ -0,0 +1,49 @@
+import glob
+import os
+
+from parser.parser import Parser
+from ast_nodes.arena import AstArena
+from ast_nodes.nodes import Program, ObjectLiteral
+from translator.transpiler import Transpiler
+from interpreter.interpreter import Interpreter
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'examples')
+
+def test_arena_round_trip_preserves_transpiled_output():
+    for path in sorted(glob.glob(os.path.join(EXAMPLES, '*.js'))):
+        if 'error' in path:
+            continue
+        code = open(path, encoding='utf-8').read()
+        ast = Parser(code).parse_program()
+        arena = Parser(code).parse_arena()
+        assert Transpiler(arena.to_ast()).transpile() == Transpiler(ast).transpile(), path
+
+def test_arena_distinguishes_equal_literals_of_different_types():
+    ast = Parser("var a = 1; var b = true; var c = 1.0; var d = '1';").parse_program()
+    values = [s.value.value for s in AstArena.from_ast(ast).to_ast().statements]
+    assert [type(v) for v in values] == [int, bool, float, str]
+
+def test_arena_stores_nodes_in_preorder():
+    arena = Parser("var x = 1 + 2 * 3;").parse_arena()
+    assert arena.kind(0) is Program
+    assert [arena.kind(i).__name__ for i in range(len(arena))] == [
+        'Program', 'VariableDeclaration', 'BinaryOp', 'Literal', 'BinaryOp', 'Literal', 'Literal'
+    ]
+    assert arena.field(2, 'op') == '+'
+    assert arena.field(2, 'left') == 3
+    assert arena.count_by_kind() == {
+        'Program': 1, 'VariableDeclaration': 1, 'BinaryOp': 2, 'Literal': 3
+    }
+
+def test_arena_keeps_statement_positions_and_tuples():
+    code = "var a = 1;\nvar o = { k: 2 };"
+    program = Parser(code).parse_arena().to_ast()
+    assert program.statements[1].position == code.index("var o")
+    pairs = program.statements[1].value.pairs
+    assert isinstance(program.statements[1].value, ObjectLiteral)
+    assert pairs[0][0] == 'k' and isinstance(pairs[0], tuple)
+
+def test_interpreter_runs_arena_after_to_ast():
+    interpreter = Interpreter(Parser("var x = 2; x = x * 21;").parse_arena().to_ast())
+    interpreter.execute()
+    assert interpreter.environment['x'] == 42
@@ -0,0 +1,54 @@
+import os
+
+from parser.parser import Parser
+from parser.ast_cache import AstCache, CACHE_SUFFIX
+from translator.transpiler import Transpiler
+
+CODE = "function dobro(n) { return n * 2; }\nvar x = dobro(21);"
+
+def parse(code):
+    return Parser(code).parse_program()
+
+def test_cache_miss_then_hit(tmp_path):
+    cache = AstCache(str(tmp_path))
+    ast, cached = cache.load_or_parse(CODE, parse)
+    assert cached is False
+    again, cached = cache.load_or_parse(CODE, parse)
+    assert cached is True
+    assert Transpiler(again).transpile() == Transpiler(ast).transpile()
+    assert again.statements[1].position == CODE.index("var x")
+
+def test_cache_key_depends_on_source_and_parser_version(tmp_path, monkeypatch):
+    cache = AstCache(str(tmp_path))
+    key = cache.key(CODE)
+    assert cache.key(CODE + " ") != key
+    monkeypatch.setattr('parser.ast_cache.PARSER_VERSION', 999)
+    assert cache.key(CODE) != key
+
+def test_corrupted_entry_is_discarded(tmp_path):
+    cache = AstCache(str(tmp_path))
+    cache.put(CODE, parse(CODE))
+    with open(cache.path_for(CODE), 'wb') as f:
+        f.write(b"lixo")
+    assert cache.get(CODE) is None
+    assert not os.path.exists(cache.path_for(CODE))
+
+def test_eviction_keeps_cache_under_size_limit(tmp_path):
+    cache = AstCache(str(tmp_path), max_bytes=0)
+    cache.put(CODE, parse(CODE))
+    assert cache.get(CODE) is None
+
+    cache.max_bytes = 10 ** 9
+    sources = [f"var v{i} = {i};" for i in range(5)]
+    for source in sources:
+        cache.put(source, parse(source))
+    sizes = sorted(size for _, size, _ in cache.entries())
+    cache.max_bytes = sum(sizes[:3])
+    # A entrada acessada mais recentemente deve sobreviver à remoção
+    os.utime(cache.path_for(sources[0]), (1, 1))
+    cache.get(sources[0])
+    cache.evict()
+    remaining = [path for _, _, path in cache.entries()]
+    assert len(remaining) <= 3
+    assert cache.path_for(sources[0]) in remaining
+    assert all(name.endswith(CACHE_SUFFIX) for name in os.listdir(tmp_path))
@@ -0,0 +1,52 @@
+import pytest
+from parser.parser import Parser
+from interpreter.vm import BytecodeInterpreter
+from interpreter.bytecode import OPNAMES, LOAD_LOCAL, EXEC_NODE
+from pipeline.pipeline import Pipeline
+
+def compile_js(code):
+    return BytecodeInterpreter(Parser(code).parse_program())
+
+def test_locals_compile_to_slot_instructions():
+    vm = compile_js('function f(a) { var b = a * 2; return b; }')
+    function = vm.code.functions[0]
+    ops = [OPNAMES[op] for op, _ in function.instructions]
+    assert ops[:6] == ['LOAD_LOCAL', 'LOAD_CONST', 'BINARY_OP', 'STORE_LOCAL', 'LOAD_LOCAL', 'RETURN_VALUE']
+    assert function.varnames == ('a', 'b')
+    assert function.instructions[0] == (LOAD_LOCAL, 0)
+
+def test_loops_and_recursion(capsys):
+    code = '''
+    function fib(n) { if (n < 2) { return n; } return fib(n - 1) + fib(n - 2); }
+    var total = 0;
+    for (let i = 0; i < 10; i++) { total = total + fib(i); }
+    var k = 3;
+    while (k > 0) { k--; }
+    console.log(total + " " + k);
+    '''
+    compile_js(code).execute()
+    assert capsys.readouterr().out.strip() == '88 0'
+
+def test_unsupported_nodes_run_through_visitor(capsys):
+    code = 'var nomes = ["ana", "bia"]; for (let nome of nomes) { console.log(nome.toUpperCase()); }'
+    vm = compile_js(code)
+    assert any(op == EXEC_NODE for op, _ in vm.code.instructions)
+    vm.execute()
+    assert capsys.readouterr().out.split() == ['ANA', 'BIA']
+
+def test_disassemble_lists_program_and_functions():
+    listing = compile_js('function dobro(x) { return x * 2; } console.log(dobro(4));').disassemble()
+    assert 'Código de <programa>:' in listing
+    assert 'DECLARE_FUNCTION   <função dobro>' in listing
+    assert 'Código de dobro:' in listing
+    assert 'LOAD_LOCAL         0 (x)' in listing
+
+def test_pipeline_bytecode_engine(capsys):
+    Pipeline("var x = [1, 2]; x[1] = 5; console.log(x[0] + x[1]);", engine='bytecode').interpret()
+    assert capsys.readouterr().out.strip() == '6'
+
+def test_logical_operators_compile_to_conditional_jumps():
+    listing = compile_js('var a = 1; var b = a > 0 && a < 5 || a == 9;').disassemble()
+    assert 'JUMP_IF_FALSE_OR_POP' in listing
+    assert 'JUMP_IF_TRUE_OR_POP' in listing
+    assert '&&' not in listing and '||' not in listing
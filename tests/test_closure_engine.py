@@ -0,0 +1,30 @@
+import pytest
+from parser.parser import Parser
+from interpreter.closure_compiler import ClosureInterpreter
+from pipeline.pipeline import Pipeline
+
+def test_nodes_compile_once_and_bodies_are_cached(capsys):
+    code = 'function dobro(n) { return n * 2; } for (let i = 0; i < 3; i++) { console.log(dobro(i)); }'
+    interpreter = ClosureInterpreter(Parser(code).parse_program())
+    interpreter.execute()
+    assert capsys.readouterr().out.split() == ['0', '2', '4']
+    function = interpreter.ast.statements[0]
+    body = interpreter._codes[function.body]
+    interpreter.execute()
+    assert interpreter._codes[function.body] is body
+
+def test_uncompiled_nodes_fall_back_to_visitor(capsys):
+    code = '''
+    var nomes = ["ana", "bia"];
+    for (let nome of nomes) {
+        console.log(nome.toUpperCase());
+    }
+    '''
+    ClosureInterpreter(Parser(code).parse_program()).execute()
+    assert capsys.readouterr().out.split() == ['ANA', 'BIA']
+
+def test_pipeline_selects_engine(capsys):
+    Pipeline("console.log(1 + 2);", engine='closure').interpret()
+    assert capsys.readouterr().out.strip() == '3'
+    with pytest.raises(ValueError):
+        Pipeline("", engine='desconhecido')
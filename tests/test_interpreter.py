@@ -1,46 +1,45 @@
 import pytest
 from parser.parser import Parser
-from interpreter.interpreter import Interpreter
 
-def run_js(js_code):
+def run_js(js_code, engine_class):
     parser = Parser(js_code)
     ast = parser.parse_program()
-    interpreter = Interpreter(ast)
+    interpreter = engine_class(ast)
     return interpreter.execute()
 
-def test_interpret_variable():
-    run_js('var x = 10;')
+def test_interpret_variable(engine_class):
+    run_js('var x = 10;', engine_class)
     assert True  
 
-def test_if_else():
+def test_if_else(engine_class):
     code = 'var x = 5; if (x > 3) { x = 20; } else { x = 0; }'
     parser = Parser(code)
     ast = parser.parse_program()
-    interpreter = Interpreter(ast)
+    interpreter = engine_class(ast)
     interpreter.execute()
     assert interpreter.environment['x'] == 20
 
-def test_while_loop():
+def test_while_loop(engine_class):
     code = 'var x = 0; while (x < 3) { x = x + 1; }'
     parser = Parser(code)
     ast = parser.parse_program()
-    interpreter = Interpreter(ast)
+    interpreter = engine_class(ast)
     interpreter.execute()
     assert interpreter.environment['x'] == 3
 
-def test_function_call():
+def test_function_call(engine_class):
     code = 'function soma(a,b){ return a+b; } soma(2,3);'
     parser = Parser(code)
     ast = parser.parse_program()
-    interpreter = Interpreter(ast)
+    interpreter = engine_class(ast)
     interpreter.execute()
     assert 'soma' in interpreter.environment
 
-def test_array_and_object():
+def test_array_and_object(engine_class):
     code = 'var arr = [1,2]; var obj = { a: 1, b: 2 };'
-    run_js(code)
+    run_js(code, engine_class)
 
-def test_class_and_method():
+def test_class_and_method(engine_class):
     code = '''
     class Pessoa {
         constructor(nome){ this.nome = nome; }
@@ -49,31 +48,30 @@ def test_class_and_method():
     var p = new Pessoa("João");
     p.falar();
     '''
-    run_js(code)
+    run_js(code, engine_class)
 
-def test_error_variable_not_defined():
+def test_error_variable_not_defined(engine_class):
     code = 'console.log(x);'
     with pytest.raises(NameError):
-        run_js(code)
+        run_js(code, engine_class)
 
 import pytest
 from parser.parser import Parser
-from interpreter.interpreter import Interpreter
 
-def run(js_code):
+def run(js_code, engine_class):
     parser = Parser(js_code)
     ast = parser.parse_program()
-    return Interpreter(ast).execute()
+    return engine_class(ast).execute()
 
-def test_arithmetic_and_logic_operations():
+def test_arithmetic_and_logic_operations(engine_class):
     code = "var x = (1 + 2) * 3; var y = (x > 5) && true; console.log(y);"
-    run(code)
+    run(code, engine_class)
 
-def test_increment_and_update_expression():
+def test_increment_and_update_expression(engine_class):
     code = "var i = 0; i++; i--; console.log(i);"
-    run(code)
+    run(code, engine_class)
 
-def test_string_and_array_methods():
+def test_string_and_array_methods(engine_class):
     code = '''
     var s = "Hello";
     console.log(s.toUpperCase());
@@ -81,59 +79,59 @@ def test_string_and_array_methods():
     arr.push(2);
     arr.pop();
     '''
-    run(code)
+    run(code, engine_class)
 
-def test_math_functions():
+def test_math_functions(engine_class):
     code = "console.log(Math.floor(3.7)); console.log(Math.sqrt(9)); console.log(Math.max(1,2,3));"
-    run(code)
+    run(code, engine_class)
 
 def test_this_context_and_error():
     code = "function f(){ this.nome = 'Ana'; } f();"
 
-def run(js):
+def run(js, engine_class):
     parser = Parser(js)
     ast = parser.parse_program()
-    return Interpreter(ast)
+    return engine_class(ast)
 
-def test_unary_operations():
+def test_unary_operations(engine_class):
     code = "var a = -5; var b = +10; var c = !false;"
-    interpreter = run(code)
+    interpreter = run(code, engine_class)
     interpreter.execute()
     assert interpreter.environment["a"] == -5
     assert interpreter.environment["b"] == 10
     assert interpreter.environment["c"] is True
 
-def test_update_expression_on_array_length():
+def test_update_expression_on_array_length(engine_class):
     code = "var arr = [1,2]; arr.length++;"
-    interpreter = run(code)
+    interpreter = run(code, engine_class)
     interpreter.execute()
     assert len(interpreter.environment["arr"]) == 3
 
-def test_invalid_method_call():
+def test_invalid_method_call(engine_class):
     code = "var obj = {}; obj.nonExistent();"
-    interpreter = run(code)
+    interpreter = run(code, engine_class)
     with pytest.raises(TypeError):
         interpreter.execute()
 
-def test_new_expression_creates_instance():
+def test_new_expression_creates_instance(engine_class):
     code = "class Pessoa { constructor(nome) { this.nome = nome; } } var p = new Pessoa('Ana');"
-    interpreter = run(code)
+    interpreter = run(code, engine_class)
     interpreter.execute()
     assert interpreter.environment["p"]["type"] == "instance"
 
-def test_invalid_string_method():
+def test_invalid_string_method(engine_class):
     code = 'var s = "text"; s.invalidMethod();'
-    interpreter = run(code)
+    interpreter = run(code, engine_class)
     with pytest.raises(AttributeError):
         interpreter.execute()
 
-def run(js_code):
+def run(js_code, engine_class):
     parser = Parser(js_code)
     ast = parser.parse_program()
-    interpreter = Interpreter(ast)
+    interpreter = engine_class(ast)
     return interpreter
 
-def test_string_methods_valid():
+def test_string_methods_valid(engine_class):
     code = '''
     var s = "Hello";
     s.toUpperCase();
@@ -142,56 +140,56 @@ def test_string_methods_valid():
     s.substr(1,2);
     s.charAt(0);
     '''
-    interpreter = run(code)
+    interpreter = run(code, engine_class)
     interpreter.execute()
     assert "s" in interpreter.environment
 
-def test_string_method_invalid_args():
+def test_string_method_invalid_args(engine_class):
     code = 'var s = "abc"; s.charAt();'
-    interpreter = run(code)
+    interpreter = run(code, engine_class)
     with pytest.raises(TypeError):
         interpreter.execute()
 
-def test_string_method_invalid_name():
+def test_string_method_invalid_name(engine_class):
     code = 'var s = "abc"; s.invalidMethod();'
-    interpreter = run(code)
+    interpreter = run(code, engine_class)
     with pytest.raises(AttributeError):
         interpreter.execute()
 
-def test_array_methods_valid():
+def test_array_methods_valid(engine_class):
     code = '''
     var arr = [1];
     arr.push(2);
     arr.push(3,4);
     arr.pop();
     '''
-    interpreter = run(code)
+    interpreter = run(code, engine_class)
     interpreter.execute()
     assert len(interpreter.environment["arr"]) == 3
 
-def test_array_method_invalid():
+def test_array_method_invalid(engine_class):
     code = 'var arr = [1]; arr.unknown();'
-    interpreter = run(code)
+    interpreter = run(code, engine_class)
     with pytest.raises(AttributeError):
         interpreter.execute()
 
-def test_number_methods():
+def test_number_methods(engine_class):
     code = '''
     var n = 12.345;
     n.toFixed(2);
     n.toString();
     '''
-    interpreter = run(code)
+    interpreter = run(code, engine_class)
     interpreter.execute()
     assert "n" in interpreter.environment
 
-def test_number_method_invalid():
+def test_number_method_invalid(engine_class):
     code = 'var n = 42; n.badMethod();'
-    interpreter = run(code)
+    interpreter = run(code, engine_class)
     with pytest.raises(AttributeError):
         interpreter.execute()
 
-def test_math_functions_all():
+def test_math_functions_all(engine_class):
     code = '''
     Math.floor(4.7);
     Math.ceil(4.2);
@@ -202,11 +200,240 @@ def test_math_functions_all():
     Math.min(1,2,3);
     Math.pow(2,3);
     '''
-    interpreter = run(code)
+    interpreter = run(code, engine_class)
     interpreter.execute()
 
-def test_special_values():
+def test_special_values(engine_class):
     code = "var a = null; var b = undefined; var c = true; var d = false;"
-    interpreter = run(code)
+    interpreter = run(code, engine_class)
     with pytest.raises(NameError):
         interpreter.execute()
+
+def test_interpreter_error_reports_source_location(engine_class):
+    from errors.exceptions import InterpreterError
+    class Unsupported:
+        position = 11
+    parser = Parser("var a = 1;\nvar b = 2;")
+    interpreter = engine_class(parser.parse_program(), parser.line_index)
+    with pytest.raises(InterpreterError) as exc:
+        interpreter.visit(Unsupported())
+    assert "Linha 2, coluna 1" in str(exc.value)
+
+def test_visit_dispatch_table_is_built_once_per_node_type():
+    # A tabela de despacho é do visitante; os outros motores compilam a árvore
+    from interpreter.interpreter import Interpreter as AstInterpreter
+    from ast_nodes.nodes import BinaryOp, Literal
+    parser = Parser("var x = 1 + 2 + 3;")
+    interpreter = AstInterpreter(parser.parse_program())
+    interpreter.execute()
+    assert interpreter._dispatch[BinaryOp] == interpreter.visit_BinaryOp
+    visitor = interpreter._dispatch[Literal]
+    interpreter.execute()
+    assert interpreter._dispatch[Literal] is visitor
+
+def test_visit_falls_back_to_generic_visit(engine_class):
+    from errors.exceptions import InterpreterError
+    class Unknown:
+        pass
+    interpreter = engine_class(Parser("").parse_program())
+    for _ in range(2):
+        with pytest.raises(InterpreterError):
+            interpreter.visit(Unknown())
+
+def test_function_call_does_not_leak_locals_to_caller(engine_class):
+    code = 'var x = 1; function f(y) { x = 5; var z = y; return z; } var r = f(2);'
+    interpreter = engine_class(Parser(code).parse_program())
+    interpreter.execute()
+    assert interpreter.environment['x'] == 1
+    assert interpreter.environment['r'] == 2
+    assert 'z' not in interpreter.environment
+    assert 'y' not in interpreter.environment
+
+def test_call_frame_links_to_caller_scope_without_copying():
+    from interpreter.scope import Scope
+    globals_ = Scope()
+    globals_['a'] = 1
+    frame = Scope(globals_)
+    frame['b'] = 2
+    assert frame.vars == {'b': 2}
+    assert frame['a'] == 1 and 'a' in frame
+    globals_['a'] = 3
+    assert frame['a'] == 3
+    assert frame.copy() == {'a': 3, 'b': 2}
+    with pytest.raises(KeyError):
+        frame['c']
+
+def test_non_local_names_skip_frames_that_cannot_hold_them(engine_class, capsys):
+    from interpreter.scope import Scope
+    globals_ = Scope()
+    globals_['g'] = 1
+    caller = Scope(globals_, {'a': 0})
+    callee = Scope(caller, {'a': 0})
+    # Recursão: o conjunto de nomes do pai é reaproveitado
+    assert callee.root is globals_ and callee.names is caller.names
+    callee['this'] = 'obj'
+    assert 'this' in callee.names and 'this' not in caller.names
+    assert callee['g'] == 1 and callee.get('h') is None
+    caller['a'] = 2
+    assert callee['a'] == 2
+
+    # O escopo continua dinâmico: a função chamada enxerga as locais de quem a chamou
+    code = '''
+    var base = 1;
+    function soma(n) { if (n <= 0) { return 0; } return base + soma(n - 1); }
+    function externa() { var base = 10; return soma(3); }
+    console.log(soma(50));
+    console.log(externa());
+    '''
+    engine_class(Parser(code).parse_program()).execute()
+    assert capsys.readouterr().out.split() == ['50', '30']
+
+def test_resolver_assigns_frame_slots_to_locals():
+    from interpreter.resolver import resolve
+    code = 'var g = 1; function f(a, b) { var c = a + b; c++; return c + g; }'
+    ast = Parser(code).parse_program()
+    layout = resolve(ast)
+    assert layout == {'g': 0, 'f': 1}
+    function = ast.statements[1]
+    assert function.frame == {'a': 0, 'b': 1, 'c': 2}
+    declaration = function.body.statements[0]
+    assert declaration.slot == 2
+    assert declaration.value.left.slot == 0
+    returned = function.body.statements[2].expression
+    assert returned.left.slot == 2
+    assert returned.right.slot is None
+
+def test_locals_live_in_frame_slots_and_fall_back_to_caller(engine_class):
+    code = '''
+    var x = 10;
+    function f() { var y = x; x = y + 1; return x; }
+    var r = f();
+    for (let i = 0; i < 3; i++) { r = r + i; }
+    '''
+    interpreter = engine_class(Parser(code).parse_program())
+    interpreter.execute()
+    # Dentro de f, x ainda não atribuída no quadro: a leitura vem do global
+    assert interpreter.environment['r'] == 14
+    assert interpreter.environment['x'] == 10
+    assert 'i' not in interpreter.environment
+    assert interpreter.environment.vars.keys() == {'Math'}
+
+def test_arena_ignores_resolver_annotations(engine_class):
+    from ast_nodes.arena import AstArena
+    from interpreter.resolver import resolve
+    ast = Parser('function f(a) { return a; }').parse_program()
+    resolve(ast)
+    restored = AstArena.from_ast(ast).to_ast()
+    assert restored.statements[0].params == ['a']
+    assert restored.statements[0].frame is None
+    engine_class(restored).execute()
+    assert restored.statements[0].frame == {'a': 0}
+
+def test_return_propagates_out_of_nested_blocks_and_loops(engine_class, capsys):
+    code = '''
+    function procura(lista, alvo) {
+        for (let i = 0; i < lista.length; i++) {
+            var j = 0;
+            while (j < 3) {
+                if (lista[i] == alvo) { return i * 10 + j; }
+                j++;
+            }
+        }
+        return -1;
+    }
+    function primeiro(lista) { for (let x of lista) { return x; } }
+    console.log(procura([4, 5, 6], 5));
+    console.log(procura([4], 9));
+    console.log(primeiro([7, 8]));
+    '''
+    run_js(code, engine_class)
+    assert capsys.readouterr().out.split() == ['10', '-1', '7']
+
+def test_return_is_signalled_without_exceptions(engine_class):
+    from interpreter.interpreter import RETURN
+    from ast_nodes.nodes import ReturnStatement, Literal
+    interpreter = engine_class(Parser("").parse_program())
+    assert interpreter.visit(ReturnStatement(Literal(3))) is RETURN
+    assert interpreter.return_value == 3
+
+def test_operators_keep_js_semantics(engine_class):
+    code = '''
+    var s = "n=" + 1;
+    var t = 2 + "x";
+    var inf = 1 / 0;
+    var minf = -1 / 0;
+    var nan = 0 / 0;
+    var resto = 5 % 0;
+    var nao = !0;
+    var naoTexto = !"a";
+    '''
+    interpreter = engine_class(Parser(code).parse_program())
+    interpreter.execute()
+    env = interpreter.environment
+    assert env['s'] == 'n=1' and env['t'] == '2x'
+    assert env['inf'] == float('inf') and env['minf'] == float('-inf')
+    assert env['nan'] != env['nan'] and env['resto'] != env['resto']
+    assert env['nao'] is True and env['naoTexto'] is False
+
+def test_relational_operators_with_null_are_false():
+    from interpreter.operators import js_less, js_greater_equal
+    assert js_less(None, 1) is False
+    assert js_greater_equal(1, None) is False
+
+def test_operator_is_resolved_once_per_node():
+    # O cache no nó é do visitante; os outros motores escolhem na compilação
+    from interpreter.interpreter import Interpreter as AstInterpreter
+    from interpreter.operators import js_add, js_not
+    ast = Parser('var x = 0; for (let i = 0; i < 3; i++) { x = x + i; } var y = !x; var z = x && y || 4;').parse_program()
+    interpreter = AstInterpreter(ast)
+    interpreter.execute()
+    addition = ast.statements[1].body.statements[0].value
+    assert addition.apply is js_add
+    assert ast.statements[2].value.apply is js_not
+    # '&&' e '||' seguem pelo ramo de curto-circuito, sem função no nó
+    logical = ast.statements[3].value
+    assert logical.apply is None and logical.left.apply is None
+    assert interpreter.environment['z'] == 4
+    assert interpreter.environment['x'] == 3
+
+def test_unknown_operator_raises(engine_class):
+    from ast_nodes.nodes import BinaryOp, UnaryOp, Literal
+    interpreter = engine_class(Parser("").parse_program())
+    with pytest.raises(Exception, match="Operador desconhecido"):
+        interpreter.visit(BinaryOp(Literal(1), '**', Literal(2)))
+    with pytest.raises(ValueError):
+        interpreter.visit(UnaryOp('~', Literal(1)))
+
+def test_logical_operators_short_circuit(engine_class):
+    code = '''
+    var chamadas = [0];
+    function conta(valor) {
+        chamadas[0] = chamadas[0] + 1;
+        return valor;
+    }
+    var a = false && conta(true);
+    var b = true || conta(true);
+    var c = true && conta(1);
+    var d = 0 || conta("x");
+    var e = conta(0) && conta(2);
+    '''
+    interpreter = engine_class(Parser(code).parse_program())
+    interpreter.execute()
+    env = interpreter.environment
+    assert env['chamadas'] == [3]
+    assert env['a'] is False and env['b'] is True
+    assert env['c'] == 1 and env['d'] == 'x' and env['e'] == 0
+
+def test_short_circuit_guards_out_of_bounds_access(engine_class, capsys):
+    code = '''
+    var itens = [3, 0, 5];
+    var positivos = 0;
+    for (let i = 0; i < 5; i++) {
+        if (i < itens.length && itens[i] > 0) {
+            positivos++;
+        }
+    }
+    console.log(positivos);
+    '''
+    engine_class(Parser(code).parse_program()).execute()
+    assert capsys.readouterr().out == "2\n"
@@ -0,0 +1,173 @@
+import glob
+import os
+
+import pytest
+from ast_nodes.nodes import BinaryOp, Identifier, Literal
+from optimizer.constant_folding import fold_constants
+from optimizer.optimizer import optimize
+from parser.parser import Parser
+from pipeline.pipeline import Pipeline, ENGINES
+from translator.transpiler import Transpiler
+
+EXAMPLES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), '..', 'examples', '*.js')))
+
+
+def folded_value(expression):
+    ast = fold_constants(Parser(f"var x = {expression};").parse_program())
+    return ast.statements[0].value
+
+
+def test_folds_literal_arithmetic_and_strings():
+    assert folded_value("2 * 3 + 4").value == 10
+    assert folded_value("7 / 2").value == 3.5
+    assert folded_value('"a" + "b" + 1').value == 'ab1'
+    assert folded_value("-(2 + 3)").value == -5
+    assert folded_value("3 > 2 && 1 < 0").value is False
+    assert folded_value("!0").value is True
+
+def test_keeps_operations_with_runtime_behavior():
+    # Divisão por zero, erros de tipo e '*' entre strings ficam para a execução
+    for expression in ["1 / 0", "0 / 0", "5 % 0", '"a" < 1', '"ab" * 2', '-"a"']:
+        assert not isinstance(folded_value(expression), Literal), expression
+
+def test_does_not_reassociate_subtraction():
+    # x - a - b != x - (a + b) em ponto flutuante
+    value = folded_value("n - 672 - -745")
+    assert value.op == '-' and value.right.value == -745
+    assert value.left.op == '-' and isinstance(value.left.left, Identifier)
+
+@pytest.mark.parametrize('optimized', [False, True])
+@pytest.mark.parametrize('engine', sorted(ENGINES))
+def test_empty_blocks_from_source_compile_and_run(engine, optimized, capsys):
+    # `if (x) {}` já gera um bloco vazio sem passar pela eliminação de código morto
+    code = 'var x = 1; if (x) {} if (x) {} else { console.log("nao"); } function f() {} f(); console.log("ok");'
+    Pipeline(code, engine=engine, optimize=optimized).interpret()
+    assert capsys.readouterr().out == "ok\n"
+    exec(compile(Pipeline(code, optimize=optimized).transpile(), '<transpilado>', 'exec'), {})
+    assert capsys.readouterr().out == "ok\n"
+
+@pytest.mark.parametrize('engine', sorted(ENGINES))
+def test_optimized_float_arithmetic_matches_unoptimized(engine, capsys):
+    code = "var x = -524144.6395076819; var y = x - 672 - -745; console.log(y); console.log(x - 0.1 - 0.2);"
+    Pipeline(code, engine=engine).interpret()
+    expected = capsys.readouterr().out
+    assert expected.splitlines()[0] == '-524071.63950768183'
+    Pipeline(code, engine=engine, optimize=True).interpret()
+    assert capsys.readouterr().out == expected
+
+def test_removes_no_op_arithmetic_only_on_numbers():
+    assert isinstance(folded_value("(n - 1) * 1"), BinaryOp)
+    assert folded_value("(n - 1) * 1").op == '-'
+    assert folded_value("(n / 2) - 0").op == '/'
+    # n pode ser string ou lista: n * 1 e n + 0 não são no-ops garantidos
+    assert folded_value("n * 1").op == '*'
+    assert folded_value("(n - 1) + 0").op == '+'
+
+def test_constant_left_side_selects_logical_operand():
+    assert isinstance(folded_value("true && n"), Identifier)
+    assert folded_value("0 && n").value == 0
+    assert isinstance(folded_value("false || n"), Identifier)
+    assert folded_value('"s" || n').value == 's'
+
+def test_transpiler_consumes_folded_tree():
+    python_code = Transpiler(optimize(Parser('var a = n - (1 + 1); var s = "a" + "b";').parse_program())).transpile()
+    assert python_code.splitlines() == ["a = n - 2", "s = 'ab'"]
+
+@pytest.mark.parametrize('engine', sorted(ENGINES))
+def test_optimized_examples_behave_the_same(engine, capsys):
+    compared = 0
+    for path in EXAMPLES:
+        with open(path, encoding='utf-8') as f:
+            code = f.read() + '\nconsole.log(10 - 2 - 3);\nconsole.log("x" + 1 * 2);\nconsole.log(7 / 2);\n'
+
+        try:
+            Pipeline(code, engine=engine).interpret()
+            expected = capsys.readouterr().out
+        except Exception:
+            capsys.readouterr()
+            continue
+        Pipeline(code, engine=engine, optimize=True).interpret()
+        assert capsys.readouterr().out == expected, path
+        compared += 1
+    assert compared > 0
+
+def test_pipeline_records_optimize_stage():
+    pipeline = Pipeline("var x = 1 + 2; console.log(x);", optimize=True)
+    assert pipeline.ast.statements[0].value.value == 3
+    assert 'optimize' in pipeline.timings
+
+
+DEAD_CODE = '''
+// topo
+function f(x) {
+    if (x > 0) {
+        return 1;
+        console.log("morto");
+    }
+    if (1 > 2) {
+        console.log("nunca");
+    } else {
+        console.log("sempre"); // inline
+    }
+    for (let i = 0; i < 1000; i++) {}
+    while (false) { console.log("nunca"); }
+    return 2;
+    var y = 3;
+}
+console.log(f(1));
+console.log(f(0));
+'''
+
+
+def optimized(code):
+    return optimize(Parser(code).parse_program())
+
+
+def test_removes_statements_after_return_and_dead_branches():
+    function = optimized(DEAD_CODE).statements[1]
+    kinds = [type(statement).__name__ for statement in function.body.statements]
+    assert kinds == ['IfStatement', 'InlineComment', 'ReturnStatement']
+    assert len(function.body.statements[0].then_block.statements) == 1
+
+def test_keeps_loops_that_may_not_terminate_or_have_effects():
+    kept = [
+        "while (x) {}",
+        "for (let i = 0; i >= 0; i++) {}",
+        "for (let i = 0; i < n; i++) {}",
+        "for (var i = 0; i < 3; i++) {}",
+        "for (let i = 0; i < 3; i++) { console.log(i); }",
+    ]
+    for code in kept:
+        assert len(optimized(code).statements) == 1, code
+    assert optimized("for (let i = 10; i > 0; i--) {}").statements == []
+    assert optimized("for (let i = 0; 1 > 2; i++) { console.log(i); }").statements == []
+
+def test_dead_code_output_is_unchanged(capsys):
+    for engine in sorted(ENGINES):
+        Pipeline(DEAD_CODE, engine=engine).interpret()
+        expected = capsys.readouterr().out
+        Pipeline(DEAD_CODE, engine=engine, optimize=True).interpret()
+        assert capsys.readouterr().out == expected == "1\nsempre\n2\n"
+
+def test_transpiled_dead_code_stays_valid_python(capsys):
+    python_code = Pipeline(DEAD_CODE, optimize=True).transpile()
+    assert 'morto' not in python_code and 'nunca' not in python_code
+    assert '# topo' in python_code
+    exec(compile(python_code, '<transpilado>', 'exec'), {})
+    assert capsys.readouterr().out == "1\nsempre\n2\n"
+
+def test_empty_block_transpiles_to_pass():
+    python_code = Pipeline("if (x) { if (false) { y = 1; } }", optimize=True).transpile()
+    assert python_code.splitlines() == ["if x:", "    pass"]
+
+def test_strip_comments_shares_tree_without_mutating_it():
+    from ast_nodes.nodes import Comment, InlineComment
+    from optimizer.dead_code import strip_comments
+    ast = Parser(DEAD_CODE).parse_program()
+    stripped = strip_comments(ast)
+    assert isinstance(ast.statements[0], Comment)
+    assert not any(isinstance(statement, Comment) for statement in stripped.statements)
+    function = stripped.statements[0]
+    assert not any(isinstance(statement, InlineComment) for statement in function.body.statements[1].else_block.statements)
+    # Sem comentários no caminho, o nó original é reaproveitado
+    assert stripped.statements[1] is ast.statements[2]
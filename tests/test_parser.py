@@ -83,3 +83,46 @@ def test_parse_array_assignment_invalid():
     code = "arr[0] = ;"
     with pytest.raises(SyntaxError):
         Parser(code).parse_program()
+
+def test_parser_consumes_tokens_lazily():
+    code = "var x = 1;\n" * 500
+    parser = Parser(code)
+    assert parser.tokens == []
+    ast = parser.parse_program()
+    assert len(ast.statements) == 500
+    # Apenas a janela do último statement permanece no buffer
+    assert len(parser.tokens) <= 5
+
+def test_parser_backtracking_keeps_marked_tokens():
+    code = "for (let i = 0; i < 3; i++) { var y = i; var z = y; }\nobj.count++;"
+    ast = Parser(code).parse_program()
+    assert ast.statements[0].__class__.__name__ == "ForStatement"
+    assert ast.statements[1].__class__.__name__ == "UpdateExpression"
+
+def test_parser_propagates_lexer_error():
+    from errors.exceptions import LexerError
+    with pytest.raises(LexerError):
+        Parser("var a = 1;\nfor (let i = 0; i < @; i++) { }").parse_program()
+
+def test_parser_error_reports_source_location():
+    with pytest.raises(ParserError) as exc:
+        Parser("var a = 1;\nvar b = 2\nvar c = 3;").parse_program()
+    assert "Linha 3, coluna 1" in str(exc.value)
+
+def test_statements_record_source_offset():
+    code = "var a = 1;\nif (a > 0) {\n  a = 2;\n}"
+    ast = Parser(code).parse_program()
+    assert ast.statements[0].position == 0
+    assert ast.statements[1].position == code.index("if")
+    assert ast.statements[1].then_block.statements[0].position == code.index("a = 2")
+
+def test_ast_nodes_are_slotted():
+    import ast_nodes.nodes as nodes_module
+    ast = parse_code("function f(a) { return a + 1; } var x = f(2);")
+    node_classes = [cls for cls in vars(nodes_module).values()
+                    if isinstance(cls, type) and issubclass(cls, Node)]
+    assert len(node_classes) > 25
+    for cls in node_classes:
+        assert '__slots__' in cls.__dict__, cls.__name__
+    assert not hasattr(ast.statements[0], '__dict__')
+    assert not hasattr(ast.statements[0].body.statements[0].expression, '__dict__')
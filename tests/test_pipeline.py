@@ -0,0 +1,39 @@
+import pytest
+from pipeline.pipeline import Pipeline
+from parser.ast_cache import AstCache
+from errors.exceptions import ParserError
+
+CODE = "var total = 0; for (let i = 0; i < 4; i++) { total += i; } console.log(total);"
+
+def test_pipeline_parses_once_for_both_stages(monkeypatch, capsys):
+    import pipeline.pipeline as pipeline_module
+    calls = []
+    original = pipeline_module.Parser
+
+    class CountingParser(original):
+        def parse_program(self):
+            calls.append(1)
+            return super().parse_program()
+
+    monkeypatch.setattr(pipeline_module, 'Parser', CountingParser)
+    pipeline = Pipeline(CODE)
+    python_code = pipeline.transpile()
+    pipeline.interpret()
+
+    assert len(calls) == 1
+    assert 'total = 0' in python_code
+    assert capsys.readouterr().out.strip() == '6'
+    assert set(pipeline.timings) == {'parse', 'transpile', 'interpret'}
+    assert all(seconds >= 0 for seconds in pipeline.timings.values())
+
+def test_pipeline_uses_ast_cache(tmp_path):
+    cache = AstCache(str(tmp_path))
+    Pipeline(CODE, cache).parse()
+    pipeline = Pipeline(CODE, cache)
+    pipeline.parse()
+    assert pipeline.from_cache
+    assert 'parse (cache)' in pipeline.format_timings()
+
+def test_pipeline_propagates_parse_errors():
+    with pytest.raises(ParserError):
+        Pipeline("var x").transpile()
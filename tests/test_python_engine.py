@@ -0,0 +1,199 @@
+import glob
+import os
+
+import pytest
+from parser.parser import Parser
+from parser.ast_cache import AstCache
+from pipeline.pipeline import Pipeline
+from interpreter.python_engine import PythonInterpreter, CodeCache, compile_program
+from translator.runtime_transpiler import RuntimeTranspiler
+
+EXAMPLES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), '..', 'examples', '*.js')))
+
+CODE = "function dobro(n) { return n * 2; } console.log(dobro(21));"
+
+def run_js(code):
+    interpreter = PythonInterpreter(Parser(code).parse_program())
+    interpreter.execute()
+    return interpreter
+
+def test_examples_match_ast_engine(capsys):
+    compared = 0
+    for path in EXAMPLES:
+        with open(path, encoding='utf-8') as f:
+            code = f.read()
+        try:
+            Pipeline(code).interpret()
+            expected = capsys.readouterr().out
+        except Exception:
+            capsys.readouterr()
+            continue
+        Pipeline(code, engine='python').interpret()
+        assert capsys.readouterr().out == expected, path
+        compared += 1
+    assert compared > 0
+
+def test_js_semantics_through_runtime(capsys):
+    code = '''
+    let arr = [1, 2, 3];
+    let obj = {nome: "Ana"};
+    let s = "abc";
+    let pi = 3.14159;
+    let vazio;
+    console.log("n" + 1 + 2);
+    console.log(1 / 0);
+    console.log(5 % 0);
+    console.log(arr[10]);
+    console.log(obj.idade);
+    console.log(vazio < 1);
+    console.log(!0);
+    console.log(arr.push(4));
+    console.log(arr.length);
+    console.log(s.charAt(1) + s.toUpperCase());
+    console.log(Math.floor(7 / 2));
+    console.log(pi.toFixed(2));
+    '''
+    run_js(code)
+    output = capsys.readouterr().out
+    assert output.splitlines() == [
+        'n12', 'inf', 'nan', 'None', 'None', 'False', 'True', '4', '4', 'bABC', '3', '3.14',
+    ]
+    Pipeline(code).interpret()
+    assert capsys.readouterr().out == output
+
+def test_functions_take_missing_and_extra_arguments(capsys):
+    run_js('''
+    function par(a, b) { return b; }
+    console.log(par(1));
+    console.log(par(1, 2, 3));
+    ''')
+    assert capsys.readouterr().out.splitlines() == ['None', '2']
+
+def test_python_keywords_and_self_are_renamed(capsys):
+    run_js('''
+    let pass = 1;
+    let self = 2;
+    function lambda(def) { return def + pass + self; }
+    console.log(lambda(3));
+    ''')
+    assert capsys.readouterr().out.strip() == '6'
+
+def test_constructors_classes_and_for_in(capsys):
+    run_js('''
+    function Conta(titular) {
+        this.titular = titular;
+        this.saldo = 0;
+    }
+    let conta = new Conta("Ana");
+    conta.saldo += 10;
+    conta.saldo++;
+    for (let chave in conta) {
+        console.log(chave);
+    }
+    class Ponto {
+        constructor(x) { this.x = x; }
+        dobro() { return this.x * 2; }
+    }
+    let p = new Ponto(4);
+    console.log(p.dobro());
+    console.log(p);
+    console.log(conta.saldo);
+    ''')
+    assert capsys.readouterr().out.splitlines() == ['titular', 'saldo', '8', '[object Ponto]', '11']
+
+def test_assignments_to_undeclared_names_change_outer_variables(capsys):
+    code = '''
+    var count = 0;
+    function inc() { count = count + 1; }
+    function contador() {
+        let total = 0;
+        function soma(n) { total += n; let local = n; local++; }
+        soma(2);
+        soma(3);
+        return total;
+    }
+    inc();
+    inc();
+    console.log(count);
+    console.log(contador());
+    '''
+    run_js(code)
+    assert capsys.readouterr().out.splitlines() == ['2', '5']
+    source = RuntimeTranspiler(Parser(code).parse_program()).transpile()
+    lines = source.splitlines()
+    assert "    global count" in lines
+    # `local` é declarada com let: continua local a soma
+    assert "        nonlocal total" in lines
+
+@pytest.mark.parametrize('code, expected', [
+    # Uma função troca o tipo da global: o '+' não pode ser o do Python
+    ('var s = 1; function f() { s = "a"; return 0; } f(); console.log(s + 1);', ['a1']),
+    # O limite deixa de ser inteiro: range() não aceitaria 2.5
+    ('var n = 5; function f() { n = 2.5; } f(); for (let i = 0; i < n; i++) { console.log(i); }',
+     ['0', '1', '2']),
+    # O corpo chama uma função que muda o limite: range(n) rodaria 5 vezes
+    ('var n = 5; function dec() { n = n - 1; } for (let i = 0; i < n; i++) { dec(); console.log(i); }',
+     ['0', '1', '2']),
+])
+def test_names_assigned_by_functions_are_not_typed_or_counted(code, expected, capsys):
+    run_js(code)
+    assert capsys.readouterr().out.splitlines() == expected
+    source = RuntimeTranspiler(Parser(code).parse_program()).transpile()
+    assert "range(" not in source and "(s + 1)" not in source
+
+def test_return_outside_function_ends_program(capsys):
+    run_js('console.log(1); if (true) { return 0; } console.log(2);')
+    assert capsys.readouterr().out.strip() == '1'
+
+def test_generated_code_calls_runtime_helpers():
+    source = RuntimeTranspiler(Parser('let x = a + b / c; console.log(x.length);').parse_program()).transpile()
+    assert source.splitlines() == [
+        "x = _js_add(a, _js_divide(b, c))",
+        "_js_log(_js_get_property(x, 'length'))",
+    ]
+
+def test_typed_operands_use_python_operators():
+    code = 'let i = 0; let s = "a"; let x = i + 1; let y = s + "b"; let z = s + i; let m = i < x;'
+    source = RuntimeTranspiler(Parser(code).parse_program()).transpile()
+    assert source.splitlines()[2:] == [
+        "x = (i + 1)",
+        "y = (s + 'b')",
+        "z = _js_add(s, i)",
+        "m = (i < x)",
+    ]
+
+def test_code_object_is_cached_by_source(tmp_path, monkeypatch, capsys):
+    import pipeline.pipeline as pipeline_module
+    cache = AstCache(str(tmp_path))
+    Pipeline(CODE, cache, engine='python').interpret()
+    assert capsys.readouterr().out.strip() == '42'
+    assert os.path.exists(CodeCache(str(tmp_path)).path_for(CODE))
+
+    def no_parse(self, code):
+        raise AssertionError("o código em cache não deveria ser analisado")
+    monkeypatch.setattr(pipeline_module.Pipeline, '_parse', no_parse)
+    pipeline = Pipeline(CODE, cache, engine='python')
+    pipeline.interpret()
+    assert capsys.readouterr().out.strip() == '42'
+    assert pipeline.code_from_cache
+    assert 'compile (cache)' in pipeline.format_timings()
+    assert 'parse' not in pipeline.timings
+
+def test_code_cache_key_depends_on_optimize_and_keeps_ast_entries_apart(tmp_path):
+    ast_cache = AstCache(str(tmp_path))
+    code_cache = CodeCache(str(tmp_path))
+    assert code_cache.key(CODE) != ast_cache.key(CODE)
+    assert CodeCache(str(tmp_path), optimize=True).key(CODE) != code_cache.key(CODE)
+
+    ast = Parser(CODE).parse_program()
+    ast_cache.put(CODE, ast)
+    code_cache.put(CODE, compile_program(ast))
+    assert len(ast_cache.entries()) == len(code_cache.entries()) == 1
+    assert code_cache.get(CODE).co_filename == '<js>'
+
+def test_pipeline_python_engine_without_cache(capsys):
+    pipeline = Pipeline(CODE, engine='python')
+    pipeline.interpret()
+    assert capsys.readouterr().out.strip() == '42'
+    assert set(pipeline.timings) == {'parse', 'compile', 'interpret'}
+    assert not pipeline.code_from_cache
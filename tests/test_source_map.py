@@ -0,0 +1,104 @@
+import cProfile
+import glob
+import io
+import os
+
+from pipeline.pipeline import Pipeline
+from parser.ast_cache import AstCache
+from translator.source_map import SourceMap, map_path
+
+EXAMPLES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), '..', 'examples', '*.js')))
+
+CODE = '''function fib(n) {
+    if (n <= 1) {
+        return n;
+    }
+    return fib(n - 1) + fib(n - 2);
+}
+function quebra(x) {
+    let y = x * 2;
+    return y.nome.valor;
+}
+console.log(fib(10));
+console.log(quebra(1));
+'''
+
+def transpile_mapped(code, file='saida.py'):
+    pipeline = Pipeline(code)
+    source_map = pipeline.source_map('programa.js', file)
+    return pipeline.transpile(source_map), source_map
+
+def test_generated_lines_map_to_js_statements():
+    # soma nunca é chamada: os tipos de a e b não são conhecidos e o '+' usa js_add
+    python_code, source_map = transpile_mapped(CODE + "function soma(a, b) { return a + b; }\n")
+    lines = python_code.splitlines()
+    assert len(source_map.mappings) == len(lines)
+    positions = {line: source_map.lookup(number) for number, line in enumerate(lines, 1)}
+    assert positions["def fib(n):"] == (1, 1)
+    assert positions["    if (n <= 1):"] == (2, 5)
+    assert positions["        return n"] == (3, 9)
+    assert positions["    y = x * 2"] == (8, 5)
+    assert positions["print(fib(10))"] == (11, 1)
+    # O helper js_add não vem do JS
+    assert positions["def js_add(a, b):"] is None
+    assert source_map.lookup(0) is None and source_map.lookup(len(lines) + 1) is None
+
+def test_transpile_to_builds_the_same_map_on_examples():
+    compared = 0
+    for path in EXAMPLES:
+        with open(path, encoding='utf-8') as f:
+            code = f.read()
+        try:
+            expected_code, expected = transpile_mapped(code)
+        except Exception:
+            continue
+        pipeline = Pipeline(code)
+        source_map = pipeline.source_map('programa.js', 'saida.py')
+        sink = io.StringIO()
+        pipeline.transpile_to(sink, source_map)
+        assert sink.getvalue() == expected_code, path
+        assert source_map.mappings == expected.mappings, path
+        assert len(source_map.mappings) == len(expected_code.split('\n')), path
+        compared += 1
+    assert compared > 0
+
+def test_map_survives_ast_cache_and_json(tmp_path):
+    cache = AstCache(str(tmp_path))
+    Pipeline(CODE, cache).parse()
+    pipeline = Pipeline(CODE, cache)
+    source_map = pipeline.source_map('programa.js', 'saida.py')
+    pipeline.transpile(source_map)
+    assert pipeline.from_cache
+    assert source_map.mappings == transpile_mapped(CODE)[1].mappings
+
+    path = map_path(str(tmp_path / 'saida.py'))
+    source_map.save(path)
+    loaded = SourceMap.load(path)
+    assert (loaded.source, loaded.file) == ('programa.js', 'saida.py')
+    assert loaded.mappings == source_map.mappings
+
+def test_traceback_is_rewritten_to_js_lines(capsys):
+    python_code, source_map = transpile_mapped(CODE)
+    try:
+        exec(compile(python_code, '/tmp/build/saida.py', 'exec'), {})
+    except AttributeError as e:
+        report = source_map.format_exception(e)
+    else:
+        raise AssertionError("o código gerado deveria falhar em quebra()")
+    assert capsys.readouterr().out.strip() == '55'
+    assert 'File "programa.js", line 9, column 5, in quebra' in report
+    assert 'File "programa.js", line 12, column 1, in <module>' in report
+    assert 'File "/tmp/build/saida.py"' not in report
+
+def test_profile_report_is_rewritten_to_js_lines():
+    # `g = fib` deixa os tipos de fib desconhecidos: a soma passa por js_add
+    python_code, source_map = transpile_mapped(
+        "function fib(n) {\n  if (n <= 1) { return n; }\n  return fib(n - 1) + fib(n - 2);\n}\nlet r = fib(12);\nlet g = fib;")
+    profile = cProfile.Profile()
+    names = {}
+    profile.runctx(compile(python_code, 'saida.py', 'exec'), names, names)
+    report = source_map.format_stats(profile)
+    assert 'programa.js:1:1(fib)' in report
+    # Linhas sem origem no JS (o helper js_add) e outros arquivos ficam como estão
+    assert 'saida.py:1(js_add)' in report
+    assert source_map.rewrite('File "outro.py", line 3') == 'File "outro.py", line 3'
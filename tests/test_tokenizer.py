@@ -1,5 +1,5 @@
 import pytest
-from lexer.tokenizer import tokenize
+from lexer.tokenizer import tokenize, TOKEN_SPEC, KEYWORDS
 from errors.exceptions import LexerError
 
 def test_tokenize_basic():
@@ -45,3 +45,73 @@ def test_tokenize_operators_and_symbols():
     assert "OP_DECREMENT" in tokens
     assert "ARROW" in tokens
     assert "DOT" in tokens
+
+def _sequential_tokenize(code):
+    """Referência: tenta cada padrão de TOKEN_SPEC em ordem, como o laço original"""
+    import re
+    result = []
+    pos = 0
+    while pos < len(code):
+        for name, regex in TOKEN_SPEC:
+            match = re.compile(regex).match(code, pos)
+            if match:
+                if name == 'IDENTIFIER':
+                    name = KEYWORDS.get(match.group(0), name)
+                if name != 'WHITESPACE':
+                    result.append((name, match.group(0)))
+                pos = match.end(0)
+                break
+    return result
+
+def test_master_pattern_matches_sequential_spec():
+    import glob
+    import os
+    examples = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'examples')
+    for path in sorted(glob.glob(os.path.join(examples, '*.js'))):
+        code = open(path, encoding='utf-8').read()
+        if '@' in code:
+            continue
+        tokens = [(t.type, t.value) for t in tokenize(code)]
+        assert tokens == _sequential_tokenize(code), path
+
+def test_keywords_require_word_boundaries():
+    tokens = [(t.type, t.value) for t in tokenize("var logger = consoleOutput; console.log(logger);")]
+    assert ('IDENTIFIER', 'logger') in tokens
+    assert ('IDENTIFIER', 'consoleOutput') in tokens
+    assert ('CONSOLE', 'console') in tokens
+    assert ('LOG', 'log') in tokens
+
+def test_keyword_prefix_is_identifier():
+    types = [t.type for t in tokenize("newValue thisOne format iffy")]
+    assert types == ['IDENTIFIER'] * 4
+
+def test_tokens_carry_source_positions():
+    code = 'var a = 1;\nlet s = "x";\n/* bloco\n */ a'
+    tokens = tokenize(code)
+    var, s_token, last = tokens[0], tokens[6], tokens[-1]
+    assert (var.start, var.end, var.line, var.column) == (0, 3, 1, 1)
+    assert (s_token.value, s_token.line, s_token.column) == ('s', 2, 5)
+    assert (last.value, last.line, last.column) == ('a', 4, 5)
+    assert code[last.start:last.end] == 'a'
+
+def test_token_is_slotted_and_type_is_interned():
+    from lexer.tokenizer import TOKEN_TYPES
+    token = tokenize('x')[0]
+    assert not hasattr(token, '__dict__')
+    assert token.type is TOKEN_TYPES[token.type_id]
+
+def test_line_index_maps_offsets_to_line_and_column():
+    from lexer.line_index import LineIndex
+    code = "abc\nde\n\nfghi"
+    index = LineIndex(code)
+    assert index.line_col(0) == (1, 1)
+    assert index.line_col(5) == (2, 2)
+    assert index.line_col(7) == (3, 1)
+    assert index.line_col(10) == (4, 3)
+    assert index.line_text(4) == "fghi"
+    assert index.context(5) == "Linha 2, coluna 2\nde\n ^"
+
+def test_lexer_error_reports_line_and_column():
+    with pytest.raises(LexerError) as exc:
+        tokenize("var x = 1;\nvar y = 2 @ 3;")
+    assert "Linha 2, coluna 11" in str(exc.value)
@@ -1,7 +1,13 @@
+import glob
+import io
+import os
+
 import pytest
 from parser.parser import Parser
 from translator.transpiler import Transpiler
-from errors.exceptions import TranspilerError
+from errors.exceptions import LexerError, ParserError, TranspilerError
+
+EXAMPLES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), '..', 'examples', '*.js')))
 
 def transpile_js(js_code):
     parser = Parser(js_code)
@@ -132,3 +138,241 @@ def test_transpile_class_with_methods():
     assert "def __init__(self, name)" in py_code
     assert "def drive(self)" in py_code
     assert "def stop(self)" in py_code
+
+def test_transpiler_dispatch_falls_back_to_generic_visit():
+    class FakeNode: pass
+    transpiler = Transpiler(None)
+    for _ in range(2):
+        with pytest.raises(TranspilerError):
+            transpiler.visit(FakeNode())
+    assert transpiler._dispatch[FakeNode] == transpiler.generic_visit
+
+def test_counted_for_lowers_to_range():
+    py_code = transpile_js('function f(arr) { var n = arr.length; for (let i = 0; i < n - 1; i++) { console.log(arr[i]); } }')
+    assert 'for i in range(n - 1):' in py_code
+    assert 'while' not in py_code
+
+def test_counted_for_bounds_and_steps():
+    assert 'for i in range(1, 11):' in transpile_js('for (let i = 1; i <= 10; i++) { console.log(i); }')
+    assert 'for i in range(10, 0, -1):' in transpile_js('for (let i = 10; i > 0; i--) { console.log(i); }')
+    assert 'for i in range(0, 9, 2):' in transpile_js('for (let i = 0; i < 9; i += 2) { console.log(i); }')
+    assert 'for j in range(i + 1, 5):' in transpile_js(
+        'for (let i = 0; i < 5; i++) { for (let j = i + 1; j < 5; j++) { console.log(j); } }')
+
+def test_for_keeps_while_when_range_would_change_behavior():
+    kept = [
+        # variável reatribuída no corpo
+        'for (let i = 0; i < 10; i++) { i = i + 2; }',
+        # var continua visível depois do laço
+        'for (var i = 0; i < 10; i++) { console.log(i); }',
+        # limite reatribuído no corpo
+        'var n = 10; for (let i = 0; i < n; i++) { n = n - 1; }',
+        # tamanho do array alterado no corpo
+        'var a = [1]; for (let i = 0; i < a.length; i++) { a.push(i); }',
+        # limite possivelmente não inteiro
+        'function f(n) { for (let i = 0; i < n; i++) { console.log(i); } }',
+        'var m = 2.5; for (let i = 0; i < m; i++) { console.log(i); }',
+        # passo no sentido contrário
+        'for (let i = 0; i < 10; i--) { console.log(i); }',
+        # o programa tem uma variável chamada range
+        'var range = 3; for (let i = 0; i < 2; i++) { console.log(i); }',
+        'function f(range) { return range; } for (let i = 0; i < 2; i++) { console.log(i); }',
+        # o escopo já tem uma variável com o nome da do laço
+        'var i = 100; for (let i = 0; i < 2; i++) { console.log(i); }',
+        'function f(i) { for (let i = 0; i < 2; i++) { console.log(i); } return i; }',
+    ]
+    for code in kept:
+        assert 'range(' not in transpile_js(code), code
+    # Laços em sequência com a mesma variável continuam contados
+    assert transpile_js('for (let i = 0; i < 2; i++) { console.log(i); } '
+                        'for (let i = 0; i < 3; i++) { console.log(i); }').count('range(') == 2
+
+@pytest.mark.parametrize('code, expected', [
+    ('var range = 3; for (let i = 0; i < range; i++) { console.log(i); }', ['0', '1', '2']),
+    # O let do laço não esconde o i de fora no Python: ele termina com o
+    # valor do while (b), e não com b - 1 como no range()
+    ('var i = 100; for (let i = 0; i < 2; i++) { } console.log(i);', ['2']),
+])
+def test_names_clashing_with_range_lowering_run_as_while(code, expected, capsys):
+    from interpreter.python_engine import PythonInterpreter
+    exec(compile(transpile_js(code), '<transpilado>', 'exec'), {})
+    assert capsys.readouterr().out.split() == expected
+    PythonInterpreter(Parser(code).parse_program()).execute()
+    assert capsys.readouterr().out.split() == expected
+
+def test_counted_for_output_matches_while(capsys):
+    code = '''
+    var soma = 0;
+    var itens = [4, 8, 15, 16, 23, 42];
+    for (let i = 0; i < itens.length; i++) {
+        for (let j = i; j >= 1; j -= 2) {
+            soma = soma + itens[j] * i;
+        }
+    }
+    console.log(soma);
+    '''
+    py_code = transpile_js(code)
+    assert py_code.count('range(') == 2
+    exec(compile(py_code, '<transpilado>', 'exec'), {})
+    from interpreter.interpreter import Interpreter
+    Interpreter(Parser(code).parse_program()).execute()
+    out = capsys.readouterr().out.split()
+    assert out[0] == out[1]
+
+def test_nested_blocks_are_indented_once_per_level():
+    code = '''
+    function f(x) {
+        if (x > 0) {
+            /* dois
+               níveis */
+            while (x < 3) {
+                x = x + 1; // soma
+            }
+        } else {
+            console.log("x");
+        }
+    }
+    '''
+    assert transpile_js(code).splitlines() == [
+        "def js_add(a, b):",
+        "    if isinstance(a, str) or isinstance(b, str):",
+        "        return str(a) + str(b)",
+        "    return a + b",
+        "",
+        "def f(x):",
+        "    if (x > 0):",
+        "        # ----------------------------------------",
+        "        # dois",
+        "        # níveis",
+        "        # ----------------------------------------",
+        "        while (x < 3):",
+        "            x = js_add(x, 1)  # soma",
+        "    else:",
+        "        print('x')",
+    ]
+
+def test_plus_uses_inferred_types():
+    code = '''
+    let a = 1;
+    let b = 2.5;
+    let c = a + b + a;
+    let s = "c=" + c;
+    let t = s + "!" + s.length;
+    let n = 0;
+    while (n < 3) { n = n + 1; }
+    '''
+    assert transpile_js(code).splitlines() == [
+        "a = 1",
+        "b = 2.5",
+        "c = a + b + a",
+        "s = 'c=' + str(c)",
+        "t = s + '!' + str(len(s))",
+        "n = 0",
+        "while (n < 3):",
+        "    n = n + 1",
+    ]
+
+def test_plus_uses_parameter_and_return_types_of_called_functions(capsys):
+    code = '''
+    function fib(n) {
+        if (n <= 1) {
+            return n;
+        }
+        return fib(n - 1) + fib(n - 2);
+    }
+    function rotulo(nome) { return "item " + nome; }
+    let total = fib(10) + fib(5);
+    console.log(rotulo("a") + total);
+    console.log((total + 1) * 2 - -(total - 3));
+    '''
+    py_code = transpile_js(code)
+    assert 'js_add' not in py_code
+    assert '    return fib(n - 1) + fib(n - 2)' in py_code
+    assert "    return 'item ' + nome" in py_code
+    assert 'total = fib(10) + fib(5)' in py_code
+    assert "print(rotulo('a') + str(total))" in py_code
+    assert 'print((total + 1) * 2 - -(total - 3))' in py_code
+    exec(compile(py_code, '<transpilado>', 'exec'), {})
+    assert capsys.readouterr().out.splitlines() == ['item a60', '179']
+
+def test_functions_without_known_types_keep_js_add():
+    kept = [
+        # nunca chamada: parâmetros desconhecidos
+        'function soma(a, b) { return a + b; }',
+        # chamadas com tipos diferentes
+        'function soma(a, b) { return a + b; } soma(1, 2); soma("a", 2);',
+        # argumento faltando (undefined)
+        'function soma(a, b) { return a + b; } soma(1);',
+        # a função é usada como valor: pode ser chamada de outro jeito
+        'function soma(a, b) { return a + b; } soma(1, 2); let f = soma;',
+        # pode terminar sem return (undefined)
+        'function f(x) { if (x > 0) { return 1; } } let y = f(1) + 1;',
+        # o nome é reatribuído
+        'function f() { return 1; } f = 2; let y = f() + 1;',
+    ]
+    for code in kept:
+        assert 'def js_add' in transpile_js(code), code
+
+def test_plus_with_unknown_types_calls_js_add(capsys):
+    code = '''
+    function soma(a, b) { return a + b + 1; }
+    let x = 1;
+    x = "um";
+    console.log(soma(1, 2));
+    console.log(soma("a", 2));
+    console.log(x + 1);
+    '''
+    py_code = transpile_js(code)
+    assert py_code.count("def js_add(") == 1
+    assert "return js_add(js_add(a, b), 1)" in py_code
+    assert "print(js_add(x, 1))" in py_code
+    exec(py_code, {})
+    assert capsys.readouterr().out.splitlines() == ['4', 'a21', 'um1']
+    from interpreter.interpreter import Interpreter
+    Interpreter(Parser(code).parse_program()).execute()
+    assert capsys.readouterr().out.splitlines() == ['4', 'a21', 'um1']
+
+def test_compound_statement_visited_as_expression_returns_its_text():
+    ast = Parser('if (x) { y = 1; }').parse_program()
+    transpiler = Transpiler(ast)
+    assert transpiler.visit(ast.statements[0]) == "if x:\n    y = 1"
+    assert transpiler.out.lines == []
+
+class _RecordingSink:
+    def __init__(self):
+        self.writes = []
+
+    def write(self, text):
+        self.writes.append(text)
+
+def test_transpile_to_streams_top_level_statements():
+    code = '''
+    let a = 1;
+    function f(x) {
+        return x + 1;
+    }
+    console.log(f(a));
+    '''
+    ast = Parser(code).parse_program()
+    sink = _RecordingSink()
+    Transpiler(ast).transpile_to(sink)
+    expected = Transpiler(ast).transpile()
+    assert "".join(sink.writes) == expected
+    # Um write por statement de topo (mais os separadores), nunca a saída inteira
+    assert len(sink.writes) > 3
+    assert expected not in sink.writes
+
+def test_transpile_to_matches_transpile_on_examples():
+    compared = 0
+    for path in EXAMPLES:
+        with open(path, encoding='utf-8') as f:
+            source = f.read()
+        try:
+            ast = Parser(source).parse_program()
+        except (LexerError, ParserError):
+            continue
+        sink = io.StringIO()
+        Transpiler(ast).transpile_to(sink)
+        assert sink.getvalue() == Transpiler(ast).transpile(), path
+        compared += 1
+    assert compared > 0
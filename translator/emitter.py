@@ -0,0 +1,76 @@
+"""
+Buffer de saída do transpilador
+
+O código Python é acumulado linha a linha, já com a indentação do nível
+corrente, e unido uma única vez no final. Antes, cada bloco aninhado virava
+uma string que era quebrada e reindentada por cada nível que a envolvia,
+recopiando o código uma vez por nível de profundidade.
+
+No nível 0 o texto entra como está; nos níveis internos cada linha do texto
+(`str.splitlines`) recebe o prefixo do nível, exatamente como a antiga
+reindentação fazia, para que a saída seja idêntica byte a byte.
+
+Com um `sink` (qualquer objeto com `write`, como um arquivo ou sys.stdout),
+`flush` escreve as linhas pendentes e esvazia o buffer; o transpilador chama
+flush a cada statement de topo, então só um statement fica em memória de
+cada vez. O texto escrito é o mesmo de `getvalue`: linhas separadas por
+"\n", sem quebra de linha no final.
+
+Com um `source_map` (translator/source_map.py), cada linha guarda também a
+origem corrente (`origin`, o offset JS do statement que está sendo gerado),
+passada ao mapa a cada flush ou por `map_lines`.
+"""
+INDENT = '    '
+
+
+class Emitter:
+    __slots__ = ('lines', 'level', '_prefix', 'sink', '_written', 'source_map', 'origin', 'origins')
+
+    def __init__(self, sink=None, source_map=None):
+        self.lines = []
+        self.level = 0
+        self._prefix = ''
+        self.sink = sink
+        self._written = False
+        self.source_map = source_map
+        # Offset JS do statement corrente e a origem de cada entrada de `lines`
+        self.origin = None
+        self.origins = []
+
+    def line(self, text):
+        if self.level:
+            prefix = self._prefix
+            self.lines.extend(prefix + part for part in text.splitlines())
+        else:
+            self.lines.append(text)
+        if self.source_map is not None:
+            self.origins.extend([self.origin] * (len(self.lines) - len(self.origins)))
+
+    def indent(self):
+        self.level += 1
+        self._prefix = INDENT * self.level
+
+    def dedent(self):
+        self.level -= 1
+        self._prefix = INDENT * self.level
+
+    def getvalue(self):
+        return "\n".join(self.lines)
+
+    def flush(self):
+        """Escreve as linhas pendentes no sink (se houver) e esvazia o buffer"""
+        if self.sink is None or not self.lines:
+            return
+        if self._written:
+            self.sink.write("\n")
+        self.sink.write("\n".join(self.lines))
+        self._written = True
+        self.map_lines()
+        self.lines.clear()
+
+    def map_lines(self):
+        """Passa ao source map (se houver) a origem das linhas pendentes; sem
+        sink, é chamado uma única vez, depois da última linha"""
+        if self.source_map is not None:
+            self.source_map.add(self.lines, self.origins)
+            self.origins.clear()
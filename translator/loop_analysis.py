@@ -0,0 +1,348 @@
+"""
+Detecção de laços for contados, para o transpilador gerar range()
+
+Um `for (let i = a; i < b; i++)` vira `for i in range(a, b)` quando isso
+não muda o comportamento do laço:
+
+- a variável é declarada com `let` (não existe depois do laço), não é
+  reatribuída no corpo e o escopo não usa o mesmo nome fora de um
+  cabeçalho `for (let ...)`: no Python ela continua existindo depois do
+  laço, e com range() terminaria em b - 1 e não em b;
+- o programa não declara nem atribui `range`, que o código gerado chama;
+- a condição compara a variável (<, <=, >, >=) com um limite, e o update
+  anda uma quantidade inteira constante no sentido que leva ao fim;
+- o início e o limite são sempre inteiros (range não aceita float): literais
+  inteiros, `.length`, aritmética inteira e variáveis que só recebem
+  valores assim no seu escopo;
+- o limite não muda durante o laço, já que range o avalia uma única vez:
+  nenhum nome usado nele é reatribuído no corpo e, se ele usa `.length` ou
+  um nome que alguma função reatribui sem declarar, o corpo não chama
+  funções nem métodos que possam alterá-lo.
+
+Os nomes que uma função atribui sem declarar (`outer_assignments`) viram
+`global`/`nonlocal` no motor python: a atribuição pode acontecer em
+qualquer chamada, então eles nunca são tratados como inteiros.
+
+`find_counted_loops(root)` devolve {nó ForStatement: CountedLoop}.
+"""
+from ast_nodes.arena import FIELDS, KIND_IDS
+from ast_nodes.nodes import (
+    Node, Program, VariableDeclaration, Assignment,
+    UpdateExpression, Literal, Identifier, BinaryOp, UnaryOp, PropertyAccess,
+    MethodCall, FunctionCall, NewExpression, ForStatement, ForEachStatement,
+    FunctionDeclaration, MethodDeclaration, ConstructorDeclaration,
+    LambdaFunction, ClassDeclaration,
+)
+
+# Nós que abrem um escopo de função no Python gerado
+SCOPES = (FunctionDeclaration, MethodDeclaration, ConstructorDeclaration, LambdaFunction)
+
+# Métodos que o transpilador traduz para operações que não alteram arrays;
+# qualquer outra chamada (push, pop, métodos de classe...) pode alterá-los
+_PURE_METHODS = frozenset({
+    'charAt', 'substring', 'substr', 'toLowerCase', 'toUpperCase', 'toString',
+    'toFixed', 'length', 'floor', 'ceil', 'round', 'abs', 'max', 'min', 'pow', 'sqrt',
+})
+
+# Sentido exigido do passo para cada comparação
+_DIRECTIONS = {'<': 1, '<=': 1, '>': -1, '>=': -1}
+
+
+class CountedLoop:
+    """`for var in range(start, stop, step)`; `inclusive` quando a condição é <= ou >="""
+    __slots__ = ('var', 'start', 'stop', 'step', 'inclusive')
+
+    def __init__(self, var, start, stop, step, inclusive):
+        self.var = var
+        self.start = start
+        self.stop = stop
+        self.step = step
+        self.inclusive = inclusive
+
+
+def find_counted_loops(root):
+    loops = {}
+    if 'range' not in _bound_names(root, True):
+        _analyze_scope(root, (), None, outer_assignments(root), loops)
+    return loops
+
+
+def children(node):
+    for name in FIELDS[KIND_IDS[type(node)]]:
+        value = getattr(node, name, None)
+        if isinstance(value, Node):
+            yield value
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                if isinstance(item, Node):
+                    yield item
+                elif type(item) is tuple:
+                    yield from (part for part in item if isinstance(part, Node))
+
+
+class _Scope:
+    __slots__ = ('assignments', 'integers', 'parent', 'outer')
+
+    def __init__(self, parent, outer):
+        # nome -> expressões atribuídas (None para valor desconhecido)
+        self.assignments = {}
+        self.integers = set()
+        self.parent = parent
+        # Nomes que alguma função atribui sem declarar
+        self.outer = outer
+
+    def is_integer_name(self, name):
+        scope = self
+        while scope is not None:
+            if name in scope.assignments:
+                return name in scope.integers
+            scope = scope.parent
+        return False
+
+
+def _analyze_scope(node, params, parent, outer, loops):
+    scope = _Scope(parent, outer)
+    for param in params:
+        scope.assignments.setdefault(param, []).append(None)
+    nested = []
+    fors = []
+    collect_scope(scope_body(node), scope.assignments, nested, fors)
+    _solve_integers(scope)
+
+    bound = _bound_names(scope_body(node), False).union(params)
+    for loop in fors:
+        counted = _counted_loop(loop, scope, bound)
+        if counted is not None:
+            loops[loop] = counted
+    for function in nested:
+        _analyze_scope(function, function.params, scope, outer, loops)
+
+
+def bindings(node):
+    """Nomes declarados em uma função e nomes só atribuídos nela (sem declaração),
+    sem entrar nas funções aninhadas"""
+    declared = set(node.params)
+    assigned = set()
+    stack = [node.body]
+    while stack:
+        current = stack.pop()
+        cls = type(current)
+        if cls in SCOPES:
+            if cls is FunctionDeclaration and current.name:
+                declared.add(current.name)
+            continue
+        if cls is VariableDeclaration:
+            if not current.name.startswith(('this.', 'self.')):
+                (assigned if current.kind is None else declared).add(current.name)
+        elif cls is Assignment or cls is UpdateExpression:
+            target = current.target if cls is Assignment else current.operand
+            if type(target) is Identifier:
+                assigned.add(target.name)
+        elif cls is ForEachStatement:
+            declared.add(current.var)
+        elif cls is ClassDeclaration:
+            declared.add(current.name)
+        stack.extend(children(current))
+    return declared, assigned - declared
+
+
+def outer_assignments(root):
+    """Nomes que alguma função (não lambda) atribui sem declarar"""
+    names = set()
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        if type(current) in SCOPES and type(current) is not LambdaFunction:
+            names |= bindings(current)[1]
+        stack.extend(children(current))
+    return frozenset(names)
+
+
+def _bound_names(root, into_functions):
+    """Nomes declarados ou atribuídos no escopo (ou em todos, com `into_functions`),
+    exceto pela variável de um `for (let ...)` no início e no update do próprio laço"""
+    headers = set()
+    names = set()
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        cls = type(node)
+        if cls is ForStatement:
+            init = node.init
+            if type(init) is VariableDeclaration and init.kind == 'let':
+                headers.add(init)
+                if _step(node.update, init.name):
+                    headers.add(node.update)
+        elif node not in headers:
+            if cls is VariableDeclaration:
+                if not node.name.startswith(('this.', 'self.')):
+                    names.add(node.name)
+            elif cls is Assignment:
+                if type(node.target) is Identifier:
+                    names.add(node.target.name)
+            elif cls is UpdateExpression:
+                if type(node.operand) is Identifier:
+                    names.add(node.operand.name)
+            elif cls is ForEachStatement:
+                names.add(node.var)
+            elif cls is ClassDeclaration:
+                names.add(node.name)
+            elif cls in SCOPES:
+                if cls is FunctionDeclaration and node.name:
+                    names.add(node.name)
+                if not into_functions:
+                    continue
+                names.update(node.params)
+        stack.extend(children(node))
+    return names
+
+
+def scope_body(node):
+    """Nó percorrido para um escopo: o programa, a expressão do lambda ou o corpo da função"""
+    if type(node) is Program:
+        return node
+    return node.expression if type(node) is LambdaFunction else node.body
+
+
+def collect_scope(node, assignments, nested, fors):
+    """Atribuições do escopo, funções aninhadas e laços for, sem entrar nas funções"""
+    cls = type(node)
+    if cls in SCOPES:
+        nested.append(node)
+        if cls is FunctionDeclaration and node.name:
+            assignments.setdefault(node.name, []).append(None)
+        return
+    if cls is VariableDeclaration:
+        value = node.value
+        if type(value) in SCOPES:
+            assignments.setdefault(node.name, []).append(None)
+        else:
+            assignments.setdefault(node.name, []).append(value)
+    elif cls is Assignment:
+        if type(node.target) is Identifier:
+            assignments.setdefault(node.target.name, []).append(node.value)
+    elif cls is ForEachStatement:
+        assignments.setdefault(node.var, []).append(None)
+    elif cls is ClassDeclaration:
+        assignments.setdefault(node.name, []).append(None)
+    elif cls is ForStatement:
+        fors.append(node)
+    for child in children(node):
+        collect_scope(child, assignments, nested, fors)
+
+
+def _solve_integers(scope):
+    """Maior conjunto de nomes cujas atribuições são todas inteiras (ponto fixo)"""
+    scope.integers = set(scope.assignments) - scope.outer
+    changed = True
+    while changed:
+        changed = False
+        for name in list(scope.integers):
+            if not all(value is not None and _is_integer(value, scope) for value in scope.assignments[name]):
+                scope.integers.discard(name)
+                changed = True
+
+
+def _is_integer(node, scope):
+    cls = type(node)
+    if cls is Literal:
+        return type(node.value) is int
+    if cls is Identifier:
+        return scope.is_integer_name(node.name)
+    if cls is PropertyAccess:
+        return node.property_name == 'length'
+    if cls is BinaryOp:
+        return node.op in ('+', '-', '*') and _is_integer(node.left, scope) and _is_integer(node.right, scope)
+    if cls is UnaryOp:
+        return node.op == '-' and _is_integer(node.operand, scope)
+    return False
+
+
+def _step(update, name):
+    """Passo inteiro constante do update sobre `name`, ou 0"""
+    if type(update) is UpdateExpression:
+        if type(update.operand) is Identifier and update.operand.name == name:
+            return {'++': 1, '--': -1}.get(update.operator, 0)
+        return 0
+    if type(update) is VariableDeclaration and update.name == name:
+        # i++, i--, i += n e i -= n chegam do parser como `i = i op n`
+        value = update.value
+        if type(value) is BinaryOp and value.op in ('+', '-') and type(value.left) is Identifier \
+                and value.left.name == name and type(value.right) is Literal \
+                and type(value.right.value) is int and value.right.value > 0:
+            return value.right.value if value.op == '+' else -value.right.value
+    return 0
+
+
+def _counted_loop(node, scope, bound):
+    init, condition = node.init, node.condition
+    if type(init) is not VariableDeclaration or init.kind != 'let':
+        return None
+    name = init.name
+    if name in bound:
+        return None
+    if type(condition) is not BinaryOp or condition.op not in _DIRECTIONS:
+        return None
+    if type(condition.left) is not Identifier or condition.left.name != name:
+        return None
+    step = _step(node.update, name)
+    if step == 0 or (step > 0) != (_DIRECTIONS[condition.op] > 0):
+        return None
+    bound = condition.right
+    if not _is_integer(init.value, scope) or not _is_integer(bound, scope):
+        return None
+
+    assigned, calls = set(), []
+    _body_effects(node.body, assigned, calls)
+    names = _names(bound)
+    if name in assigned or assigned & names:
+        return None
+    if calls and (_uses_length(bound) or scope.outer & (names | {name})):
+        return None
+    return CountedLoop(name, init.value, bound, step, condition.op in ('<=', '>='))
+
+
+def _body_effects(node, assigned, calls):
+    """Nomes reatribuídos no corpo e chamadas que podem alterar arrays"""
+    cls = type(node)
+    if cls in SCOPES:
+        return
+    if cls is VariableDeclaration:
+        assigned.add(node.name)
+    elif cls is Assignment:
+        target = node.target
+        if type(target) is Identifier:
+            assigned.add(target.name)
+        elif type(target) is PropertyAccess and target.property_name == 'length':
+            calls.append(node)
+    elif cls is UpdateExpression:
+        operand = node.operand
+        if type(operand) is Identifier:
+            assigned.add(operand.name)
+        elif type(operand) is PropertyAccess and operand.property_name == 'length':
+            calls.append(node)
+    elif cls is ForEachStatement:
+        assigned.add(node.var)
+    elif cls is FunctionCall or cls is NewExpression:
+        calls.append(node)
+    elif cls is MethodCall and node.method_name not in _PURE_METHODS:
+        calls.append(node)
+    for child in children(node):
+        _body_effects(child, assigned, calls)
+
+
+def _names(node):
+    names = set()
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if type(current) is Identifier:
+            names.add(current.name)
+        stack.extend(children(current))
+    return names
+
+
+def _uses_length(node):
+    if type(node) is PropertyAccess and node.property_name == 'length':
+        return True
+    return any(_uses_length(child) for child in children(node))
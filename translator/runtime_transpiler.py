@@ -0,0 +1,323 @@
+"""
+Geração de Python executável para o motor `--engine=python`
+
+RuntimeTranspiler reaproveita a estrutura do Transpiler (statements,
+indentação, laços contados como range()), mas troca as expressões cuja
+semântica no Python difere da do interpretador por chamadas aos helpers de
+interpreter/runtime.py: '+', '/', '%' e comparações relacionais pelas funções
+de operador, acesso a propriedades e índices, chamadas de método, `new` e
+console.log. '+' e comparações entre dois números (ou duas strings), segundo
+translator/type_inference.py, ficam com o operador do Python. O resultado não
+é feito para ser lido, e sim compilado com compile() e executado com exec no
+namespace do runtime.
+
+Uma função que atribui a um nome sem declará-lo (var/let/const, parâmetro,
+função, classe ou variável de for...of/in) recebe `nonlocal` para ele, se
+alguma função que a envolve o declara, ou `global`: como em JS, a
+atribuição altera a variável de fora.
+
+Diferenças em relação aos outros motores: as variáveis seguem o escopo
+léxico do Python (uma função não enxerga as variáveis locais de quem a
+chamou); pelo mesmo motivo, atribuir dentro de uma função a uma variável
+não declarada altera a variável de fora, enquanto os outros motores criam
+uma variável local à chamada (e a de fora fica como estava); atribuições
+dentro de arrow functions de expressão continuam locais a elas; um
+for...of não desfaz ao final as atribuições feitas no corpo; e classes JS
+viram classes Python, com as propriedades da instância acessíveis pelos
+métodos.
+"""
+import keyword
+
+from ast_nodes.arena import FIELDS, KIND_IDS
+from ast_nodes.nodes import (
+    Node, Identifier, MemberAccess, PropertyAccess, ThisExpression, VariableDeclaration,
+    FunctionDeclaration, ClassDeclaration,
+)
+from errors.exceptions import TranspilerError
+from interpreter.runtime import RUNTIME_PREFIX
+from translator.loop_analysis import CountedLoop, bindings
+from translator.transpiler import Transpiler
+
+_LITERALS = {'null': None, 'undefined': None, 'true': True, 'false': False}
+
+# Operadores com a mesma semântica no Python (os operandos vão entre parênteses)
+_NATIVE_OPERATORS = {
+    '-': '-', '*': '*',
+    '==': '==', '===': '==', '!=': '!=', '!==': '!=',
+    '&&': 'and', '||': 'or',
+}
+
+# Operadores resolvidos por uma função do runtime
+_RUNTIME_OPERATORS = {
+    '+': 'add', '/': 'divide', '%': 'modulo',
+    '>': 'greater', '<': 'less', '>=': 'greater_equal', '<=': 'less_equal',
+}
+
+# Operadores do runtime que o Python resolve igual quando os dois lados têm o
+# mesmo tipo garantido (dois números ou duas strings)
+_TYPED_NATIVE = frozenset({'+', '>', '<', '>=', '<='})
+
+# Nome do parâmetro que recebe `this` nas funções chamadas com new ou call()
+THIS_PARAM = RUNTIME_PREFIX + 'this'
+# Parâmetro que absorve argumentos a mais (JS os ignora)
+EXTRA_ARGS = RUNTIME_PREFIX + 'args'
+
+
+def _rt(name):
+    return RUNTIME_PREFIX + name
+
+
+def _uses_this(node):
+    """Se o corpo usa `this` fora de funções aninhadas (lambdas enxergam o this de fora)"""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, ThisExpression):
+            return True
+        if isinstance(current, VariableDeclaration) and current.name and current.name.startswith(('this.', 'self.')):
+            return True
+        for name in FIELDS[KIND_IDS[type(current)]]:
+            value = getattr(current, name, None)
+            items = value if isinstance(value, (list, tuple)) else (value,)
+            for item in items:
+                if type(item) is tuple:
+                    stack.extend(part for part in item if isinstance(part, Node))
+                elif isinstance(item, Node) and not isinstance(item, (FunctionDeclaration, ClassDeclaration)):
+                    stack.append(item)
+    return False
+
+
+class RuntimeTranspiler(Transpiler):
+    def __init__(self, ast):
+        super().__init__(ast)
+        # Nome Python de `this` no contexto corrente (None fora de funções)
+        self._this = None
+        self._in_function = False
+        # Nomes declarados por cada função que envolve o código corrente
+        self._declared = []
+
+    def name(self, name):
+        """Identificador JS -> Python, evitando palavras reservadas e `self`"""
+        if keyword.iskeyword(name) or name == 'self':
+            return name + '_'
+        return name
+
+    def params(self, params, this=None):
+        """Parâmetros com None por padrão (argumentos que faltam valem null)"""
+        names = [f"{self.name(param)}=None" for param in params]
+        names.append('*' + EXTRA_ARGS)
+        if this:
+            names.append(f"{this}=None")
+        return ", ".join(names)
+
+    def _function_body(self, node, this):
+        declared, assigned = bindings(node)
+        self._declare_outer(assigned)
+        outer = self._this, self._in_function
+        self._this, self._in_function = this, True
+        self._declared.append(declared)
+        try:
+            self.body(node.body)
+        finally:
+            self._declared.pop()
+            self._this, self._in_function = outer
+
+    def _declare_outer(self, names):
+        """`nonlocal`/`global` para os nomes atribuídos sem declaração"""
+        nonlocals, globals_ = [], []
+        for name in sorted(names):
+            enclosing = any(name in declared for declared in self._declared)
+            (nonlocals if enclosing else globals_).append(self.name(name))
+        self.out.indent()
+        if nonlocals:
+            self.out.line(f"nonlocal {', '.join(nonlocals)}")
+        if globals_:
+            self.out.line(f"global {', '.join(globals_)}")
+        self.out.dedent()
+
+    # --- Statements ---
+
+    def body(self, node):
+        start = len(self.out.lines)
+        super().body(node)
+        if len(self.out.lines) == start:
+            self.out.indent()
+            self.out.line("pass")
+            self.out.dedent()
+
+    def emit_prelude(self, node):
+        # Os helpers vêm do namespace do runtime
+        pass
+
+    def emit_Comment(self, node):
+        pass
+
+    def emit_InlineComment(self, node):
+        self.statement(node.statement)
+
+    def emit_VariableDeclaration(self, node):
+        if isinstance(node.value, FunctionDeclaration) and node.value.name is None:
+            self._function(node.name, node.value)
+        elif node.name.startswith(('this.', 'self.')):
+            self.out.line(f"{_rt('set_property')}({self._this_name()}, {node.name[5:]!r}, {self.visit(node.value)})")
+        else:
+            self.out.line(f"{self.name(node.name)} = {self.visit(node.value)}")
+
+    def emit_Assignment(self, node):
+        if isinstance(node.target, Identifier):
+            self.out.line(f"{self.name(node.target.name)} = {self.visit(node.value)}")
+        else:
+            self.out.line(self.visit(node))
+
+    emit_AssignmentExpression = emit_Assignment
+
+    def emit_FunctionDeclaration(self, node):
+        self._function(node.name, node)
+
+    def _function(self, name, node):
+        this = THIS_PARAM if _uses_this(node.body) else None
+        self.out.line(f"def {self.name(name)}({self.params(node.params, this)}):")
+        self._function_body(node, this or self._this)
+
+    def emit_ReturnStatement(self, node):
+        value = self.visit(node.expression) if node.expression else "None"
+        if self._in_function:
+            self.out.line(f"return {value}")
+        else:
+            self.out.line(f"raise {_rt('ProgramExit')}({value})")
+
+    def _counted_for(self, loop, body):
+        loop = CountedLoop(self.name(loop.var), loop.start, loop.stop, loop.step, loop.inclusive)
+        super()._counted_for(loop, body)
+
+    def emit_ForEachStatement(self, node):
+        iterable = self.visit(node.iterable)
+        self.out.line(f"for {self.name(node.var)} in {_rt('iterate')}({iterable}, {node.kind!r}):")
+        self.body(node.body)
+
+    def emit_ClassDeclaration(self, node):
+        self.out.line(f"class {self.name(node.name)}({_rt('Object')}):")
+        self.out.indent()
+        try:
+            if not node.constructor and not node.methods:
+                self.out.line("pass")
+            if node.constructor:
+                self._method('__init__', node.constructor)
+            for method in node.methods:
+                self._method(self.name(method.name), method)
+        finally:
+            self.out.dedent()
+
+    def _method(self, name, node):
+        self.out.line(f"def {name}(self, {self.params(node.params)}):")
+        self._function_body(node, 'self')
+
+    # --- Expressões ---
+
+    def _this_name(self):
+        # Fora de funções `this` não existe: o nome não definido gera NameError
+        return self._this or THIS_PARAM
+
+    def visit_Literal(self, node):
+        value = node.value
+        if isinstance(value, str) and value in _LITERALS:
+            value = _LITERALS[value]
+        return repr(value)
+
+    def visit_Identifier(self, node):
+        return self.name(node.name)
+
+    def visit_ThisExpression(self, node):
+        return self._this_name()
+
+    def visit_BinaryOp(self, node):
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+        if node.op in _NATIVE_OPERATORS:
+            return f"({left} {_NATIVE_OPERATORS[node.op]} {right})"
+        if node.op in _TYPED_NATIVE and self._types.get(node.left) is not None \
+                and self._types.get(node.left) == self._types.get(node.right):
+            return f"({left} {node.op} {right})"
+        if node.op in _RUNTIME_OPERATORS:
+            return f"{_rt(_RUNTIME_OPERATORS[node.op])}({left}, {right})"
+        raise TranspilerError('BinaryOp', f"Operador desconhecido: {node.op}")
+
+    def visit_UnaryOp(self, node):
+        operand = self.visit(node.operand)
+        if node.op == '!':
+            return f"{_rt('not')}({operand})"
+        if node.op in ('-', '+'):
+            return f"({node.op}{operand})"
+        raise TranspilerError('UnaryOp', f"Operador unário não suportado: {node.op}")
+
+    def visit_VariableDeclaration(self, node):
+        if node.name.startswith(('this.', 'self.')):
+            return f"{_rt('set_property')}({self._this_name()}, {node.name[5:]!r}, {self.visit(node.value)})"
+        return f"({self.name(node.name)} := {self.visit(node.value)})"
+
+    def visit_Assignment(self, node):
+        target = node.target
+        value = self.visit(node.value)
+        if isinstance(target, Identifier):
+            return f"({self.name(target.name)} := {value})"
+        if isinstance(target, MemberAccess):
+            key = repr(target.key) if target.is_dot else self.visit(target.key)
+            return f"{_rt('set_item')}({self.visit(target.object)}, {key}, {value})"
+        if isinstance(target, PropertyAccess):
+            return f"{_rt('set_property')}({self.visit(target.object)}, {target.property_name!r}, {value})"
+        raise TranspilerError('Assignment', "Target de atribuição inválido")
+
+    visit_AssignmentExpression = visit_Assignment
+
+    def visit_UpdateExpression(self, node):
+        operand = node.operand
+        step = 1 if node.operator == '++' else -1
+        if isinstance(operand, Identifier):
+            name = self.name(operand.name)
+            updated = f"({name} := {name} + {step})"
+            return updated if node.prefix else f"({updated} - {step})"
+        if isinstance(operand, PropertyAccess):
+            obj = self.visit(operand.object)
+            return f"{_rt('update_property')}({obj}, {operand.property_name!r}, {step}, {node.prefix})"
+        raise TranspilerError('UpdateExpression', f"Update expression não suportado para {type(operand)}")
+
+    def visit_ConsoleLog(self, node):
+        return f"{_rt('log')}({self.visit(node.argument)})"
+
+    def visit_FunctionDeclaration(self, node):
+        raise TranspilerError('FunctionDeclaration', "função com corpo em bloco só pode ser declarada como statement")
+
+    def visit_ReturnStatement(self, node):
+        raise TranspilerError('ReturnStatement', "return só pode ser usado como statement")
+
+    def visit_FunctionCall(self, node):
+        args = ", ".join(self.visit(arg) for arg in node.arguments)
+        return f"{self.name(node.name)}({args})"
+
+    def visit_ArrayLiteral(self, node):
+        return f"[{', '.join(self.visit(element) for element in node.elements)}]"
+
+    def visit_ObjectLiteral(self, node):
+        pairs = []
+        for key, value in node.pairs:
+            key_code = repr(key) if isinstance(key, str) else self.visit(key)
+            pairs.append(f"{key_code}: {self.visit(value)}")
+        return f"{{{', '.join(pairs)}}}"
+
+    def visit_MemberAccess(self, node):
+        key = repr(node.key) if node.is_dot else self.visit(node.key)
+        return f"{_rt('get_item')}({self.visit(node.object)}, {key})"
+
+    def visit_PropertyAccess(self, node):
+        return f"{_rt('get_property')}({self.visit(node.object)}, {node.property_name!r})"
+
+    def visit_MethodCall(self, node):
+        args = "".join(", " + self.visit(arg) for arg in node.arguments)
+        return f"{_rt('call_method')}({self.visit(node.object)}, {node.method_name!r}{args})"
+
+    def visit_NewExpression(self, node):
+        args = "".join(", " + self.visit(arg) for arg in node.arguments)
+        return f"{_rt('new')}({self.name(node.class_name)}{args})"
+
+    def visit_LambdaFunction(self, node):
+        return f"(lambda {self.params(node.params)}: {self.visit(node.expression)})"
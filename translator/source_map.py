@@ -0,0 +1,119 @@
+"""
+Mapa do Python transpilado de volta para o código JS
+
+Com um SourceMap, o transpilador registra, para cada linha gerada, a
+posição (linha e coluna, a partir de 1) do statement JS que a originou: o
+offset do primeiro token, guardado pelo parser em `position`, convertido
+pelo LineIndex da fonte. Linhas sem origem (o helper js_add, linhas em
+branco) ficam como null.
+
+O mapa é salvo em JSON ao lado do arquivo de `-o` (saida.py.map):
+
+    {"version": 1, "file": "saida.py", "source": "programa.js",
+     "mappings": [null, [3, 1], [4, 5], ...]}
+
+em que mappings[n - 1] é a posição JS da linha n do Python. `rewrite` troca
+as posições do arquivo gerado em tracebacks (`File "saida.py", line 12`) e
+em relatórios do cProfile/pstats (`saida.py:12(funcao)`) pelas do JS.
+"""
+import io
+import json
+import os
+import pstats
+import re
+import traceback
+
+VERSION = 1
+MAP_SUFFIX = '.map'
+
+_TRACEBACK_LINE = re.compile(r'File "([^"]+)", line (\d+)')
+_PROFILE_ENTRY = re.compile(r'([^\s(]+):(\d+)\(')
+
+
+class SourceMap:
+    def __init__(self, line_index=None, source=None, file=None):
+        self.line_index = line_index
+        # Caminho do .js e nome do arquivo Python gerado
+        self.source = source
+        self.file = file
+        # (linha, coluna) JS de cada linha gerada, ou None
+        self.mappings = []
+
+    def add(self, lines, origins):
+        """Registra linhas geradas com o offset JS de cada uma (None sem origem)
+
+        Uma entrada pode conter várias linhas físicas: todas recebem a mesma
+        origem.
+        """
+        line_col = self.line_index.line_col
+        for text, origin in zip(lines, origins):
+            position = None if origin is None else line_col(origin)
+            self.mappings.extend([position] * (text.count('\n') + 1))
+
+    def lookup(self, line):
+        """Posição JS (linha, coluna) da linha `line` do Python, ou None"""
+        if 1 <= line <= len(self.mappings):
+            return self.mappings[line - 1]
+        return None
+
+    # --- Arquivo JSON ---
+
+    def to_dict(self):
+        return {
+            'version': VERSION,
+            'file': self.file,
+            'source': self.source,
+            'mappings': [list(position) if position else None for position in self.mappings],
+        }
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != VERSION:
+            raise ValueError(f"Versão de source map não suportada: {data.get('version')}")
+        source_map = cls(source=data['source'], file=data['file'])
+        source_map.mappings = [tuple(position) if position else None for position in data['mappings']]
+        return source_map
+
+    # --- Relatórios ---
+
+    def _generated(self, path):
+        return self.file is not None and os.path.basename(path) == self.file
+
+    def rewrite(self, text):
+        """Troca posições do arquivo gerado por posições JS em tracebacks e relatórios de profiling"""
+        def traceback_line(match):
+            position = self._generated(match.group(1)) and self.lookup(int(match.group(2)))
+            if not position:
+                return match.group(0)
+            return f'File "{self.source}", line {position[0]}, column {position[1]}'
+
+        def profile_entry(match):
+            position = self._generated(match.group(1)) and self.lookup(int(match.group(2)))
+            if not position:
+                return match.group(0)
+            return f"{self.source}:{position[0]}:{position[1]}("
+
+        return _PROFILE_ENTRY.sub(profile_entry, _TRACEBACK_LINE.sub(traceback_line, text))
+
+    def format_exception(self, exc):
+        """Traceback de `exc` com as linhas do código gerado apontando para o JS"""
+        return self.rewrite("".join(traceback.format_exception(type(exc), exc, exc.__traceback__)))
+
+    def format_stats(self, profile, sort='cumulative', limit=None):
+        """Relatório de um cProfile.Profile (ou pstats.Stats) em coordenadas JS"""
+        stream = io.StringIO()
+        stats = profile if isinstance(profile, pstats.Stats) else pstats.Stats(profile, stream=stream)
+        stats.stream = stream
+        stats.sort_stats(sort).print_stats(*(() if limit is None else (limit,)))
+        return self.rewrite(stream.getvalue())
+
+
+def map_path(output_path):
+    """Arquivo do source map de um arquivo Python gerado"""
+    return output_path + MAP_SUFFIX
@@ -1,23 +1,129 @@
-from ast_nodes.nodes import Literal, LambdaFunction, FunctionDeclaration
+from ast_nodes.nodes import Literal, BinaryOp, LambdaFunction, FunctionDeclaration
 from errors.exceptions import TranspilerError
+from translator.emitter import Emitter
+from translator.loop_analysis import children, find_counted_loops
+from translator.type_inference import STRING, infer_types
+
+# Definição emitida no início do código quando algum '+' não tem os tipos
+# conhecidos: a mesma regra do interpretador (concatena se houver string)
+JS_ADD = (
+    "def js_add(a, b):",
+    "    if isinstance(a, str) or isinstance(b, str):",
+    "        return str(a) + str(b)",
+    "    return a + b",
+)
+
+
+# Precedência dos operadores aritméticos no Python gerado: um operando que é
+# uma operação de precedência menor (ou igual, à direita) vai entre parênteses
+_PRECEDENCE = {'+': 1, '-': 1, '*': 2, '/': 2, '%': 2}
 
 
 class Transpiler:
     def __init__(self, ast):
         self.ast = ast
-
-    def transpile(self):
-        return self.visit(self.ast)
+        # Tabela de despacho: tipo do nó -> método visit_* já resolvido
+        self._dispatch = {}
+        # Statements compostos: tipo do nó -> método emit_* (ou None)
+        self._emitters = {}
+        # Laços for que podem virar `for ... in range(...)`
+        self._counted_loops = {}
+        # Tipos (número ou string) garantidos das expressões, para o '+'
+        self._types = {}
+        self.out = Emitter()
+
+    def _analyze(self):
+        self._counted_loops = find_counted_loops(self.ast)
+        self._types = infer_types(self.ast)
+
+    def transpile(self, source_map=None):
+        """Código Python do programa; com `source_map`, registra nele a origem de cada linha"""
+        self._analyze()
+        self.out = Emitter(source_map=source_map)
+        self.statement(self.ast)
+        self.out.map_lines()
+        return self.out.getvalue()
+
+    def transpile_to(self, sink, source_map=None):
+        """Escreve o código em `sink` à medida que cada statement de topo é gerado"""
+        self._analyze()
+        self.out = Emitter(sink, source_map)
+        self.statement(self.ast)
+        self.out.flush()
 
     def indent(self, code, level=1):
         indent_str = '    ' * level
         return '\n'.join(indent_str + line if line.strip() else line for line in code.split('\n'))
 
     def visit(self, node):
-        method_name = 'visit_' + node.__class__.__name__
-        visitor = getattr(self, method_name, self.generic_visit)
+        try:
+            visitor = self._dispatch[node.__class__]
+        except KeyError:
+            visitor = self._resolve_visitor(node.__class__)
         return visitor(node)
 
+    def _resolve_visitor(self, node_class):
+        visitor = getattr(self, 'visit_' + node_class.__name__, None)
+        if visitor is None:
+            # Statement composto usado como expressão: devolve o texto dele
+            visitor = self._render if self._emitter(node_class) else self.generic_visit
+        self._dispatch[node_class] = visitor
+        return visitor
+
+    # --- Statements ---
+    #
+    # Statements simples são expressões (visit_* devolve a linha); os
+    # compostos (blocos, if, laços, funções, classes) têm um emit_* que
+    # escreve as linhas direto em self.out, no nível de indentação corrente.
+
+    def statement(self, node):
+        out = self.out
+        if out.source_map is not None:
+            position = getattr(node, 'position', None)
+            if position is not None:
+                # As linhas do statement (e as do corpo que não têm posição própria) vêm dele
+                outer = out.origin
+                out.origin = position
+                try:
+                    self._emit(node)
+                finally:
+                    out.origin = outer
+                return
+        self._emit(node)
+
+    def _emit(self, node):
+        emit = self._emitter(node.__class__)
+        if emit is None:
+            self.out.line(self.visit(node))
+        else:
+            emit(node)
+
+    def _emitter(self, node_class):
+        try:
+            return self._emitters[node_class]
+        except KeyError:
+            emit = getattr(self, 'emit_' + node_class.__name__, None)
+            self._emitters[node_class] = emit
+            return emit
+
+    def _render(self, node):
+        """Texto de um statement composto, gerado em um buffer à parte"""
+        outer = self.out
+        self.out = Emitter()
+        try:
+            self.statement(node)
+            return self.out.getvalue()
+        finally:
+            self.out = outer
+
+    def body(self, node):
+        """Statement `node` um nível de indentação abaixo do corrente"""
+        self.out.indent()
+        try:
+            self.statement(node)
+        finally:
+            self.out.dedent()
+
     def generic_visit(self, node):
         node_type = node.__class__.__name__
         available_nodes = [
@@ -31,30 +137,45 @@ class Transpiler:
         
         raise TranspilerError(node_type, message)
 
-    def visit_Program(self, node):
-        #code_lines = [self.visit(s) for s in node.statements]
-        #code = "\n".join(code_lines)
-        #
-        #if 'math.' in code:
-        #    return f"import math\n\n{code}"
-        #else:
-        #    return code
-        
-        statements = []
+    def emit_Program(self, node):
+        self.emit_prelude(node)
         prev_type = None
         
-        for i, statement in enumerate(node.statements):
-            current_code = self.visit(statement)
+        for statement in node.statements:
             current_type = statement.__class__.__name__
             
             # Adiciona quebra de linha entre diferentes tipos de declarações
             if prev_type and self._should_add_spacing(prev_type, current_type):
-                statements.append("")
+                self.out.line("")
             
-            statements.append(current_code)
+            self.statement(statement)
+            self.out.flush()
             prev_type = current_type
-            
-        return "\n".join(statements)
+
+    def emit_prelude(self, node):
+        """Helpers usados pelo código gerado, antes do primeiro statement"""
+        if self._uses_js_add(node):
+            for line in JS_ADD:
+                self.out.line(line)
+            self.out.line("")
+            self.out.flush()
+
+    def _uses_js_add(self, root):
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, BinaryOp) and node.op == '+' and self._add_types(node) is None:
+                return True
+            stack.extend(children(node))
+        return False
+
+    def _add_types(self, node):
+        """Tipos dos operandos de um '+', ou None se algum deles não é garantido"""
+        left = self._types.get(node.left)
+        right = self._types.get(node.right)
+        if left is None or right is None:
+            return None
+        return left, right
 
     def _should_add_spacing(self, prev_type, current_type):
         """Determina se deve adicionar espaçamento entre tipos de declarações"""
@@ -138,10 +259,21 @@ class Transpiler:
             else:
                 return f"{left} {py_op} {right}"
 
+        precedence = _PRECEDENCE.get(node.op)
+        if precedence is not None:
+            left = self._operand(node.left, left, precedence)
+            right = self._operand(node.right, right, precedence + 1)
+
         if node.op == '+':
             # Em JavaScript, '+' com qualquer string faz concatenação
-            if self.might_be_string_concatenation(node.left) or self.might_be_string_concatenation(node.right):
-                return f"str({left}) + str({right})"
+            types = self._add_types(node)
+            if types is None:
+                return f"js_add({left}, {right})"
+            left_type, right_type = types
+            if left_type != right_type:
+                if left_type == STRING:
+                    return f"{left} + str({right})"
+                return f"str({left}) + {right}"
         
         # Para operações aritméticas simples, não usar parênteses desnecessários
         if node.op in simple_ops:
@@ -149,19 +281,17 @@ class Transpiler:
             
         return f"({left} {node.op} {right})"
 
+    def _operand(self, node, code, precedence):
+        """`code` entre parênteses se a operação `node` tem precedência menor que `precedence`"""
+        if isinstance(node, BinaryOp) and _PRECEDENCE.get(node.op, 0) < precedence:
+            return f"({code})"
+        return code
+
     def _needs_parentheses(self, node):
         """Determina se uma operação binária precisa de parênteses"""
         # Por enquanto, vamos ser conservadores e usar parênteses para operações lógicas
         return node.op in ['&&', '||', 'and', 'or']
 
-    def might_be_string_concatenation(self, node):
-        if isinstance(node, Literal) and isinstance(node.value, str):
-            return True
-        if hasattr(node, 'op') and node.op == '+':
-            return True
-        return False
-
-
     def is_string(self, node):
         return isinstance(node, Literal) and isinstance(node.value, str)
 
@@ -169,32 +299,28 @@ class Transpiler:
         arg = self.visit(node.argument)
         return f"print({arg})"
 
-    def visit_IfStatement(self, node):
-        cond = self.visit(node.condition)
-        then_block = self.visit(node.then_block)
-        code = f"if {cond}:\n" + self._indent(then_block)
+    def emit_IfStatement(self, node):
+        self.out.line(f"if {self.visit(node.condition)}:")
+        self.body(node.then_block)
         if node.else_block:
-            else_block = self.visit(node.else_block)
-            code += f"\nelse:\n" + self._indent(else_block)
-        return code
+            self.out.line("else:")
+            self.body(node.else_block)
 
-    def visit_WhileStatement(self, node):
-        cond = self.visit(node.condition)
-        body = self.visit(node.body)
-        return f"while {cond}:\n" + self._indent(body)
+    def emit_WhileStatement(self, node):
+        self.out.line(f"while {self.visit(node.condition)}:")
+        self.body(node.body)
 
-    def visit_Block(self, node):
-        return "\n".join([self.visit(s) for s in node.statements])
+    def emit_Block(self, node):
+        if not node.statements:
+            # Bloco vazio: `if (x) {}` na fonte ou esvaziado pela eliminação de código morto
+            self.out.line("pass")
+        for statement in node.statements:
+            self.statement(statement)
 
-    def visit_FunctionDeclaration(self, node):
+    def emit_FunctionDeclaration(self, node):
         params = ", ".join(node.params)
-        body = self.visit(node.body)
-        
-        # Formatação melhorada para funções
-        function_header = f"def {node.name}({params}):"
-        indented_body = self._indent(body)
-        
-        return f"{function_header}\n{indented_body}"
+        self.out.line(f"def {node.name}({params}):")
+        self.body(node.body)
 
     def visit_ReturnStatement(self, node):
         expr = self.visit(node.expression)
@@ -204,10 +330,6 @@ class Transpiler:
         args = ", ".join([self.visit(a) for a in node.arguments])
         return f"{node.name}({args})"
 
-    def _indent(self, code, level=1):
-        prefix = "    " * level
-        return "\n".join(prefix + line for line in code.splitlines())
-    
     def visit_ArrayLiteral(self, node):
         elements = [self.visit(e) for e in node.elements]
         return f"[{', '.join(elements)}]"
@@ -229,42 +351,49 @@ class Transpiler:
         params = ', '.join(node.params)
         return f"lambda {params}: {self.visit(node.expression)}"
 
-    def visit_ForStatement(self, node):
-        init_code = ""
+    def emit_ForStatement(self, node):
+        counted = self._counted_loops.get(node)
+        if counted is not None:
+            self._counted_for(counted, node.body)
+            return
+
         if node.init:
-            init_code = self.visit(node.init)
+            self.statement(node.init)
         
         condition = "True"
         if node.condition:
             condition = self.visit(node.condition)
         
-        update_code = ""
-        if node.update:
-            update_code = self.visit(node.update)
-        
-        body = self.visit(node.body)
-        
-        if update_code:
-            if body.strip():
-                body += f"\n{update_code}"
+        self.out.line(f"while {condition}:")
+        self.out.indent()
+        try:
+            self.statement(node.body)
+            if node.update:
+                self.statement(node.update)
+        finally:
+            self.out.dedent()
+
+    def _counted_for(self, loop, body):
+        """for (let i = a; i < b; i++) -> for i in range(a, b)"""
+        start = self.visit(loop.start)
+        stop = self.visit(loop.stop)
+        if loop.inclusive:
+            offset = 1 if loop.step > 0 else -1
+            if isinstance(loop.stop, Literal):
+                stop = str(loop.stop.value + offset)
             else:
-                body = update_code
-        
-        result = ""
-        if init_code:
-            result += f"{init_code}\n"
-        
-        result += f"while {condition}:\n{self._indent(body)}"
-        
-        return result
+                stop = f"{stop} + 1" if offset > 0 else f"{stop} - 1"
+        if loop.step == 1:
+            bounds = stop if start == "0" else f"{start}, {stop}"
+        else:
+            bounds = f"{start}, {stop}, {loop.step}"
+        self.out.line(f"for {loop.var} in range({bounds}):")
+        self.body(body)
 
-    def visit_ForEachStatement(self, node):
+    def emit_ForEachStatement(self, node):
         iterable = self.visit(node.iterable)
-        body = self.visit(node.body)
-
-        loop_header = f"for {node.var} in {iterable}:"
-
-        return f"{loop_header}\n{self._indent(body)}"
+        self.out.line(f"for {node.var} in {iterable}:")
+        self.body(node.body)
 
     def visit_Comment(self, node):
         if node.is_multiline:
@@ -290,41 +419,43 @@ class Transpiler:
         statement_code = self.visit(node.statement)
         return f"{statement_code}  # {node.comment_text}"
 
-    def visit_ClassDeclaration(self, node):
-        class_code = f"class {node.name}:"
+    def emit_ClassDeclaration(self, node):
+        self.out.line(f"class {node.name}:")
         
-        if not node.constructor and not node.methods:
-            class_code += "\n    pass"
-        else:
-            if node.constructor:
-                constructor_code = self.visit_ConstructorDeclaration(node.constructor)
-                class_code += f"\n{self._indent(constructor_code)}"
-            
-            for method in node.methods:
-                method_code = self.visit_MethodDeclaration(method)
-                class_code += f"\n{self._indent(method_code)}"
-        
-        return class_code
+        self.out.indent()
+        try:
+            if not node.constructor and not node.methods:
+                self.out.line("pass")
+            else:
+                if node.constructor:
+                    self.emit_ConstructorDeclaration(node.constructor)
+                
+                for method in node.methods:
+                    self.emit_MethodDeclaration(method)
+        finally:
+            self.out.dedent()
     
-    def visit_ConstructorDeclaration(self, node):
+    def emit_ConstructorDeclaration(self, node):
         params = ['self'] + node.params
         params_str = ', '.join(params)
-        body = self.visit(node.body)
-
-        if not body.strip():
-            body = "pass"
-        
-        return f"def __init__({params_str}):\n{self._indent(body)}"
+        self.out.line(f"def __init__({params_str}):")
+        self._method_body(node.body)
     
-    def visit_MethodDeclaration(self, node):
+    def emit_MethodDeclaration(self, node):
         params = ['self'] + node.params
         params_str = ', '.join(params)
-        body = self.visit(node.body)
-
-        if not body.strip():
-            body = "pass"
-        
-        return f"def {node.name}({params_str}):\n{self._indent(body)}"
+        self.out.line(f"def {node.name}({params_str}):")
+        self._method_body(node.body)
+
+    def _method_body(self, body):
+        self.out.indent()
+        try:
+            start = len(self.out.lines)
+            self.statement(body)
+            if len(self.out.lines) == start:
+                self.out.line("pass")
+        finally:
+            self.out.dedent()
 
     def visit_NewExpression(self, node):
         args = ", ".join([self.visit(arg) for arg in node.arguments])
@@ -345,7 +476,7 @@ class Transpiler:
         
         if node.method_name == 'charAt':
             if len(args) == 1:
-                return f"{obj}[{args[0]}] if 0 <= {args[0]} < len({obj}) else ''"
+                return f"({obj}[{args[0]}] if 0 <= {args[0]} < len({obj}) else '')"
             else:
                 raise TypeError("charAt() requer exatamente 1 argumento")
         
@@ -423,7 +554,7 @@ class Transpiler:
         if node.op == '!':
             return f"not {operand}"
         else:
-            return f"{node.op}{operand}"
+            return f"{node.op}{self._operand(node.operand, operand, 3)}"
 
     def visit_UpdateExpression(self, node):
         operand = self.visit(node.operand)
@@ -0,0 +1,341 @@
+"""
+Inferência de tipos (número ou string) para o '+' do transpilador
+
+Em JS o '+' soma números e concatena quando um dos lados é string. O
+transpilador só pode gerar um `+` do Python quando sabe qual dos dois casos
+acontece; esta análise marca as expressões cujo tipo é garantido:
+
+- literais numéricos são NUMBER e literais string são STRING (booleanos
+  ficam de fora: True + 1 vale 2 no Python; 'null', 'undefined', 'true' e
+  'false' também, já que o interpretador os lê como valores);
+- '-', '*', '/' e '%' entre números são NUMBER; '+' é NUMBER entre números
+  e STRING quando um dos lados é string;
+- `.length`, Math.floor/ceil/round/abs/sqrt são NUMBER, e Math.max/min/pow
+  também quando todos os argumentos são números; toUpperCase,
+  toLowerCase, toFixed e toString são STRING, assim como charAt, substr e
+  substring chamados em strings;
+- uma variável tem o tipo comum a todas as atribuições a ela no seu escopo
+  (a análise não depende da ordem das atribuições). Variáveis de
+  for...of/in, funções e classes não têm tipo conhecido, nem os nomes que
+  alguma função atribui sem declarar (no motor python eles viram
+  `global`/`nonlocal` e mudam de valor a cada chamada);
+- uma função declarada uma única vez e só chamada pelo nome tem, em cada
+  parâmetro, o tipo comum aos argumentos de todas as chamadas, e a chamada
+  `f(...)` tem o tipo comum a todos os `return` de f, quando toda execução
+  do corpo termina em um return. Assim `fib(n - 1) + fib(n - 2)` é uma
+  soma de números.
+
+Como em loop_analysis, cada função é um escopo do Python gerado e os tipos
+das variáveis saem de um ponto fixo: parte-se de todas as variáveis com o
+tipo e retiram-se as que recebem algum valor de outro tipo, até nada mudar.
+Parâmetros e retornos seguem a mesma ideia entre funções: começam como ANY
+(qualquer tipo serve) e a análise inteira é refeita, estreitando-os pelos
+argumentos e retornos encontrados, até que nenhum mude; os que continuam
+ANY (funções que nunca retornam) viram desconhecidos antes da última volta.
+
+`infer_types(root)` devolve {nó: NUMBER ou STRING}; nós de tipo
+desconhecido ficam de fora.
+"""
+from ast_nodes.nodes import (
+    Literal, Identifier, BinaryOp, UnaryOp, PropertyAccess, MethodCall, FunctionCall,
+    NewExpression, VariableDeclaration, Assignment, UpdateExpression, ForEachStatement,
+    ClassDeclaration, FunctionDeclaration, LambdaFunction, ReturnStatement, Block,
+    IfStatement, InlineComment,
+)
+from translator.loop_analysis import SCOPES, children, collect_scope, outer_assignments, scope_body
+
+NUMBER = 'number'
+STRING = 'string'
+# Parâmetro ou retorno ainda sem restrição, durante o ponto fixo entre funções
+ANY = 'any'
+_NUMERIC = (NUMBER, ANY)
+
+# Literais que o interpretador lê como null, undefined e booleanos
+_RESERVED = frozenset({'null', 'undefined', 'true', 'false'})
+
+_ARITHMETIC = frozenset({'-', '*', '/', '%'})
+
+# Métodos cujo resultado tem tipo fixo, qualquer que seja o objeto
+_STRING_METHODS = frozenset({'toUpperCase', 'toLowerCase', 'toFixed', 'toString'})
+# Métodos que devolvem string quando chamados em uma string
+_SUBSTRING_METHODS = frozenset({'charAt', 'substr', 'substring'})
+# Math.*: sempre números / números quando todos os argumentos são números
+_MATH_NUMBER = frozenset({'floor', 'ceil', 'round', 'abs', 'sqrt'})
+_MATH_ARGUMENTS = frozenset({'max', 'min', 'pow'})
+
+
+def infer_types(root):
+    program = _Program(root)
+    while True:
+        types = {}
+        _analyze_scope(root, None, None, program, types)
+        if not program.refine(types) and not program.settle():
+            return types
+
+
+def _meet(a, b):
+    """Tipo comum a `a` e `b` (ANY combina com qualquer um; None com nenhum)"""
+    if a == ANY:
+        return b
+    if b == ANY or a == b:
+        return a
+    return None
+
+
+class _Argument:
+    """Valor de um parâmetro: o tipo vem dos argumentos das chamadas"""
+    __slots__ = ('kinds', 'index')
+
+    def __init__(self, kinds, index):
+        self.kinds = kinds
+        self.index = index
+
+
+class _Program:
+    """Funções chamadas pelo nome, com os tipos dos parâmetros e do retorno"""
+
+    def __init__(self, root):
+        # Nomes que alguma função atribui sem declarar
+        self.outer = outer_assignments(root)
+        bindings, escaped = {}, set()
+        definitions, calls = {}, {}
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            cls = type(node)
+            for name in _bound(node):
+                bindings[name] = bindings.get(name, 0) + 1
+            if cls is FunctionDeclaration and node.name:
+                definitions[node.name] = node
+            elif cls is VariableDeclaration and node.kind is not None and type(node.value) in SCOPES:
+                definitions[node.name] = node.value
+            elif cls is FunctionCall:
+                calls.setdefault(node.name, []).append(node)
+            elif cls is Identifier:
+                escaped.add(node.name)
+            elif cls is NewExpression:
+                escaped.add(node.class_name)
+            stack.extend(children(node))
+
+        # nome -> função, para os nomes ligados uma única vez (à própria função)
+        self.functions = {name: function for name, function in definitions.items() if bindings[name] == 1}
+        self.calls = {name: calls.get(name, []) for name in self.functions}
+        # função -> tipo de cada parâmetro; nome -> tipo do retorno
+        self.params = {}
+        self.returns = {}
+        self.results = {}
+        for name, function in self.functions.items():
+            known = name not in escaped and self.calls[name]
+            self.params[function] = [ANY if known else None for _ in function.params]
+            self.results[function] = _results(function)
+            self.returns[name] = ANY if self.results[function] is not None else None
+
+    def refine(self, types):
+        """Estreita parâmetros e retornos pelos tipos encontrados; True se algum mudou"""
+        changed = False
+        for name, function in self.functions.items():
+            kind = self.returns[name]
+            for expression in self.results[function] or ():
+                kind = _meet(kind, types.get(expression))
+            if kind != self.returns[name]:
+                self.returns[name] = kind
+                changed = True
+            kinds = self.params[function]
+            for index, kind in enumerate(kinds):
+                for call in self.calls[name]:
+                    arguments = call.arguments
+                    kind = _meet(kind, types.get(arguments[index]) if index < len(arguments) else None)
+                if kind != kinds[index]:
+                    kinds[index] = kind
+                    changed = True
+        return changed
+
+    def settle(self):
+        """Troca os ANY que sobraram por desconhecido; True se havia algum"""
+        changed = False
+        for name, kind in self.returns.items():
+            if kind == ANY:
+                self.returns[name] = None
+                changed = True
+        for kinds in self.params.values():
+            for index, kind in enumerate(kinds):
+                if kind == ANY:
+                    kinds[index] = None
+                    changed = True
+        return changed
+
+
+def _bound(node):
+    """Nomes que `node` declara ou atribui"""
+    cls = type(node)
+    if cls is VariableDeclaration:
+        return () if node.name.startswith(('this.', 'self.')) else (node.name,)
+    if cls is Assignment:
+        return (node.target.name,) if type(node.target) is Identifier else ()
+    if cls is UpdateExpression:
+        return (node.operand.name,) if type(node.operand) is Identifier else ()
+    if cls is ForEachStatement or cls is ClassDeclaration:
+        return (node.var if cls is ForEachStatement else node.name,)
+    if cls in SCOPES:
+        names = list(node.params)
+        if cls is FunctionDeclaration and node.name:
+            names.append(node.name)
+        return names
+    return ()
+
+
+def _results(function):
+    """Expressões devolvidas pela função, ou None se ela pode terminar sem return"""
+    if type(function) is LambdaFunction:
+        return [function.expression]
+    if not _always_returns(function.body):
+        return None
+    results = []
+    stack = [function.body]
+    while stack:
+        node = stack.pop()
+        if type(node) in SCOPES:
+            continue
+        if type(node) is ReturnStatement:
+            results.append(node.expression)
+        stack.extend(children(node))
+    return results
+
+
+def _always_returns(node):
+    cls = type(node)
+    if cls is ReturnStatement:
+        return True
+    if cls is InlineComment:
+        return _always_returns(node.statement)
+    if cls is Block:
+        return any(_always_returns(statement) for statement in node.statements)
+    if cls is IfStatement:
+        return node.else_block is not None \
+            and _always_returns(node.then_block) and _always_returns(node.else_block)
+    return False
+
+
+class _Scope:
+    __slots__ = ('assignments', 'types', 'parent', 'program')
+
+    def __init__(self, parent, program):
+        # nome -> expressões atribuídas (None para valor desconhecido)
+        self.assignments = {}
+        # nome -> NUMBER ou STRING
+        self.types = {}
+        self.parent = parent
+        self.program = program
+
+    def name_type(self, name):
+        scope = self
+        while scope is not None:
+            if name in scope.assignments:
+                return scope.types.get(name)
+            scope = scope.parent
+        return None
+
+
+def _analyze_scope(node, function, parent, program, types):
+    scope = _Scope(parent, program)
+    if function is not None:
+        kinds = program.params.get(function)
+        for index, param in enumerate(function.params):
+            value = None if kinds is None else _Argument(kinds, index)
+            scope.assignments.setdefault(param, []).append(value)
+    nested = []
+    body = scope_body(node)
+    collect_scope(body, scope.assignments, nested, [])
+    for kind in (NUMBER, STRING):
+        _solve(scope, kind)
+
+    memo = {}
+    stack = [body]
+    while stack:
+        current = stack.pop()
+        if type(current) in SCOPES:
+            continue
+        _type(current, scope, memo)
+        stack.extend(children(current))
+    types.update((expression, kind) for expression, kind in memo.items() if kind is not None)
+
+    for function in nested:
+        _analyze_scope(function, function, scope, program, types)
+
+
+def _solve(scope, kind):
+    """Maior conjunto de nomes ainda sem tipo cujas atribuições são todas `kind`"""
+    outer = scope.program.outer
+    candidates = [name for name in scope.assignments if name not in scope.types and name not in outer]
+    for name in candidates:
+        scope.types[name] = kind
+    changed = True
+    while changed:
+        changed = False
+        for name in candidates:
+            if name in scope.types and not all(
+                    value is not None and _type(value, scope) in (kind, ANY) for value in scope.assignments[name]):
+                del scope.types[name]
+                changed = True
+
+
+def _type(node, scope, memo=None):
+    """NUMBER, STRING, ANY ou None; `memo` guarda o tipo de cada nó já visto"""
+    if memo is not None and node in memo:
+        return memo[node]
+    cls = type(node)
+    kind = None
+    if cls is Literal:
+        value = node.value
+        if type(value) in (int, float):
+            kind = NUMBER
+        elif type(value) is str and value not in _RESERVED:
+            kind = STRING
+    elif cls is Identifier:
+        kind = scope.name_type(node.name)
+    elif cls is _Argument:
+        kind = node.kinds[node.index]
+    elif cls is FunctionCall:
+        kind = scope.program.returns.get(node.name)
+    elif cls is BinaryOp:
+        left = _type(node.left, scope, memo)
+        right = _type(node.right, scope, memo)
+        if node.op == '+':
+            if STRING in (left, right):
+                kind = STRING
+            elif left in _NUMERIC and right in _NUMERIC:
+                kind = _meet(left, right)
+        elif node.op in _ARITHMETIC:
+            if left in _NUMERIC and right in _NUMERIC:
+                kind = NUMBER
+        elif node.op in ('&&', '||') and left is not None and right is not None:
+            kind = _meet(left, right)
+    elif cls is UnaryOp:
+        if node.op in ('-', '+') and _type(node.operand, scope, memo) in _NUMERIC:
+            kind = NUMBER
+    elif cls is PropertyAccess:
+        if node.property_name == 'length':
+            kind = NUMBER
+    elif cls is MethodCall:
+        kind = _method_type(node, scope, memo)
+    if memo is not None:
+        memo[node] = kind
+    return kind
+
+
+def _method_type(node, scope, memo):
+    name = node.method_name
+    if name == 'length':
+        return NUMBER
+    if name in _STRING_METHODS:
+        return STRING
+    obj = node.object
+    if name in _SUBSTRING_METHODS:
+        return STRING if _type(obj, scope, memo) in (STRING, ANY) else None
+    if type(obj) is Identifier and obj.name == 'Math':
+        if name in _MATH_NUMBER:
+            return NUMBER
+        if name in _MATH_ARGUMENTS and node.arguments \
+                and all(_type(arg, scope, memo) in _NUMERIC for arg in node.arguments):
+            return NUMBER
+    return None